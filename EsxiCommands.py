@@ -0,0 +1,94 @@
+import re, uuid
+
+class EsxiCommandBatch:
+    'Run several ESXi shell commands through a single SSH channel and split their outputs'
+
+    def __init__(self, client):
+        self.client = client    # Connected paramiko SSHClient
+        self.marker = 'ETL_NFVI_' + uuid.uuid4().hex    # Separates the outputs of the commands. Random so that it cannot appear in any output
+        self.complete = True    # False once the output of any command sent was cut short (i.e. the channel closed before the script ended)
+
+    def run(self, commands):
+        """Run a batch of commands as one shell script and return the output of each one.
+
+        Every exec_command opens a new channel and spawns a new process in the ESXi, so commands
+        that do not depend on each other are sent together.
+
+        Parameters
+        ----------
+        commands : dict
+            {key: shell command}
+
+        Returns
+        -------
+        outputs
+            Dictionary {key: command stdout} with leading and trailing newlines removed
+        """
+
+        if not commands:
+            return {}
+        keys = list(commands)
+        script = '\n'.join(f"echo; echo '{self.marker} {index}'\n{commands[key]}" for index, key in enumerate(keys))
+        stdin, stdout, stderr = self.client.exec_command(script)
+        output = stdout.read().decode('ascii', 'replace')
+
+        outputs = dict.fromkeys(keys, '')
+        parts = re.split(rf'\n{self.marker} ([0-9]+)\n', '\n' + output + '\n')    # [preamble, index, output, index, output...]
+        for index, part in zip(parts[1::2], parts[2::2]):
+            outputs[keys[int(index)]] = part.strip("\n")
+        if len(parts) < 2 * len(keys) + 1:
+            self.complete = False
+
+        return outputs
+
+def parseVmList(output):
+    """Return {VM name: world ID} from the output of 'esxcli network vm list'.
+
+    Columns are sliced by the widths of the dashes line under the header, since VM names may contain spaces.
+    """
+
+    lines = output.splitlines()
+    dashes = [index for index, line in enumerate(lines) if line.strip() and set(line.strip()) <= set('- ')]
+    if not dashes:
+        return {}
+    columns = [match.span() for match in re.finditer('-+', lines[dashes[0]])]
+    if len(columns) < 2:
+        return {}
+
+    worlds = {}
+    for line in lines[dashes[0]+1:]:
+        if line.strip():
+            world = line[:columns[0][1]].strip()
+            name = line[columns[1][0]:columns[2][0] if len(columns) > 2 else None].strip()
+            worlds.setdefault(name, world)
+
+    return worlds
+
+def parsePortList(output):
+    """Return {MAC address: (port ID, team uplink)} from the output of 'esxcli network vm port list'. Ports not teamed to a vmnic are skipped."""
+
+    ports = {}
+    for block in re.split(r'\n(?= *Port ID:)', output):
+        port = {key.strip(): value.strip() for key, separator, value in (line.partition(':') for line in block.splitlines()) if separator}
+        if 'Port ID' in port and re.fullmatch('vmnic[0-9]+', port.get('Team Uplink', '')):
+            ports[port.get('MAC Address', '')] = (port['Port ID'], port['Team Uplink'])
+
+    return ports
+
+def parseVmkchdev(output):
+    """Return {PCI address: vmnic name} of the passthru and vmkernel devices listed by 'vmkchdev -l'."""
+
+    devices = {}
+    for match in re.finditer(r'^(\S+) [0-9:]* [a-z0-9:]* (?:passthru|vmkernel) (vmnic[0-9]*)', output, re.MULTILINE):
+        devices.setdefault(match.group(1), match.group(2))
+
+    return devices
+
+def parseLspci(output):
+    """Return {PCI address: vmnic name} from the output of 'lspci'."""
+
+    devices = {}
+    for match in re.finditer(r'^(\S+) .*\[(vmnic[0-9]*)\]', output, re.MULTILINE):
+        devices.setdefault(match.group(1), match.group(2))
+
+    return devices
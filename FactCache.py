@@ -0,0 +1,100 @@
+import json, os, threading, time
+
+class FactCache:
+    'TTL cache of slow-changing out-of-band Host facts (firmware, VIB and driver versions), keyed by Host and source'
+
+    def __init__(self, ttl, path=None):
+        self.ttl = ttl      # Seconds a fact is valid
+        self.path = path    # JSON file where facts are kept between runs. None to keep them only for this run
+        self.lock = threading.Lock()    # Shared by the Host worker threads
+        self.entries = {}   # {'host|source': {'timestamp': t, 'esxi_build': b, 'bios_version': v, 'facts': {...}}}
+        self.dirty = False  # Facts were put since the cache file was last written
+        if path:
+            self.entries = self.load()
+
+    def load(self):
+        """Return the entries saved to the cache file ({} if there is none)."""
+
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        """Write the entries to the cache file, merged with those saved meanwhile by other processes."""
+
+        entries = self.load()
+        for key, entry in self.entries.items():
+            if key not in entries or entries[key]['timestamp'] < entry['timestamp']:
+                entries[key] = entry
+        try:
+            with open(self.path + '.tmp', 'w') as f:
+                json.dump(entries, f)
+            os.replace(self.path + '.tmp', self.path)    # Readers never see a partially written file
+        except OSError:
+            print(f"Host facts could not be saved to {self.path}")
+
+    def get(self, host_name, source, esxi_build, bios_version):
+        """Return the facts cached for a Host and source, or None if missing, expired or if the ESXi build or BIOS version changed since."""
+
+        with self.lock:
+            entry = self.entries.get(f'{host_name}|{source}')
+        if entry is None or time.time() - entry['timestamp'] > self.ttl:
+            return None
+        if entry['esxi_build'] != str(esxi_build) or entry['bios_version'] != str(bios_version):    # Host upgraded. Firmware and drivers may have changed too
+            return None
+
+        return entry['facts']
+
+    def put(self, host_name, source, esxi_build, bios_version, facts):
+        """Store the facts retrieved for a Host and source. Empty facts (retrieval failed) are not cached."""
+
+        if not facts['host'] and not facts['pnics']:
+            return
+        with self.lock:
+            self.entries[f'{host_name}|{source}'] = {'timestamp': time.time(), 'esxi_build': str(esxi_build), 'bios_version': str(bios_version), 'facts': facts}
+            self.dirty = True
+
+    def flush(self):
+        """Write the cache file if facts were put since it was last written. Called once per collection, not per Host."""
+
+        with self.lock:
+            if self.path and self.dirty:
+                self.save()
+                self.dirty = False
+
+def extractFacts(df_h, df_h_network, df_h_before, df_h_network_before, host_columns, pnic_columns):
+    """Return the values of the given Host (df_h) and pNIC (df_h_network, per vmnic_Device) columns set by an out-of-band source.
+
+    Only values which differ from the dataframes before querying the source are returned, so that values
+    coming from vCenter are not cached and a failed query returns no facts at all.
+
+    Returns
+    -------
+    facts
+        Dictionary {'host': {column: value}, 'pnics': {vmnic_Device: {column: value}}}
+    """
+
+    facts = {'host': {}, 'pnics': {}}
+    for column in host_columns:
+        value = df_h[column].item()
+        if isinstance(value, str) and value != df_h_before[column].item():
+            facts['host'][column] = value
+    for index, row in df_h_network.iterrows():
+        values = {column: row[column] for column in pnic_columns if isinstance(row[column], str) and row[column] != df_h_network_before.at[index, column]}
+        if values:
+            facts['pnics'][row['vmnic_Device']] = values
+
+    return facts
+
+def applyFacts(df_h, df_h_network, facts):
+    """Return df_h and df_h_network with the cached facts filled in."""
+
+    for column, value in facts['host'].items():
+        df_h[column] = value
+    for device, values in facts['pnics'].items():
+        for column, value in values.items():
+            df_h_network.loc[(df_h_network['vmnic_Device'] == device), column] = value
+
+    return df_h, df_h_network
@@ -1,13 +1,112 @@
 import re, paramiko, getpass, json, requests, urllib3
+import numpy as np
+import pandas as pd
 from datetime import datetime, timezone
+from RedfishClient import parsePCIeFunction, parseNetworkPort, parseFirmware
+from EsxiCommands import EsxiCommandBatch, parseVmList, parsePortList, parseVmkchdev, parseLspci
+from Schema import HostRecord, PNICRecord, concatFrames, recordsToFrame
 
 urllib3.disable_warnings()  # To disable HTTPS security warnings when cert validation is disabled
+
+CAPACITY_KEYS = ['Host_MOID', 'VM_NUMA', 'VM_RealTime', 'VM_LatencySensitivity', 'Datastore_Name']
+CAPACITY_COLUMNS = ['VM_vCPU', 'VM_vMEM_GB', 'VM_Provisioned_Storage_GB', 'VM_SwapFile_Size_GB', 'SRIOV_vNICs', 'PCIPT_vNICs']
+
+def vmCapacity_aggregator(df_vms):
+    """Return the VM figures used by the Host occupation columns, summed in a single groupby over a VM table of one or many Hosts.
+
+    Returns
+    -------
+    df_capacity
+        Dataframe indexed by CAPACITY_KEYS with the sums of CAPACITY_COLUMNS and the number of SRIOV and PCIPT VMs (SRIOV_VMs, PCIPT_VMs)
+    """
+
+    df = df_vms.reindex(columns=CAPACITY_KEYS + CAPACITY_COLUMNS)
+    df[CAPACITY_KEYS] = df[CAPACITY_KEYS].astype(object)   # Category keys would expand to every combination of categories
+    df[CAPACITY_COLUMNS] = df[CAPACITY_COLUMNS].apply(pd.to_numeric)
+    df['SRIOV_VMs'] = (df['SRIOV_vNICs'] != 0).astype(int)
+    df['PCIPT_VMs'] = (df['PCIPT_vNICs'] != 0).astype(int)
+
+    columns = CAPACITY_COLUMNS + ['SRIOV_VMs', 'PCIPT_VMs']
+
+    return df.groupby(CAPACITY_KEYS, dropna=False)[columns].sum().reindex(columns=columns, fill_value=0)  # Columns are dropped if there are no VMs
+
+def vectorVF_calculator(df_hosts_network):
+    """Calculate the VF and Trusted vectors of every Host according to the configured VFs in each PCI Device, in a single groupby over a pNIC table of one or many Hosts.
+
+    Returns
+    -------
+    df_hosts_network
+        Input dataframe with Host_calculated_VF_Vector and Host_calculated_Trusted_Vector
+    """
+
+    if df_hosts_network.empty:
+        return df_hosts_network
+
+    # The position of each vmnic in the VF vector is determined by its B:D:F position
+    bdf = df_hosts_network['vmnic_Device'].astype(str).str.extract(r'0000:(..):..\.(.)')
+    bus = bdf[0].dropna().map(lambda value: int(value, 16)).reindex(bdf.index)     # HEX to DEC
+    function = bdf[1].dropna().map(lambda value: int(value, 16)).reindex(bdf.index)/10   # Divided by 10 so that device Function is added as a decimal number to the Bus
+    df_i40en = df_hosts_network.assign(order=bus + function)[df_hosts_network['vmnic_Driver'] == 'i40en'].sort_values('order', kind='stable')
+
+    vfs = df_i40en['vmnic_configured_VFs'].where(df_i40en['vmnic_Type'] == 'SR-IOV', '0').map(str)
+    vf_vectors = vfs.groupby(df_i40en['MOID'].astype(object), sort=False).agg(','.join)
+    trusted_vectors = vf_vectors.str.replace('[1-9][0-9]*', '1', regex=True)
+
+    df_hosts_network = df_hosts_network.copy()
+    df_hosts_network['Host_calculated_VF_Vector'] = df_hosts_network['MOID'].astype(object).map(vf_vectors).fillna('')   # Hosts without i40en vmnics get an empty vector
+    df_hosts_network['Host_calculated_Trusted_Vector'] = df_hosts_network['MOID'].astype(object).map(trusted_vectors).fillna('')
+
+    return df_hosts_network
+
+def mixedSpace_calculator(df_vms, df_hosts):
+    """Calculate whether a Snapshot and a Restoration of each VM fit into the available Mixed Space of its Host, in a single pass over the VM table of one or many Hosts.
+
+    The Host Mixed Space is taken from df_hosts, so the columns can be recalculated for other Datastore figures without collecting again.
+
+    Returns
+    -------
+    df_vms
+        Input dataframe with Snapshot_Allowed and Restoration_Allowed for the VMs whose Host is in df_hosts
+    """
+
+    if df_vms.empty or df_hosts.empty:
+        return df_vms
+
+    mixed_space_by_host = df_hosts[['MOID', 'Datastore_MixedSpace_GB']].astype(object).drop_duplicates('MOID', keep='last').set_index('MOID')['Datastore_MixedSpace_GB']
+    host_moids = df_vms['Host_MOID'].astype(object)
+    in_host = host_moids.isin(mixed_space_by_host.index).to_numpy()
+    mixed_space = pd.to_numeric(host_moids.map(mixed_space_by_host), errors='coerce')
+    disk_usage = pd.to_numeric(df_vms['VM_Space_In_Disk_GB'], errors='coerce')
+    snapshot = (df_vms['VM_Snapshot'].astype(str) == 'True')
+    host_snapshot = snapshot.groupby(host_moids, dropna=False).transform('any')     # Our rule is max. one snap per host
+    snapshots_disk_usage = disk_usage.where(snapshot, 0).groupby(host_moids, dropna=False).transform('sum')    # Current snapshots disk usage in the same host
+
+    df_vms = df_vms.copy()
+    df_vms.loc[in_host, 'Snapshot_Allowed'] = np.where(host_snapshot | (disk_usage > mixed_space), 'NO', 'YES')[in_host]
+    df_vms.loc[in_host, 'Restoration_Allowed'] = np.where(disk_usage + snapshots_disk_usage > mixed_space, 'NO', 'YES')[in_host]
+
+    return df_vms
+
 class HostData:
     'Retrieve Host configuration data'
 
-    def __init__(self, host_obj, df_vms):
+    def __init__(self, host_obj, df_vms, df_capacity=None):
         self.host_obj = host_obj
         self.df_vms = df_vms
+        self.incomplete = set()     # Out-of-band sources ('esxi', 'idrac') whose retrieval failed or was cut short. Their facts are not cached
+        if df_capacity is None:     # VM figures aggregated from df_vms (VMs in this Host)
+            self.df_capacity = vmCapacity_aggregator(df_vms)
+        else:                       # VM figures aggregated by the caller over the VMs of many Hosts
+            self.df_capacity = df_capacity[df_capacity.index.get_level_values('Host_MOID') == host_obj._moId]
+
+    def capacitySum(self, column, **keys):
+        """Return the sum of an aggregated VM column over the VMs of this Host matching the given keys (i.e. VM_NUMA='0')."""
+
+        df = self.df_capacity
+        for key, value in keys.items():
+            df = df[df.index.get_level_values(key) == value]
+
+        return df[column].sum().item()     # Python number, as summed from the VM table
 
     def modelInfo_calculator(self):
         """Return Host model."""
@@ -54,8 +153,8 @@ class HostData:
         host_total_pcpus = self.host_obj.summary.hardware.numCpuThreads  # If SMT is active pCPU means Thread/lCPU. If SMT is disabled pCPU means Core
       
         if not self.df_vms.empty:
-            vcpus_realtime_regular_vms = self.df_vms[(self.df_vms['VM_RealTime'] == 'YES') & (self.df_vms['VM_LatencySensitivity'] == 'normal')]['VM_vCPU'].sum()
-            vcpus_realtime_ls_vms = self.df_vms[(self.df_vms['VM_RealTime'] == 'YES') & (self.df_vms['VM_LatencySensitivity'] == 'high')]['VM_vCPU'].sum() * 2  # vCPUs of LS=high VMs run isolated in one core. Both pCPUs of the core are blocked for a vCPU (they count double)
+            vcpus_realtime_regular_vms = self.capacitySum('VM_vCPU', VM_RealTime='YES', VM_LatencySensitivity='normal')
+            vcpus_realtime_ls_vms = self.capacitySum('VM_vCPU', VM_RealTime='YES', VM_LatencySensitivity='high') * 2  # vCPUs of LS=high VMs run isolated in one core. Both pCPUs of the core are blocked for a vCPU (they count double)
 
             realtimeSum = vcpus_realtime_regular_vms + vcpus_realtime_ls_vms
             realtimeSum_percentage = round(realtimeSum*100/host_total_pcpus)
@@ -71,8 +170,8 @@ class HostData:
         socket_total_pcpus = round(self.host_obj.summary.hardware.numCpuThreads / self.host_obj.summary.hardware.numCpuPkgs)  # If SMT is active pCPU means Thread/LCPU. If SMT is disabled pCPU means Core
 
         if not self.df_vms.empty:
-            vcpus_socket_regular_vms = self.df_vms[(self.df_vms['VM_NUMA'] == str(socket)) & (self.df_vms['VM_LatencySensitivity'] == 'normal')]['VM_vCPU'].sum()
-            vcpus_socket_ls_vms = self.df_vms[(self.df_vms['VM_NUMA'] == str(socket)) & (self.df_vms['VM_LatencySensitivity'] == 'high')]['VM_vCPU'].sum()
+            vcpus_socket_regular_vms = self.capacitySum('VM_vCPU', VM_NUMA=str(socket), VM_LatencySensitivity='normal')
+            vcpus_socket_ls_vms = self.capacitySum('VM_vCPU', VM_NUMA=str(socket), VM_LatencySensitivity='high')
             socket_provisioned_vcpus = vcpus_socket_regular_vms + vcpus_socket_ls_vms*2    # LS vCPUs count double as LS provides core isolation
             current_socket_occupation_percentage = round(socket_provisioned_vcpus*100/socket_total_pcpus)
         else:
@@ -87,8 +186,8 @@ class HostData:
         host_total_pcpus = self.host_obj.summary.hardware.numCpuThreads  # If SMT is active pCPU means Thread/LCPU. If SMT is disabled pCPU means Core
 
         if not self.df_vms.empty:
-            vcpus_regular_vms = self.df_vms[self.df_vms['VM_LatencySensitivity'] == 'normal']['VM_vCPU'].sum()
-            vcpus_ls_vms = self.df_vms[self.df_vms['VM_LatencySensitivity'] == 'high']['VM_vCPU'].sum()
+            vcpus_regular_vms = self.capacitySum('VM_vCPU', VM_LatencySensitivity='normal')
+            vcpus_ls_vms = self.capacitySum('VM_vCPU', VM_LatencySensitivity='high')
             host_provisioned_vcpus = vcpus_regular_vms + vcpus_ls_vms*2    # LS vCPUs count double as LS provides core isolation
             hypervisor_reserved_pcpus = round(host_total_pcpus * 0.1) # 10% of host pCPUs are reserved by the Hypervisor
 
@@ -107,7 +206,7 @@ class HostData:
 
         hypervisor_reserved_RAM_GB = round(host_total_ram * 0.1/1024)    # Around 10% of host RAM is reserved by the Hypervisor
         if not self.df_vms.empty:
-            total_provisioned_RAM_GB = self.df_vms['VM_vMEM_GB'].sum()
+            total_provisioned_RAM_GB = self.capacitySum('VM_vMEM_GB')
 
             current_host_occupation = total_provisioned_RAM_GB + hypervisor_reserved_RAM_GB
             current_host_occupation_percentage = round(current_host_occupation*100/host_total_ram)
@@ -124,7 +223,7 @@ class HostData:
 
         socket_mem_GB = int(host_total_ram_GB / self.host_obj.hardware.numaInfo.numNodes)
         if not self.df_vms.empty:
-            socket_provisioned_vmem = self.df_vms[self.df_vms['VM_NUMA'] == str(socket)]['VM_vMEM_GB'].sum()
+            socket_provisioned_vmem = self.capacitySum('VM_vMEM_GB', VM_NUMA=str(socket))
             current_socket_occupation_percentage = round(socket_provisioned_vmem*100/socket_mem_GB)
         else:
             socket_provisioned_vmem = 0
@@ -173,8 +272,8 @@ class HostData:
                 datastore_capacity = round(datastore.summary.capacity/(1024**3))
                 datastore_free = round(datastore.summary.freeSpace/(1024**3))
                 if not self.df_vms.empty:
-                    ds_provisioned = self.df_vms[self.df_vms['Datastore_Name'] == datastore_name]['VM_Provisioned_Storage_GB'].sum()
-                    ds_swap = self.df_vms[self.df_vms['Datastore_Name'] == datastore_name]['VM_SwapFile_Size_GB'].sum()
+                    ds_provisioned = self.capacitySum('VM_Provisioned_Storage_GB', Datastore_Name=datastore_name)
+                    ds_swap = self.capacitySum('VM_SwapFile_Size_GB', Datastore_Name=datastore_name)
                     
                 actual_mixed_space_storage_GB = datastore_capacity - ds_provisioned - ds_swap
                 break
@@ -195,8 +294,8 @@ class HostData:
         total_sriov_VMs = 0
         total_sriov_Ports = 0
         if not self.df_vms.empty:
-            total_sriov_VMs = (self.df_vms['SRIOV_vNICs'] != 0).sum()
-            total_sriov_Ports = self.df_vms['SRIOV_vNICs'].sum()
+            total_sriov_VMs = self.capacitySum('SRIOV_VMs')
+            total_sriov_Ports = self.capacitySum('SRIOV_vNICs')
 
         return total_sriov_VMs, total_sriov_Ports
 
@@ -214,55 +313,56 @@ class HostData:
         total_pcipt_VMs = 0
         total_pcipt_Ports = 0
         if not self.df_vms.empty:
-            total_pcipt_VMs = (self.df_vms['PCIPT_vNICs'] != 0).sum()
-            total_pcipt_Ports = self.df_vms['PCIPT_vNICs'].sum()
+            total_pcipt_VMs = self.capacitySum('PCIPT_VMs')
+            total_pcipt_Ports = self.capacitySum('PCIPT_vNICs')
 
         return total_pcipt_VMs, total_pcipt_Ports
 
-    def snapshotAllowed_calculator(self, mixedSpaceSize):
-        """Return whether a Snapshot fits into the available Mixed Space of the host."""
-
-        if not self.df_vms.empty:
-            if self.df_vms[self.df_vms['VM_Snapshot'] == 'True'].size > 0:  # There is at least one Snapshot present in the same host. Our rule is max. one snap per host
-                self.df_vms['Snapshot_Allowed'] = 'NO'  
-            else:
-                for row in self.df_vms.itertuples():
-                    if row.VM_Space_In_Disk_GB > mixedSpaceSize:    # Current VM disk usage is bigger than the Mixed Space. It does not fit. 
-                        self.df_vms.at[row.Index, 'Snapshot_Allowed'] =  'NO'
-                    else:                                           # Current VM disk usage is smaller than the Mixed Space. It fits.              
-                        self.df_vms.at[row.Index, 'Snapshot_Allowed'] = 'YES'
-
-        return self.df_vms
-
-    def restorationAllowed_calculator(self, mixedSpaceSize):
-        """Return whether a Restoration fits into the available Mixed Space of the host."""
-
-        if not self.df_vms.empty:
-            current_snapshots_disk_usage = 0
-            if self.df_vms[self.df_vms['VM_Snapshot'] == 'True'].size > 0:  # There is at least one Snapshot present in the same host. Our rule is max. one snap per host
-                current_snapshots_disk_usage =  self.df_vms[self.df_vms['VM_Snapshot'] == 'True']['VM_Space_In_Disk_GB'].sum()
-            
-            for row in self.df_vms.itertuples():
-                if row.VM_Space_In_Disk_GB + current_snapshots_disk_usage > mixedSpaceSize:
-                    self.df_vms.at[row.Index, 'Restoration_Allowed'] =  'NO'
-                else:
-                    self.df_vms.at[row.Index, 'Restoration_Allowed'] = 'YES'
-
-        return self.df_vms
+    def hostRecord_calculator(self):
+        """Return the row of this Host in the Host table (HostRecord)."""
+
+        host_record = HostRecord()
+        host_record.Host_Name = self.host_obj.name.split('.')[0]
+        host_record.MOID = self.hostMOID_calculator()
+        host_record.timestamp = self.timestamp_calculator()
+        host_record.Cluster_Name = self.clustername_calculator()
+        host_record.ESXi_Version, host_record.ESXi_Build = self.esxiVersion()
+        host_record.BIOS_Version = self.biosVersion()
+        host_record.ESXi_Rsv_Cores = self.hypReservedCores_calculator()
+        host_record.ESXi_Rsv_RAM_GB = self.hypReservedMEM_calculator()
+        host_record.RealTime_vCPUs, host_record.RealTime_Occupation_Perc = self.realtimevCPUs()
+        host_record.Max_RealTime_Occupation_Perc = self.cpuRealTimeOccupationRatio()
+        host_record.Provisioned_vCPUs, host_record.Total_CPU_Occupation_Perc = self.provisionedvCPUs()
+        host_record.Max_OverProv_Ratio_Perc = self.cpuOccupationRatio()
+        for socket in range(self.host_obj.hardware.numaInfo.numNodes):
+            host_record['Socket'+str(socket)+'_Pinned_vCPUs'], host_record['Socket'+str(socket)+'_CPU_Occupation_Perc'] = self.socketProvisionedvCPUs(socket)
+            host_record['Socket'+str(socket)+'_Pinned_vMEM'], host_record['Socket'+str(socket)+'_RAM_Occupation_Perc'] = self.socketProvisionedRAM(socket)
+        host_record.Model = self.modelInfo_calculator()
+        host_record.Provisioned_RAM, host_record.Total_RAM_Occupation_Perc = self.provisionedRAM()
+        host_record.Datastore_Name, host_record.Datastore_Capacity_GB, host_record.Datastore_Free_GB, host_record.Datastore_Provisioned_GB, \
+            host_record.Datastore_ProvisionedSwap_GB, host_record.Datastore_MixedSpace_GB = self.dsInfo_calculator()
+        host_record.SRIOV_VMs, host_record.SRIOV_VFs_Provisioned = self.sriovVMs()
+        host_record.PCIPT_VMs, host_record.PCIPT_Devices_Provisioned = self.pciptVMs()
+
+        return host_record
 
     def standardpNIC_info(self, df_h_network):
         """Return information about dVS and SRIOV interfaces."""
 
+        pnic_records = []
         for pnic in self.host_obj.config.network.pnic:
             if "vmnic" in pnic.device:
-                df_h_network = df_h_network.append({'Host_Name': self.host_obj.name.split('.')[0], 'MOID': self.host_obj._moId, 'vmnic_Name': pnic.device, 'vmnic_Driver': pnic.driver, \
-                    'vmnic_MAC': pnic.mac, 'vmnic_Device': pnic.pci, 'vmnic_Link_Status': 'up' if pnic.linkSpeed else 'down', 'vmnic_Configured_Speed_Mbps': pnic.spec.linkSpeed.speedMb if pnic.spec.linkSpeed else 'Auto'}, ignore_index=True)
+                pnic_records.append(PNICRecord(Host_Name=self.host_obj.name.split('.')[0], MOID=self.host_obj._moId, vmnic_Name=pnic.device, vmnic_Driver=pnic.driver, \
+                    vmnic_MAC=pnic.mac, vmnic_Device=pnic.pci, vmnic_Link_Status='up' if pnic.linkSpeed else 'down', vmnic_Configured_Speed_Mbps=pnic.spec.linkSpeed.speedMb if pnic.spec.linkSpeed else 'Auto'))
 
-        return df_h_network
+        return concatFrames('pnic', [df_h_network, recordsToFrame('pnic', pnic_records)])
 
     def pciPassThroughNIC_info(self, df_h_network):
         """Return information about PCI-PT and SRIOV interfaces."""
 
+        pcipt_records = []
+        vmnic_names = dict(zip(df_h_network['vmnic_Device'], df_h_network['vmnic_Name']))  # PCI-PT devices are named after their sibling pNICs
+        configured_VFs = {}
         for pciDevice in self.host_obj.config.pciPassthruInfo:
             try:    # PCI devices which are not NICs do not have the following attributes
                 if pciDevice.sriovActive:    # PCI Devices configured as SR-IOV
@@ -272,22 +372,27 @@ class HostData:
                     pciBusDevice = pciDevice.id.split(".")[0]
                     pciFunction = pciDevice.id.split(".")[1]
                     pcivmnic = ''
-                    siblingpNic =  [bdf for bdf in df_h_network.vmnic_Device if pciBusDevice in bdf]
+                    siblingpNic =  [bdf for bdf in vmnic_names if pciBusDevice in bdf]
                     if siblingpNic:
                         for sibling in siblingpNic:
                             siblingFunction = sibling.split(".")[1]
                             functionDrift = int(siblingFunction) - int(pciFunction) 
-                            siblingName = df_h_network.loc[(df_h_network['vmnic_Device'] == sibling), 'vmnic_Name'].to_string(index=False)
+                            siblingName = vmnic_names[sibling]
                             siblingNumber = siblingName.replace('vmnic','')
                             pciNumber = int(siblingNumber) - functionDrift
                             pcivmnic = "vmnic" + str(pciNumber)
                             break
-                    df_h_network = df_h_network.append({'Host_Name': self.host_obj.name.split('.')[0], 'MOID': self.host_obj._moId, 'vmnic_Name': pcivmnic, 'vmnic_Device': pciDevice.id, 'vmnic_Type': "PCI-PT"}, ignore_index=True)
+                    pcipt_records.append(PNICRecord(Host_Name=self.host_obj.name.split('.')[0], MOID=self.host_obj._moId, vmnic_Name=pcivmnic, vmnic_Device=pciDevice.id, vmnic_Type="PCI-PT"))
+                    vmnic_names[pciDevice.id] = pcivmnic
 
-                df_h_network.at[(df_h_network['vmnic_Device'] == pciDevice.id), 'vmnic_configured_VFs'] = pciDevice.numVirtualFunction  # These are the values used for the "max_vfs" vector
+                configured_VFs[pciDevice.id] = pciDevice.numVirtualFunction  # These are the values used for the "max_vfs" vector
             except:
                 pass
 
+        df_h_network = concatFrames('pnic', [df_h_network, recordsToFrame('pnic', pcipt_records)])
+        configured_mask = df_h_network['vmnic_Device'].isin(configured_VFs)
+        df_h_network.loc[configured_mask, 'vmnic_configured_VFs'] = df_h_network.loc[configured_mask, 'vmnic_Device'].map(configured_VFs)
+
         return df_h_network
 
     def virtualSwitch_info(self, df_h_network):
@@ -336,30 +441,6 @@ class HostData:
 
         return df_h_network
 
-    def vectorVF_calculator(self, df_h_network):
-        """Calculate VF vector according to the configured VFs in each PCI Device."""
-
-        # The position of each vmnic in the VF vector is determined by its B:D:F position
-        pattern = re.compile(r'0000:(..):..\.(.)')
-        for index, row in df_h_network.iterrows():
-            m = pattern.search(row['vmnic_Device'])
-            if m:
-                bus = int(m.group(1), 16)   # HEX to DEC
-                function = int(m.group(2), 16)/10   # HEX to DEC. Divided by 10 so that device Function is added as a decimal number to the Bus. 
-                df_h_network.at[index, 'order'] = bus + function    # Device Function must be taken into account to determine PCI Device order. It is added to the int64 Bus variable as a decimal value.
-
-        df_h_network = df_h_network.sort_values('order')
-        #print(df_h_network[['vmnic_Device', 'vmnic_Name', 'vmnic_Type', 'vmnic_configured_VFs', 'Host_calculated_VF_Vector']])
-        vector = ['0' if row['vmnic_Type'] != 'SR-IOV' else row['vmnic_configured_VFs'] for index, row in df_h_network[df_h_network['vmnic_Driver'] == 'i40en'].iterrows()]
-        string_vector = ','.join((str(v) for v in vector))
-        trusted_vector = re.sub('[1-9][0-9]*', '1', string_vector)
-        df_h_network = df_h_network.drop(columns=['order'])
-        df_h_network['Host_calculated_VF_Vector'] = string_vector
-        df_h_network['Host_calculated_Trusted_Vector'] = trusted_vector
-        df_h_network = df_h_network.sort_index()    # Found some problems with the Apply function of the Styler if df is not sorted by index
-
-        return df_h_network
-
     """
     def getGSW_info(df_h_network, gsw_name, gsw_username, gsw_password):
         #Retrieve physical port information for pNICs.
@@ -398,8 +479,12 @@ class HostData:
         return df_h_network
     """
 
-    def connect_to_esxi(self, df_h_network, df_h, df_vms_network, esxi_username, esxi_password):
-        """Connect to ESXi to retrieve additional information."""
+    def connect_to_esxi(self, df_h_network, df_h, df_vms_network, esxi_username, esxi_password, versions=True):
+        """Connect to ESXi to retrieve additional information.
+
+        With versions=False the ISM VIB and i40en driver/firmware versions are not retrieved (they are already known from FactCache).
+        The connection is still needed for the vmnic names (vmkchdev, lspci), the i40en VF vectors and the vNIC ports of the VMs.
+        """
 
         try:
             client = paramiko.SSHClient()
@@ -408,24 +493,35 @@ class HostData:
             client.connect(hostname=self.host_obj.name, username=esxi_username, password=esxi_password, timeout=10)
         except:
             print(f"{self.host_obj.name} ESXi connection failure")
+            self.incomplete.add('esxi')
         else:
+            # Commands are sent in three batches (EsxiCommandBatch), each batch depending on the outputs of the previous one
+            batch = EsxiCommandBatch(client)
+            vms = []
+            if not df_vms_network.empty:
+                vms = list(df_vms_network[df_vms_network['Host_Name']==self.host_obj.name.split('.')[0]]['VM_Name'].unique())
+            commands = {'vmkchdev': 'vmkchdev -l | grep vmnic', 'i40en': 'esxcli system module parameters list -m i40en', 'lspci': 'lspci | grep vmnic'}
+            if versions:
+                commands['ism'] = 'esxcli software vib list | grep ism'
+            if vms:
+                commands['vm_list'] = 'esxcli network vm list'     # Parsed once into a VM name to world ID index
+            outputs = batch.run(commands)
+            vm_worlds = parseVmList(outputs.get('vm_list', ''))
+
             # Code to get PCIPT|SRIOV to vmnic mapping
-            stdin, stdout, stderr = client.exec_command('vmkchdev -l | grep vmnic')
-            pt = stdout.read().decode('ascii').strip("\n")
-            #pattern_pcipt = re.compile('([0-9:.]*) [0-9:]* [a-z0-9:]* (?:passthru|vmkernel) (vmnic[0-9]*)')
-            for pci_device in df_h_network['vmnic_Device']:
-                pattern_pcipt = re.compile(f'({pci_device}) [0-9:]* [a-z0-9:]* (?:passthru|vmkernel) (vmnic[0-9]*)')
-                p = pattern_pcipt.search(pt)
-                if p:
-                    df_h_network.at[(df_h_network['vmnic_Device'] == p.group(1)) & (df_h_network['vmnic_Name'] == ''),'vmnic_Name'] = p.group(2)
-                    if not df_vms_network.empty:
-                        df_vms_network.at[(df_vms_network['pNIC_PCI_Device'] == p.group(1)) & (df_vms_network['pNIC_inUse'] == ''), 'pNIC_inUse'] = p.group(2)
-                    #print(df_vms_network[(df_vms_network['pNIC_PCI_Device'] == p.group(1))][['pNIC_PCI_Device', 'pNIC_inUse']])
+            host_devices = set(df_h_network['vmnic_Device'])
+            pt = {device: vmnic for device, vmnic in parseVmkchdev(outputs['vmkchdev']).items() if device in host_devices}  # Only pNICs of this host
+            names = df_h_network['vmnic_Device'].map(pt)
+            mask = names.notna() & (df_h_network['vmnic_Name'] == '')
+            df_h_network.loc[mask, 'vmnic_Name'] = names[mask]
+            if not df_vms_network.empty:
+                names = df_vms_network['pNIC_PCI_Device'].map(pt)
+                mask = names.notna() & (df_vms_network['pNIC_inUse'] == '')
+                df_vms_network.loc[mask, 'pNIC_inUse'] = names[mask]
 
             # Code to get current i40en VFs and Trusted vector in host
             pattern_vector = re.compile(r'max_vfs.* ([0-9,]+)')
-            stdin, stdout, stderr = client.exec_command('esxcli system module parameters list -m i40en')
-            vector = stdout.read().decode('ascii').strip("\n")
+            vector = outputs['i40en']
             m = pattern_vector.search(vector)
             if m:
                 df_h_network['Host_current_VF_Vector'] = m.group(1)
@@ -436,133 +532,98 @@ class HostData:
                 df_h_network['Host_current_Trusted_Vector'] = n.group(1)
 
             # Code to match PCI Device B:D:F to vmnic name
-            stdin, stdout, stderr = client.exec_command('lspci | grep vmnic')
-            lspci = stdout.read().decode('ascii').strip("\n")
-            for index, row in df_h_network.iterrows():
-                vmnic_device = row['vmnic_Device']
-                pattern_lspci = re.compile(f'{vmnic_device} .*\[(vmnic[0-9]*)\]')
-                m = pattern_lspci.search(lspci)
-                if m:
-                    df_h_network.at[index, 'vmnic_Name'] = m.group(1)
+            names = df_h_network['vmnic_Device'].map(parseLspci(outputs['lspci']))
+            df_h_network.loc[names.notna(), 'vmnic_Name'] = names[names.notna()]
+
+            # Code to get ISM VIC version
+            ism_version = outputs.get('ism', '')
+            ism_version = re.sub(' +', ' ', ism_version)  # Replacing multiple consecutive spaces with only one
+            if ism_version:
+                    df_h['VIB_ISM_Version'] = ism_version.split(' ')[1]
+
+            # Second batch: i40en vmnic versions (vmnic names are known now) and vNIC ports of each VM world
+            commands = {}
+            if versions:
+                for index, row in df_h_network[df_h_network['vmnic_Driver'] == 'i40en'].iterrows():
+                    commands[('nic', index)] = f'esxcli network nic get -n {row["vmnic_Name"]}'
+            for vm_world in {vm_worlds[vm] for vm in vms if vm in vm_worlds}:
+                commands[('vm_ports', vm_world)] = f'esxcli network vm port list -w {vm_world}'
+            outputs = batch.run(commands)
 
             # Code to get vmnic driver and firmware version
             pattern_driverVersion = re.compile(r'  Version: ([0-9.]+)')
             pattern_firmwareVersion = re.compile(r'  Firmware.*: .* [0x]+.* ([0-9.]+)')
             for index, row in df_h_network[df_h_network['vmnic_Driver'] == 'i40en'].iterrows():
-                vmnic_name = row['vmnic_Name']
-                stdin, stdout, stderr = client.exec_command(f'esxcli network nic get -n {vmnic_name}')
-                versions = stdout.read().decode('ascii').strip("\n")
+                nic_versions = outputs.get(('nic', index), '')
 
-                m = pattern_driverVersion.search(versions)
+                m = pattern_driverVersion.search(nic_versions)
                 if m:
                     df_h_network.at[index, 'vmnic_Driver_version']= m.group(1)
 
-                n = pattern_firmwareVersion.search(versions)
+                n = pattern_firmwareVersion.search(nic_versions)
                 if n:
                     df_h_network.at[index, 'vmnic_Firmware_version']= n.group(1)
 
-            # Code to get ISM VIC version
-            stdin, stdout, stderr = client.exec_command('esxcli software vib list | grep ism')
-            ism_version = stdout.read().decode('ascii').strip("\n")
-            ism_version = re.sub(' +', ' ', ism_version)  # Replacing multiple consecutive spaces with only one
-            if ism_version:
-                    df_h['VIB_ISM_Version'] = ism_version.split(' ')[1]
-            
             # Code to get current Team Uplink for each dVS vNIC and add it to the df_vms_network dataframe
-            if not df_vms_network.empty:
-                for vm in df_vms_network[df_vms_network['Host_Name']==self.host_obj.name.split('.')[0]]['VM_Name'].unique():
-                    stdin, stdout, stderr = client.exec_command(f'esxcli network vm list | grep {vm} | awk \'{{print $1}}\'')
-                    vm_world = stdout.read().decode('ascii').strip("\n")
-                    if vm_world:
-                        stdin, stdout, stderr = client.exec_command(f'esxcli network vm port list -w {vm_world}')
-                        vnics = stdout.read().decode('ascii').strip("\n")
-                        for mac in df_vms_network[df_vms_network['VM_Name']==vm]['vNIC_MAC']:
-                            pattern_teamUplink = re.compile(rf' *Port ID: ([0-9]*)\n *vSwitch: [a-zA-Z0-9_-]*\n *Portgroup: [a-zA-Z0-9_-]*\n *DVPort ID: [0-9]*\n *MAC Address: ({mac})\n *IP Address: [0-9.]*\n *Team Uplink: (vmnic[0-9]*)')
-                            #pattern_teamUplink = re.compile(rf' *MAC Address: ({mac})\n *IP Address: [0-9.]*\n *Team Uplink: (vmnic[0-9]*)')
-                            m = pattern_teamUplink.search(vnics)
-                            if m:
-                                df_vms_network.at[df_vms_network['vNIC_MAC'] == m.group(2), 'pNIC_inUse'] = m.group(3)
-                                stdin, stdout, stderr = client.exec_command(f'vsish -e  get /net/portsets/DvsPortset-0/ports/{m.group(1)}/vmxnet3/rxSummary')
-                                portSummary = stdout.read().decode('ascii').strip("\n")
-                                pattern_ringSize = re.compile('1st ring size:([0-9]*)')
-                                pattern_ringFull = re.compile('# of times the 1st ring is full:([0-9]*)')
-                                r = pattern_ringSize.search(portSummary)
-                                if r:
-                                    df_vms_network.at[df_vms_network['vNIC_MAC'] == m.group(2), 'vNIC_rxBuffer_Ring1_bytes'] = r.group(1)
-                                s = pattern_ringFull.search(portSummary)
-                                if s:
-                                    df_vms_network.at[df_vms_network['vNIC_MAC'] == m.group(2), 'vNIC_rxBuffer_Ring1_fullTimes'] = s.group(1)
-
+            vnic_ports = {}     # {vNIC MAC: (DVS port ID, team uplink)} of every VM world in this host
+            for key, vnics in outputs.items():
+                if key[0] == 'vm_ports':
+                    vnic_ports.update(parsePortList(vnics))
+
+            # Third batch: rx ring counters of each vNIC port
+            outputs = batch.run({mac: f'vsish -e  get /net/portsets/DvsPortset-0/ports/{port_id}/vmxnet3/rxSummary' for mac, (port_id, uplink) in vnic_ports.items()})
+            pattern_ringSize = re.compile('1st ring size:([0-9]*)')
+            pattern_ringFull = re.compile('# of times the 1st ring is full:([0-9]*)')
+            ring_size = {}
+            ring_full = {}
+            for mac, portSummary in outputs.items():
+                r = pattern_ringSize.search(portSummary)
+                if r:
+                    ring_size[mac] = r.group(1)
+                s = pattern_ringFull.search(portSummary)
+                if s:
+                    ring_full[mac] = s.group(1)
+
+            if not df_vms_network.empty:    # vNICs are joined to their port data by MAC in one step per column
+                macs = df_vms_network['vNIC_MAC']
+                for column, values in [('pNIC_inUse', {mac: uplink for mac, (port_id, uplink) in vnic_ports.items()}), 
+                                       ('vNIC_rxBuffer_Ring1_bytes', ring_size), ('vNIC_rxBuffer_Ring1_fullTimes', ring_full)]:
+                    mask = macs.isin(values.keys())
+                    df_vms_network.loc[mask, column] = macs[mask].map(values)
+
+            if not batch.complete:
+                self.incomplete.add('esxi')
 
         return df_h_network, df_h, df_vms_network
 
-    def idrac_PCIeDeviceInfo(self, df_h_network, idrac_username, idrac_password):
+    def idracName_calculator(self):
+        """Return the iDRAC name of the Host."""
+
+        return self.host_obj.name.replace('hv','rs')
+
+    def idrac_PCIeDeviceInfo(self, df_h_network, redfish):
         """Collect iDRAC info."""
 
-        idracName = self.host_obj.name.replace('hv','rs')
+        idracName = redfish.idracName
         try:
             #print("\n- WARNING, server PCIe Function URIs for iDRAC %s\n" % idracName)
-            req = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1' % (idracName), auth=(idrac_username, idrac_password), verify=False)
-            statusCode = req.status_code
+            pcie_devices = redfish.getMembers('/redfish/v1/Systems/System.Embedded.1', 'PCIeFunctions')    # Expanded in a single request where supported
         except:
             print(f"{idracName} iDRAC connection failure")
+            self.incomplete.add('idrac')
         else:
             try:
-                data = req.json()
-                pcie_devices=[]
-                for i in data[u'PCIeFunctions']:
-                    for ii in i.items():
-                        #print(ii[1])
-                        pcie_devices.append(ii[1])
-                for i in pcie_devices:
-                    req = requests.get('https://%s%s' % (idracName, i), auth=(idrac_username, idrac_password), verify=False)
-                    statusCode = req.status_code
-                    data = req.json()
-                    #message = "\n\n- Detailed information for URI \"%s\"\n\n" % i
-                    #print(message)
-                    nic = 'False'
-                    pci_bdf_hex = ''
-                    ethernet_port_slot = ''
-                    for ii in data.items():
-                        #device = "%s: %s" % (ii[0], ii[1])
-                        #print(device)
-                        if ii[0] == '@odata.id':
-                            pci_bdf_dec = ii[1].split('/')[-1]
-                            pci_b_dec = pci_bdf_dec.split('-')[0]
-                            pci_b_hex = format(int(pci_b_dec), 'x').zfill(2)    # zfill() method to pad a string with zeros
-                            pci_bdf_hex = re.sub(f'{pci_b_dec}-', f'{pci_b_hex}-', pci_bdf_dec).replace('-',':')
-                            last_quote_index = pci_bdf_hex.rfind(":")   # get the index of the last occurrence of char : in str.
-                            correct_pci_bdf_hex = pci_bdf_hex[:last_quote_index] + "0." + pci_bdf_hex[last_quote_index+1:]
-
-                        if ii[0] == 'DeviceClass' and ii[1] == 'NetworkController':
-                            nic = 'True'
-                        if ii[0] == 'Description' and 'Ethernet' in ii[1]:
-                            nic = 'True'
-                        if ii[0] == 'Name' and 'Ethernet' in ii[1]:
-                            nic = 'True'
-                        if ii[0] == 'Description' and 'Network' in ii[1]:
-                            nic = 'True'
-                        if ii[0] == 'Name' and 'Network' in ii[1]:
-                            nic = 'True'
-
-                        if ii[0] == 'Oem':
-                            try:
-                                for iii in ii[1]['Dell']['DellPCIeFunction'].items():
-                                    if iii[0] == '@odata.id':
-                                        ethernet_port_slot = iii[1]
-                            except:
-                                pass
-                    if nic == 'True':
-                        full_pci_bdf = '0000:' + correct_pci_bdf_hex
-                        df_h_network.at[(df_h_network['vmnic_Device'] == full_pci_bdf), 'iDRAC_NIC_Slot'] = ethernet_port_slot.split('/')[-1].split('-')[0]
-                        df_h_network.at[(df_h_network['vmnic_Device'] == full_pci_bdf), 'iDRAC_EthernetPort_Slot'] = ethernet_port_slot.split('/')[-1]
-                        #print(df_h_network[['iDRAC_NIC_Slot', 'iDRAC_EthernetPort_Slot']])
+                for data in pcie_devices:
+                    pcie_function = parsePCIeFunction(data)
+                    if pcie_function:
+                        df_h_network = self.idracPCIeFunction_calculator(df_h_network, *pcie_function)
             except:
                 print(f"Unexpected failure while retrieving PCIe devices data from {idracName} iDRAC.")
+                self.incomplete.add('idrac')
 
         return df_h_network
 
-    def idrac_ethernetInterfaces(self, df_h_network, idrac_username, idrac_password):
+    def idrac_ethernetInterfaces(self, df_h_network, redfish):
         """Collect iDRAC info.
         
         Code adapted from: https://github.com/dell/iDRAC-Redfish-Scripting/blob/e54ae3e03bf96c4f1cee563f64e696dcd67a2769/Redfish%20Python/GetSystemHWInventoryREDFISH.py#L547
@@ -571,13 +632,14 @@ class HostData:
         """
 
         #idracName = self.host_obj.name.split('.')[0].replace('hv','rs')
-        idracName = self.host_obj.name.replace('hv','rs')
+        idracName = redfish.idracName
 
         try:
-            response = requests.get('https://%s/redfish/v1/Systems/System.Embedded.1/NetworkInterfaces' % idracName,verify=False,auth=(idrac_username, idrac_password))
+            response = redfish.get('/redfish/v1/Systems/System.Embedded.1/NetworkInterfaces')
             data = response.json()
         except:
             print(f"{idracName} iDRAC connection failure")
+            self.incomplete.add('idrac')
         else:
             try:
                 #message = "\n---- Network Device Information ----"
@@ -595,153 +657,87 @@ class HostData:
                     #message = "\n- Network device details for %s -\n" % i.split("/")[-1]
                     #print(message)
                     i=i.replace("Interfaces","Adapters")
-                    response = requests.get('https://%s%s' % (idracName, i),verify=False,auth=(idrac_username, idrac_password))
+                    response = redfish.get(i)
                     data = response.json()
 
-                    for ii in data.items():
-                        if ii[0] == 'NetworkPorts':
-                            network_port_urls = []
-                            url_port = ii[1]['@odata.id']
-                            response = requests.get('https://%s%s' % (idracName, url_port),verify=False,auth=(idrac_username, idrac_password))
-                            data = response.json()
-
-                            port_uri_list = []
-                            for i in data['Members']:
-                                port_uri_list.append(i['@odata.id'])
-
-                    for z in port_uri_list:
-                        response = requests.get('https://%s%s' % (idracName, z),verify=False,auth=(idrac_username, idrac_password))
-                        data = response.json()
-                        mac = ''
-                        slot = ''
-                        #message = "\n- Network port details for %s -\n" % z.split("/")[-1]
-                        #print(message)
-                        for ii in data.items():
-
-                            """
-                            if ii[0] == '@odata.id' or ii[0] == '@odata.context' or ii[0] == 'Metrics' or ii[0] == 'Links' or ii[0] == '@odata.type':
-                                pass
-                            elif ii[0] == 'Oem':
-                                try:
-                                    for iii in ii[1]['Dell']['DellSwitchConnection'].items():
-                                        if iii[0] == '@odata.context' or iii[0] == '@odata.type':
-                                            pass
-                                        else:
-                                            message = "%s: %s" % (iii[0], iii[1])
-                                            print(message)
-                                except:
-                                    pass
-                            else:
-                            """
-                            #message = "%s: %s" % (ii[0], ii[1])
-                            #print(message)
-                            if ii[0] == "AssociatedNetworkAddresses":
-                                mac = ii[1][0]
-                            if ii[0] == "@odata.id":
-                                slot = ii[1].split('/')[-1]
-
-                        #This one works for R740
-                        df_h_network.at[(df_h_network['iDRAC_EthernetPort_Slot'] == slot + '-1'), 'vmnic_MAC'] = mac.lower()   
-                        
-                        #This one works for R730
-                        #df_h_network.at[(df_h_network['vmnic_MAC'] == mac.lower()), 'iDRAC_EthernetPort_Slot'] = slot + '-1'
-                        #df_h_network.at[(df_h_network['vmnic_MAC'] == mac.lower()), 'iDRAC_NIC_Slot'] = slot.split('-')[0]
+                    if 'NetworkPorts' in data:
+                        for port in redfish.getMembers(data['NetworkPorts']['@odata.id']):   # Expanded in a single request where supported
+                            df_h_network = self.idracNetworkPort_calculator(df_h_network, *parseNetworkPort(port))
             except:
                 print(f"Unexpected failure while retrieving Ethernet Interfaces data from {idracName} iDRAC.")
+                self.incomplete.add('idrac')
 
 
         return df_h_network
 
-    def get_FW_inventory(self, df_h, idrac_username, idrac_password):
+    def get_FW_inventory(self, df_h, redfish):
         
-        idracName = self.host_obj.name.replace('hv','rs')
+        idracName = redfish.idracName
 
         try:
             #print('Starting Inventory Scan...')
-            req = requests.get('https://%s/redfish/v1/UpdateService/FirmwareInventory' % (idracName), auth=(idrac_username, idrac_password), verify=False)
-            statusCode = req.status_code
+            firmware_inventory = redfish.getMembers('/redfish/v1/UpdateService/FirmwareInventory')  # $expand=*($levels=1) only where the iDRAC supports it (older ones fail loading the URL)
         except:
             print(f"{idracName} iDRAC connection failure")
+            self.incomplete.add('idrac')
         else:
             try:
-                data = req.json()
-                for i in data[u'Members']:
-                    for ii in i.items():
-                        if ii[0] == u'@odata.id':
-                            req = requests.get('https://{}{}'.format(idracName, ii[1]), auth=(idrac_username, idrac_password), verify=False)
-                            statusCode = req.status_code
-                            data2 = req.json()
-                            store = 'False'
-                            column_name = ''
-                            for iii in data2.items():
-                                #message = "\n%s: %s" % (iii[0], iii[1])
-                                #print(message)
-                                if iii[0] == 'Name':
-                                    if iii[1] == 'System CPLD':
-                                        store = 'True'
-                                        column_name = 'CPLD_Version'
-                                        #print("Name {}".format(iii[1]))
-                                    elif iii[1] == 'Lifecycle Controller':
-                                        store = 'True'
-                                        column_name = 'iDRAC_Version'
-                                        #print("Name {}".format(iii[1]))
-                                if iii[0] == 'Version' and store == 'True':
-                                    #print("Version {}".format(iii[1]))
-                                    df_h[column_name] = iii[1].strip()   # Removing spaces
+                for data in firmware_inventory:
+                    firmware = parseFirmware(data)
+                    if firmware:
+                        df_h[firmware[0]] = firmware[1]
             except:
                 print(f"Unexpected failure while retrieving Inventory version data from {idracName} iDRAC.")
-
-            
-            # The code below does not work for all iDRACs (older ones fail loading the URL)
-            """
-            try:
-                #print('Starting Inventory Scan...')
-                #req = requests.get('https://%s/redfish/v1/UpdateService/FirmwareInventory?$expand=*($levels=1)' % (idracName), auth=(idrac_username, idrac_password), verify=False)
-                statusCode = req.status_code
-            except:
-                print("iDRAC connection failure")
-            else:
-                data = req.json()
-
-            for i in data[u'Members']:
-                store = 'False'
-                column_name = ''
-                for ii in i.items():
-                    
-                    #if ii[0] == u'@odata.type':
-                    #    #message = "\n%s: %s" % (ii[0], ii[1])
-                    #    #print(message)
-                    #    if ii[0] == 'Name':
-                    #        element_name = ii[1]
-                    #        #print(element_name)
-                    #    if ii[0] == 'Version':
-                    #        element_version = ii[1]
-                    #        #print(element_version)
-                    #    message = "\n"
-                    #elif ii[0] == "Oem":
-                    #    for iii in ii[1][u'Dell'][u'DellSoftwareInventory'].items():
-                    #        message = "%s: %s" % (iii[0], iii[1])
-                    #        #print(message)
-                    #        message = "\n"
-
-                    #else:
-                    
-                    #message = "%s: %s" % (ii[0], ii[1])
-                    #print(message)
-                    #message = "\n"
-                    if ii[0] == 'Name':
-                        if ii[1] == 'System CPLD':
-                            store = 'True'
-                            column_name = 'CPLD_Version'
-                        elif ii[1] == 'Lifecycle Controller':
-                            store = 'True'
-                            column_name = 'iDRAC_Version'
-                    if ii[0] == 'Version' and store == 'True':
-                        df_h[column_name] = ii[1]     
-            """
+                self.incomplete.add('idrac')
 
         return df_h
 
+    def idracPCIeFunction_calculator(self, df_h_network, full_pci_bdf, ethernet_port_slot):
+        """Return df_h_network with the iDRAC NIC and Ethernet port slots of the pNIC at a given PCI address."""
+
+        df_h_network.at[(df_h_network['vmnic_Device'] == full_pci_bdf), 'iDRAC_NIC_Slot'] = ethernet_port_slot.split('/')[-1].split('-')[0]
+        df_h_network.at[(df_h_network['vmnic_Device'] == full_pci_bdf), 'iDRAC_EthernetPort_Slot'] = ethernet_port_slot.split('/')[-1]
+
+        return df_h_network
+
+    def idracNetworkPort_calculator(self, df_h_network, slot, mac):
+        """Return df_h_network with the MAC address of the pNIC in a given iDRAC port slot."""
+
+        #This one works for R740
+        df_h_network.at[(df_h_network['iDRAC_EthernetPort_Slot'] == slot + '-1'), 'vmnic_MAC'] = mac
+
+        #This one works for R730
+        #df_h_network.at[(df_h_network['vmnic_MAC'] == mac), 'iDRAC_EthernetPort_Slot'] = slot + '-1'
+        #df_h_network.at[(df_h_network['vmnic_MAC'] == mac), 'iDRAC_NIC_Slot'] = slot.split('-')[0]
+
+        return df_h_network
+
+    def idrac_crawlResults(self, df_h, df_h_network, documents):
+        """Fill the iDRAC columns from the Redfish resources fetched by RedfishCrawler.
+
+        Parameters
+        ----------
+        documents : dict
+            RedfishCrawler.crawl() result: {'pcie_functions': [...], 'network_ports': [...], 'firmware': [...]}
+        """
+
+        try:
+            for data in documents['pcie_functions']:
+                pcie_function = parsePCIeFunction(data)
+                if pcie_function:
+                    df_h_network = self.idracPCIeFunction_calculator(df_h_network, *pcie_function)
+            for data in documents['network_ports']:     # Port slots are matched with the slots set from the PCIe functions
+                df_h_network = self.idracNetworkPort_calculator(df_h_network, *parseNetworkPort(data))
+            for data in documents['firmware']:
+                firmware = parseFirmware(data)
+                if firmware:
+                    df_h[firmware[0]] = firmware[1]
+        except:
+            print(f"Unexpected failure while processing {self.idracName_calculator()} iDRAC data.")
+            self.incomplete.add('idrac')
+
+        return df_h, df_h_network
+
     def idrac_cgi(self, df_h, df_h_network, idrac_username, idrac_password):
 
         idracName = self.host_obj.name.split('.')[0].replace('hv','rs')
@@ -755,6 +751,7 @@ class HostData:
             req_content = login_req.text
         except:
             print(f"{idracName} iDRAC connection failure")
+            self.incomplete.add('idrac')
         else:
             if req_status_code == 200:
                 sid_pattern = re.compile('<SID>(.*)</SID>') 
@@ -774,6 +771,7 @@ class HostData:
                     racadm_command_req_content = racadm_command_req.text
                 except:
                     print(f"Error while retrieving {idracName} iDRAC hwinventory: status code {racadm_command_req_status_code}")
+                    self.incomplete.add('idrac')
                 else:
                     if racadm_command_req_status_code == 200:
                         nic_match = re.findall(r'(Device Type = NIC.*?-----)', racadm_command_req_content, re.DOTALL)   # Avoiding regex greddiness
@@ -0,0 +1,215 @@
+from pyVmomi import vim, vmodl
+
+# Properties retrieved in bulk for every VM. They cover every column of the VM table
+VM_PROPERTIES = ['name', 'layoutEx.file', 'snapshot', 'config.uuid', 'config.version', 'config.changeVersion', 'config.hardware.device', 'config.hardware.memoryMB',
+                 'config.hardware.numCPU', 'config.hardware.numCoresPerSocket', 'config.memoryAllocation.reservation', 'config.latencySensitivity',
+                 'config.extraConfig', 'summary.config.cpuReservation', 'summary.config.memoryReservation', 'runtime.powerState', 'runtime.host',
+                 'resourcePool', 'datastore', 'network']
+
+# Properties of the managed objects referenced by the VMs (hosts, clusters, datastores and resource pools)
+HOST_PROPERTIES = ['name', 'parent', 'summary.hardware.numCpuCores', 'summary.hardware.memorySize', 'summary.hardware.cpuMhz']
+CLUSTER_PROPERTIES = ['name', 'configurationEx']
+DATASTORE_PROPERTIES = ['name', 'summary.capacity', 'summary.freeSpace', 'summary.type']
+RESOURCEPOOL_PROPERTIES = ['name']
+RULE_MEMBER_PROPERTIES = ['name', 'runtime.host']   # VMs member of a cluster rule but outside of the queried container
+
+# Host properties watched for changes in incremental mode (WaitForUpdatesEx)
+WATCHED_HOST_PROPERTIES = HOST_PROPERTIES + ['vm', 'datastore', 'runtime.connectionState', 'config.product.build', 'hardware.biosInfo.biosVersion']
+
+class InventoryCollector:
+    'Retrieve vCenter object properties in bulk through the PropertyCollector'
+
+    def __init__(self, content, page_size=500):
+        self.content = content
+        self.page_size = page_size  # Max. number of objects returned per RetrievePropertiesEx/ContinueRetrievePropertiesEx call
+        self.objects = {}   # {moid: {property path: value}}. Unset properties are stored as None
+        self.managedObjects = {}    # {moid: pyvmomi object}
+        self.views = []         # ContainerViews backing the PropertyFilter of the incremental mode
+        self.updateCollector = None
+        self.version = ''       # Version token returned by the last WaitForUpdatesEx call
+
+    def retrieve(self, object_specs, property_specs):
+        """Run a paged RetrievePropertiesEx query and store the results in self.objects.
+
+        Parameters
+        ----------
+        object_specs : list
+            vmodl.query.PropertyCollector.ObjectSpec list defining the starting objects of the query
+        property_specs : list
+            vmodl.query.PropertyCollector.PropertySpec list defining the properties to collect per object type
+
+        Returns
+        -------
+        list
+            list of moids retrieved by this query
+        """
+
+        paths = {spec.type: spec.pathSet for spec in property_specs}
+        filter_spec = vmodl.query.PropertyCollector.FilterSpec(objectSet=object_specs, propSet=property_specs)
+        options = vmodl.query.PropertyCollector.RetrieveOptions(maxObjects=self.page_size)
+
+        moids = []
+        collector = self.content.propertyCollector
+        result = collector.RetrievePropertiesEx([filter_spec], options)
+        while result:
+            for obj_content in result.objects:
+                props = dict.fromkeys(paths.get(type(obj_content.obj), []))    # Properties not set in vCenter are not returned at all
+                props.update({prop.name: prop.val for prop in obj_content.propSet})
+                self.objects.setdefault(obj_content.obj._moId, {}).update(props)
+                self.managedObjects[obj_content.obj._moId] = obj_content.obj
+                moids.append(obj_content.obj._moId)
+            if not result.token:    # Last page
+                break
+            result = collector.ContinueRetrievePropertiesEx(result.token)
+
+        return moids
+
+    def retrieveFromContainer(self, container, obj_type, path_set):
+        """Retrieve the given properties of every object of a given type under a container (host, cluster, datacenter...)."""
+
+        view = self.content.viewManager.CreateContainerView(container, [obj_type], recursive=True)
+        try:
+            traversal_spec = vmodl.query.PropertyCollector.TraversalSpec(name='traverseView', path='view', skip=False, type=vim.view.ContainerView)
+            object_spec = vmodl.query.PropertyCollector.ObjectSpec(obj=view, skip=True, selectSet=[traversal_spec])
+            property_spec = vmodl.query.PropertyCollector.PropertySpec(type=obj_type, pathSet=path_set, all=False)
+            moids = self.retrieve([object_spec], [property_spec])
+        finally:
+            view.Destroy()  # Views are kept in the vCenter session until destroyed
+
+        return moids
+
+    def retrieveObjects(self, objs, property_paths, refresh=False):
+        """Retrieve properties of a list of managed objects.
+
+        Parameters
+        ----------
+        objs : list
+            pyvmomi managed objects (of any type present in property_paths)
+        property_paths : dict
+            {pyvmomi type: list of property paths}
+        refresh : bool
+            retrieve again objects already retrieved
+        """
+
+        objs = {obj._moId: obj for obj in objs if obj is not None and (refresh or obj._moId not in self.objects)}    # Skip objects already retrieved
+        if not objs:
+            return []
+        object_specs = [vmodl.query.PropertyCollector.ObjectSpec(obj=obj, skip=False) for obj in objs.values()]
+        property_specs = [vmodl.query.PropertyCollector.PropertySpec(type=obj_type, pathSet=paths, all=False) for obj_type, paths in property_paths.items()]
+
+        return self.retrieve(object_specs, property_specs)
+
+    def collectVMs(self, container):
+        """Retrieve every property the VM table needs for all VMs in a host/cluster/datacenter.
+
+        Besides the VMs, the hosts, clusters, datastores and resource pools they reference are retrieved too,
+        as well as the members of the cluster rules the VMs belong to. Each step is a single paged query.
+
+        Returns
+        -------
+        objects
+            Dictionary {moid: {property path: value}} to be used by VMdata
+        """
+
+        vm_moids = self.retrieveFromContainer(container, vim.VirtualMachine, VM_PROPERTIES)
+        self.collectRelated(vm_moids)
+
+        return self.objects
+
+    def collectRelated(self, vm_moids, refresh=False):
+        """Retrieve the hosts, clusters, datastores, resource pools and rule members referenced by the given VMs."""
+
+        vms = [self.objects[moid] for moid in vm_moids]
+        related = [vm['runtime.host'] for vm in vms] + [vm['resourcePool'] for vm in vms]
+        for vm in vms:
+            related += vm['datastore'] or []
+        self.retrieveObjects(related, {vim.HostSystem: HOST_PROPERTIES, vim.Datastore: DATASTORE_PROPERTIES, vim.ResourcePool: RESOURCEPOOL_PROPERTIES}, refresh)
+
+        clusters = [self.objects[vm['runtime.host']._moId]['parent'] for vm in vms if vm['runtime.host'] is not None]
+        self.retrieveObjects([cluster for cluster in clusters if isinstance(cluster, vim.ClusterComputeResource)], {vim.ClusterComputeResource: CLUSTER_PROPERTIES}, refresh)
+
+        # Rules may include VMs outside of the container, and their hosts, which are needed to check rule compliance
+        members = []
+        for cluster in clusters:
+            if cluster is not None and cluster._moId in self.objects and self.objects[cluster._moId].get('configurationEx'):
+                for rule in self.objects[cluster._moId]['configurationEx'].rule:
+                    members += getattr(rule, 'vm', None) or []
+        in_scope = set(vm_moids)
+        self.retrieveObjects([vm for vm in members if vm._moId not in in_scope], {vim.VirtualMachine: RULE_MEMBER_PROPERTIES}, refresh)
+        hosts = {host._moId for host in related if isinstance(host, vim.HostSystem)}  # Already retrieved (refreshed) above
+        member_hosts = [self.objects[vm._moId]['runtime.host'] for vm in members if vm._moId in self.objects]
+        self.retrieveObjects([host for host in member_hosts if host is not None and host._moId not in hosts], {vim.HostSystem: HOST_PROPERTIES}, refresh)  # Members may have been vMotioned since
+
+    def createFilter(self, container_list):
+        """Create a PropertyFilter over the VMs and hosts in the given containers, to be polled with waitForUpdates.
+
+        The first WaitForUpdatesEx call returns the current state of every object. It is stored in self.objects
+        and becomes the baseline of the following calls.
+        """
+
+        self.updateCollector = self.content.propertyCollector.CreatePropertyCollector()    # Dedicated collector. Its filters do not interfere with other queries in the session
+        object_specs = []
+        for container in container_list:
+            view = self.content.viewManager.CreateContainerView(container, [vim.VirtualMachine, vim.HostSystem], recursive=True)
+            self.views.append(view)
+            traversal_spec = vmodl.query.PropertyCollector.TraversalSpec(name='traverseView', path='view', skip=False, type=vim.view.ContainerView)
+            object_specs.append(vmodl.query.PropertyCollector.ObjectSpec(obj=view, skip=True, selectSet=[traversal_spec]))
+        property_specs = [vmodl.query.PropertyCollector.PropertySpec(type=vim.VirtualMachine, pathSet=VM_PROPERTIES, all=False),
+                          vmodl.query.PropertyCollector.PropertySpec(type=vim.HostSystem, pathSet=WATCHED_HOST_PROPERTIES, all=False)]
+        filter_spec = vmodl.query.PropertyCollector.FilterSpec(objectSet=object_specs, propSet=property_specs)
+        self.updateCollector.CreateFilter(filter_spec, partialUpdates=False)    # Full values of the changed properties are reported
+
+        self.version = ''
+        self.waitForUpdates()
+
+    def waitForUpdates(self, max_wait=0):
+        """Return the VMs and hosts changed since the previous call (WaitForUpdatesEx with the saved version token).
+
+        Changed properties are applied to self.objects so that changed objects can be re-derived without any other call.
+
+        Parameters
+        ----------
+        max_wait : int
+            seconds to wait for changes. 0 returns immediately
+
+        Returns
+        -------
+        changes
+            Dictionary {moid: (pyvmomi object, kind)}, kind being 'enter', 'modify' or 'leave'
+        """
+
+        changes = {}
+        options = vmodl.query.PropertyCollector.WaitOptions(maxWaitSeconds=max_wait)
+        while True:
+            update_set = self.updateCollector.WaitForUpdatesEx(self.version, options)
+            if update_set is None:  # No changes until max_wait expired
+                break
+            self.version = update_set.version
+            for filter_update in update_set.filterSet:
+                for obj_update in filter_update.objectSet:
+                    moid = obj_update.obj._moId
+                    if obj_update.kind == 'leave':
+                        self.objects.pop(moid, None)
+                    else:
+                        if obj_update.kind == 'enter':
+                            paths = VM_PROPERTIES if isinstance(obj_update.obj, vim.VirtualMachine) else WATCHED_HOST_PROPERTIES
+                            self.objects[moid] = dict.fromkeys(paths)
+                        props = self.objects.setdefault(moid, {})
+                        for change in obj_update.changeSet:
+                            props[change.name] = change.val if change.op in ('add', 'assign') else None  # 'remove' and 'indirectRemove' unset the property
+                        self.managedObjects[moid] = obj_update.obj
+                    changes[moid] = (obj_update.obj, obj_update.kind)
+            if not update_set.truncated:    # More changes pending otherwise
+                break
+
+        return changes
+
+    def destroyFilter(self):
+        """Destroy the PropertyFilter and the ContainerViews of the incremental mode."""
+
+        if self.updateCollector is not None:
+            self.updateCollector.DestroyPropertyCollector()  # Filters are destroyed along with their collector
+            self.updateCollector = None
+        for view in self.views:
+            view.Destroy()
+        self.views = []
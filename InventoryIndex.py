@@ -0,0 +1,94 @@
+import json, re, time
+from pyVmomi import vmodl
+from InventoryCollector import InventoryCollector
+
+class InventoryIndex:
+    'Name index of vCenter inventory objects (name, parent and moRef), built with one PropertyCollector query per object type'
+
+    def __init__(self, content, cache_file=None, ttl=3600):
+        self.content = content
+        self.cache_file = cache_file    # JSON file where the index is kept between runs. None to keep it only for this session
+        self.ttl = ttl      # Seconds an index saved to cache_file is valid
+        self.entries = {}   # {type name: [(name, moid, parent moid)]}
+        self.timestamps = {}    # {type name: time the entries were retrieved from vCenter}
+        self.from_cache = set()     # Types loaded from cache_file. Their objects may have been renamed or removed since
+        self.vcenter = ''
+        if cache_file:
+            self.vcenter = content.about.instanceUuid   # The cache file is only valid for the vCenter it was retrieved from
+            self.load()
+
+    def load(self):
+        """Load the index entries saved to cache_file by a previous run, skipping those older than ttl."""
+
+        try:
+            with open(self.cache_file) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):   # No cache yet or unreadable. The index is retrieved from vCenter
+            return
+        if cache.get('vcenter') != self.vcenter:
+            return
+
+        for type_name, saved in cache.get('types', {}).items():
+            if time.time() - saved['timestamp'] < self.ttl:
+                self.entries[type_name] = [tuple(entry) for entry in saved['entries']]
+                self.timestamps[type_name] = saved['timestamp']
+                self.from_cache.add(type_name)
+
+    def save(self):
+        """Write the index entries to cache_file."""
+
+        cache = {'vcenter': self.vcenter, 'types': {type_name: {'timestamp': self.timestamps[type_name], 'entries': entries} for type_name, entries in self.entries.items()}}
+        try:
+            with open(self.cache_file, 'w') as f:
+                json.dump(cache, f)
+        except OSError:
+            print(f"Inventory index could not be saved to {self.cache_file}")
+
+    def build(self, obj_type):
+        """Retrieve name and parent of every object of a given type in vCenter (single paged PropertyCollector query)."""
+
+        type_name = obj_type._wsdlName
+        collector = InventoryCollector(self.content)
+        moids = collector.retrieveFromContainer(self.content.rootFolder, obj_type, ['name', 'parent'])
+        self.entries[type_name] = [(collector.objects[moid]['name'], moid, collector.objects[moid]['parent']._moId if collector.objects[moid]['parent'] is not None else '')
+                                    for moid in moids]
+        self.timestamps[type_name] = time.time()
+        self.from_cache.discard(type_name)
+        if self.cache_file:
+            self.save()
+
+    def select(self, obj_type, match):
+        """Return the pyvmomi objects of a given type whose name satisfies match(name), in inventory order.
+
+        Entries loaded from cache_file are checked against vCenter. If no object matches, or any object was
+        renamed or removed since it was saved, the index of that type is retrieved again.
+        """
+
+        type_name = obj_type._wsdlName
+        if type_name not in self.entries:
+            self.build(obj_type)
+        objs = [obj_type(moid, self.content.rootFolder._stub) for name, moid, parent in self.entries[type_name] if match(name)]
+
+        if type_name in self.from_cache:
+            try:
+                valid = bool(objs) and all(match(obj.name) for obj in objs)    # Not found may be an object created after the index was saved
+            except vmodl.fault.ManagedObjectNotFound:
+                valid = False
+            if not valid:
+                self.build(obj_type)
+                return self.select(obj_type, match)
+            self.from_cache.discard(type_name)  # Checked once per session
+
+        return objs
+
+    def find(self, obj_type, name):
+        """Return the objects of a given type with this exact name."""
+
+        return self.select(obj_type, lambda obj_name: obj_name == name)
+
+    def search(self, obj_type, pattern, flags=0):
+        """Return the objects of a given type whose name matches a regular expression."""
+
+        regex = re.compile(pattern, flags)
+
+        return self.select(obj_type, lambda obj_name: regex.search(obj_name) is not None)
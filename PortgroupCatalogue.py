@@ -0,0 +1,123 @@
+import threading
+from pyVmomi import vim, vmodl
+from InventoryCollector import InventoryCollector
+
+# Properties of the dVSes and distributed portgroups used by the vNIC table
+DVS_PROPERTIES = ['name', 'portgroup']
+VMWARE_DVS_PROPERTIES = ['config.linkDiscoveryProtocolConfig']   # Only defined in the config of VMware dVSes
+PORTGROUP_PROPERTIES = ['key', 'name', 'config.defaultPortConfig', 'config.distributedVirtualSwitch', 'config.uplink']
+
+# Dictionary of possible loadbalancing models
+DPG_LB_POLICIES = {'loadbalance_ip': 'Route based on IP hash',
+                   'loadbalance_srcmac': 'Route based on source MAC hash',
+                   'loadbalance_srcid': 'Route based on originating virtual port',
+                   'failover_explicit': 'Use explicit failover order',
+                   'loadbalance_loadbased': 'Route based on physical NIC load'}
+
+# Entry of the vNICs whose portgroup is not found
+EMPTY_PORTGROUP = {'vNIC_DPG': '', 'DPG_Promiscuous_Mode': '', 'DPG_MAC_Address_Changes': '', 'DPG_Forged_Transmits': '', 'vNIC_VLANs': [], 'vNIC_dVS': '',
+                   'dVS_LLDP': 'false', 'DPG_Load_Balancing': '', 'active_uplinks': [], 'standby_uplinks': [], 'dvs': None}
+
+def portgroupEntry(name, default_port_config, dvs_obj, dvs_name, link_discovery):
+    """Return the vNIC table fields of a distributed portgroup, from its default port config and its dVS.
+
+    Returns
+    -------
+    dict
+        {vNIC column: value} plus the uplinks in teaming order (active_uplinks, standby_uplinks) and the dVS object (dvs)
+    """
+
+    vlan_list = []
+    vlan_id = getattr(default_port_config.vlan, 'vlanId', None)    # PVLAN portgroups have no vlanId
+    if "Range" in str(type(vlan_id)):
+        for item in vlan_id:
+            if item.start != item.end:
+                range_string = "{}-{}".format(item.start, item.end)
+            else:
+                range_string = item.start
+            vlan_list.append(range_string)
+    elif "int" in str(type(vlan_id)):
+        vlan_list.append(vlan_id)
+
+    security = default_port_config.securityPolicy
+    teaming = default_port_config.uplinkTeamingPolicy
+
+    return {'vNIC_DPG': name, 'DPG_Promiscuous_Mode': security.allowPromiscuous.value, 'DPG_MAC_Address_Changes': security.macChanges.value,
+            'DPG_Forged_Transmits': security.forgedTransmits.value, 'vNIC_VLANs': vlan_list, 'vNIC_dVS': dvs_name,
+            'dVS_LLDP': "True" if link_discovery is not None and "lldp" in link_discovery.protocol else "false",
+            'DPG_Load_Balancing': DPG_LB_POLICIES.get(teaming.policy.value, teaming.policy.value),
+            'active_uplinks': list(teaming.uplinkPortOrder.activeUplinkPort or []), 'standby_uplinks': list(teaming.uplinkPortOrder.standbyUplinkPort or []),
+            'dvs': dvs_obj}
+
+class PortgroupCatalogue:
+    'Distributed portgroups used by the vNICs, indexed by portgroup key. Retrieved once per dVS with the PropertyCollector and shared by all VMs of a run'
+
+    def __init__(self, content):
+        self.collector = InventoryCollector(content)
+        self.portgroups = {}    # {portgroup key: portgroupEntry}
+        self.switches = set()   # dVS moids whose portgroups are already catalogued
+        self.missing = set()    # Portgroup keys not found in the dVSes of the VM networks
+        self.failed = False     # The PropertyCollector rejected a catalogue query. VMs read their portgroups themselves
+        self.lock = threading.Lock()    # The catalogue is shared by the Host worker threads
+
+    def clear(self):
+        """Forget every catalogued portgroup, so that they are retrieved again (i.e. on every incremental poll)."""
+
+        with self.lock:
+            self.collector = InventoryCollector(self.collector.content)
+            self.portgroups = {}
+            self.switches = set()
+            self.missing = set()
+            self.failed = False
+
+    def addSwitches(self, dvs_objs):
+        """Retrieve the dVSes and all their portgroups in two queries and catalogue the portgroups."""
+
+        moids = self.collector.retrieveObjects(dvs_objs, {vim.DistributedVirtualSwitch: DVS_PROPERTIES, vim.dvs.VmwareDistributedVirtualSwitch: VMWARE_DVS_PROPERTIES}, refresh=True)
+        self.switches.update(moids)
+        dpgs = [dpg for moid in moids for dpg in self.collector.objects[moid].get('portgroup') or []]
+        for moid in self.collector.retrieveObjects(dpgs, {vim.dvs.DistributedVirtualPortgroup: PORTGROUP_PROPERTIES}, refresh=True):
+            props = self.collector.objects[moid]
+            if props['config.uplink']:  # Uplink portgroups have no vNICs
+                continue
+            dvs_props = self.collector.objects[props['config.distributedVirtualSwitch']._moId]
+            self.portgroups[props['key']] = portgroupEntry(props['name'], props['config.defaultPortConfig'], props['config.distributedVirtualSwitch'],
+                                                           dvs_props.get('name'), dvs_props.get('config.linkDiscoveryProtocolConfig'))
+
+    def portgroup(self, key, network_objs):
+        """Return the entry of a distributed portgroup, cataloguing the dVSes of the VM networks first if the portgroup is not known yet.
+
+        Parameters
+        ----------
+        key : str
+            portgroup key of a vNIC backing
+        network_objs : list
+            networks of the VM (vm.network)
+
+        Returns
+        -------
+        dict
+            portgroupEntry of the portgroup, EMPTY_PORTGROUP if not found, or None if the catalogue could not be retrieved
+        """
+
+        with self.lock:
+            if self.failed:
+                return None
+            if key not in self.portgroups and key not in self.missing:
+                dpgs = [network_obj for network_obj in network_objs if isinstance(network_obj, vim.dvs.DistributedVirtualPortgroup)]
+                try:
+                    self.collector.retrieveObjects(dpgs, {vim.dvs.DistributedVirtualPortgroup: ['config.distributedVirtualSwitch']})
+                    switches = {}   # {moid: dVS object}
+                    for dpg in dpgs:
+                        dvs_obj = self.collector.objects.get(dpg._moId, {}).get('config.distributedVirtualSwitch')
+                        if dvs_obj is not None and dvs_obj._moId not in self.switches:
+                            switches[dvs_obj._moId] = dvs_obj
+                    self.addSwitches(list(switches.values()))
+                except vmodl.MethodFault as e:
+                    print(f"Portgroup catalogue could not be retrieved ({e.msg}). Portgroups are read per VM")
+                    self.failed = True
+                    return None
+                if key not in self.portgroups:  # Not looked up again on every vNIC
+                    self.missing.add(key)
+
+        return self.portgroups.get(key, EMPTY_PORTGROUP)
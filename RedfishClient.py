@@ -0,0 +1,158 @@
+import re, requests, urllib3
+from requests.adapters import HTTPAdapter
+from urllib.parse import urljoin
+
+urllib3.disable_warnings()  # To disable HTTPS security warnings when cert validation is disabled
+class RedfishClient:
+    'Redfish session to an iDRAC over a pool of keep-alive connections'
+
+    expand_support = {}     # {idracName: $expand query supported by the iDRAC, '' if none}. Probed once per iDRAC and run
+
+    def __init__(self, idracName, idrac_username, idrac_password, pool_size=4, timeout=60):
+        self.idracName = idracName
+        self.base_url = 'https://{}'.format(idracName)
+        self.idrac_username = idrac_username
+        self.idrac_password = idrac_password
+        self.timeout = timeout
+        self.session_uri = ''   # Redfish session resource. Deleted on logout
+
+        self.session = requests.Session()   # Keeps the TLS connections open between requests
+        self.session.verify = False
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+
+    def __enter__(self):
+        self.login()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.logout()
+
+    def login(self):
+        """Open a SessionService session. The X-Auth-Token is sent in every following request.
+
+        If the iDRAC does not support sessions, every request falls back to basic authentication.
+        """
+
+        req = None
+        try:
+            req = self.session.post(self.base_url + '/redfish/v1/SessionService/Sessions', json={'UserName': self.idrac_username, 'Password': self.idrac_password}, timeout=self.timeout)
+            token = req.headers.get('X-Auth-Token')
+        except requests.exceptions.RequestException:
+            token = None    # Connection failures are reported by the collectors on their first request
+
+        if req is not None and req.status_code in (200, 201) and token:
+            self.session.headers['X-Auth-Token'] = token
+            if req.headers.get('Location'):
+                self.session_uri = urljoin(self.base_url, req.headers['Location'])
+        else:
+            self.session.auth = (self.idrac_username, self.idrac_password)
+
+    def logout(self):
+        """Delete the Redfish session (iDRACs only allow a few concurrent sessions) and close the connections."""
+
+        if self.session_uri:
+            try:
+                self.session.delete(self.session_uri, timeout=self.timeout)
+            except requests.exceptions.RequestException:
+                pass
+            self.session_uri = ''
+        self.session.close()
+
+    def get(self, uri, timeout=None):
+        """Return the response to a GET request. uri is relative to the iDRAC (/redfish/v1/...). timeout defaults to the client timeout."""
+
+        return self.session.get(self.base_url + uri, timeout=timeout or self.timeout)
+
+    def expandQuery(self, timeout=None):
+        """Return the $expand query value supported by the iDRAC ('' if none), from ProtocolFeaturesSupported of the service root.
+
+        The result is cached per iDRAC, so the service root is requested only once per run.
+        """
+
+        if self.idracName not in RedfishClient.expand_support:
+            query = ''
+            features = self.get('/redfish/v1', timeout).json().get('ProtocolFeaturesSupported', {}).get('ExpandQuery', {})
+            if features.get('NoLinks'):     # '.' expands Members but not the Links section
+                query = '.'
+            elif features.get('ExpandAll'):
+                query = '*'
+            if query and features.get('Levels'):
+                query += '($levels=1)'
+            RedfishClient.expand_support.setdefault(self.idracName, query)
+
+        return RedfishClient.expand_support[self.idracName]
+
+    def getMembers(self, uri, prop='Members'):
+        """Return the resources referenced by the prop list of uri (collection Members by default).
+
+        Where the iDRAC supports $expand they are returned by the same request. Otherwise, or for any member
+        the iDRAC did not expand, they are requested one by one.
+        """
+
+        data = None
+        query = self.expandQuery()
+        if query:
+            req = self.get(uri + '?$expand=' + query)
+            if req.status_code == 200:
+                data = req.json()
+        if data is None or prop not in data:    # Older iDRACs reject $expand
+            data = self.get(uri).json()
+
+        members = []
+        for member in data[prop]:
+            if isExpanded(member):
+                members.append(member)
+            else:
+                members.append(self.get(member['@odata.id']).json())
+
+        return members
+
+def isExpanded(member):
+    """Return True if a collection member holds the resource itself rather than just its @odata.id link."""
+
+    return any(key != '@odata.id' for key in member)
+
+def parsePCIeFunction(data):
+    """Return (vmnic PCI address, Dell Ethernet port slot URI) of a network PCIeFunction resource, or None if it is not a NIC function."""
+
+    nic = False
+    full_pci_bdf = ''
+    ethernet_port_slot = ''
+    for key, value in data.items():
+        if key == '@odata.id':
+            pci_bdf_dec = value.split('/')[-1]
+            pci_b_dec = pci_bdf_dec.split('-')[0]
+            pci_b_hex = format(int(pci_b_dec), 'x').zfill(2)    # zfill() method to pad a string with zeros
+            pci_bdf_hex = re.sub(f'{pci_b_dec}-', f'{pci_b_hex}-', pci_bdf_dec).replace('-',':')
+            last_quote_index = pci_bdf_hex.rfind(":")   # get the index of the last occurrence of char : in str.
+            full_pci_bdf = '0000:' + pci_bdf_hex[:last_quote_index] + "0." + pci_bdf_hex[last_quote_index+1:]
+        if key == 'DeviceClass' and value == 'NetworkController':
+            nic = True
+        if key in ('Description', 'Name') and ('Ethernet' in value or 'Network' in value):
+            nic = True
+        if key == 'Oem':
+            try:
+                ethernet_port_slot = value['Dell']['DellPCIeFunction']['@odata.id']
+            except:
+                pass
+
+    return (full_pci_bdf, ethernet_port_slot) if nic else None
+
+def parseNetworkPort(data):
+    """Return (port slot, MAC address) of a NetworkPort resource."""
+
+    mac = ''
+    if data.get('AssociatedNetworkAddresses'):
+        mac = data['AssociatedNetworkAddresses'][0]
+    slot = data.get('@odata.id', '').split('/')[-1]
+
+    return slot, mac.lower()
+
+def parseFirmware(data):
+    """Return (column name, version) of the CPLD and Lifecycle Controller FirmwareInventory members, None for any other member."""
+
+    column_name = {'System CPLD': 'CPLD_Version', 'Lifecycle Controller': 'iDRAC_Version'}.get(data.get('Name'))
+    if column_name and 'Version' in data:
+        return column_name, data['Version'].strip()   # Removing spaces
+
+    return None
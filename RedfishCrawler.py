@@ -0,0 +1,131 @@
+import asyncio, time
+from concurrent.futures import ThreadPoolExecutor
+from RedfishClient import isExpanded
+
+class RedfishCrawler:
+    'Fetch the iDRAC Redfish resources used by HostData concurrently, level by level'
+
+    def __init__(self, redfish, max_concurrency=4, deadline=120):
+        self.redfish = redfish  # Logged in RedfishClient. Its connection pool should hold max_concurrency connections
+        self.max_concurrency = max_concurrency  # Max. number of requests in flight to this iDRAC
+        self.deadline = deadline    # Seconds allowed for the whole crawl
+        self.documents = {'pcie_functions': [], 'network_ports': [], 'firmware': []}
+        self.complete = False   # Set by crawl(). False if the deadline expired or any resource failed to load
+
+    def crawl(self):
+        """Return the PCIe functions, network ports and firmware inventory members of the iDRAC.
+
+        The three trees are walked at the same time and every member of a collection is requested at once,
+        bounded by max_concurrency. Resources fetched before the deadline expires are returned anyway,
+        with complete set to False.
+
+        Returns
+        -------
+        documents
+            Dictionary {'pcie_functions': [...], 'network_ports': [...], 'firmware': [...]} of Redfish resources (JSON)
+        """
+
+        self.executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        self.end = time.monotonic() + self.deadline
+        self.complete = True
+        try:
+            asyncio.run(asyncio.wait_for(self.crawlAll(), self.deadline))
+        except asyncio.TimeoutError:
+            self.complete = False
+            print(f"{self.redfish.idracName} iDRAC crawl did not finish in {self.deadline} seconds. Partial data retrieved.")
+        finally:
+            self.executor.shutdown(wait=True, cancel_futures=True)    # Requests in flight end by the deadline (requestTimeout). The session is only closed after them
+
+        return self.documents
+
+    async def crawlAll(self):
+        """Walk the PCIe functions, network ports and firmware inventory trees at the same time."""
+
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)    # Created here to belong to the crawl event loop
+        try:
+            self.expand_query = await asyncio.get_running_loop().run_in_executor(self.executor, self.redfish.expandQuery, self.requestTimeout())
+        except Exception:
+            self.expand_query = ''
+        results = await asyncio.gather(self.crawlPCIeFunctions(), self.crawlNetworkPorts(), self.crawlFirmware(), return_exceptions=True)
+        for tree, result in zip(['PCIe devices', 'Ethernet Interfaces', 'Inventory version'], results):
+            if isinstance(result, Exception):
+                self.complete = False
+                print(f"Unexpected failure while retrieving {tree} data from {self.redfish.idracName} iDRAC.")
+
+    def requestTimeout(self):
+        """Return the timeout of a request started now: the client timeout, but no longer than the time left until the deadline."""
+
+        return max(min(self.redfish.timeout, self.end - time.monotonic()), 0.1)
+
+    async def fetch(self, uri):
+        """Return the JSON resource at uri. The blocking request runs in a thread of the crawl executor."""
+
+        async with self.semaphore:
+            response = await asyncio.get_running_loop().run_in_executor(self.executor, self.redfish.get, uri, self.requestTimeout())
+            return response.json()
+
+    async def fetchMembers(self, uris, kind):
+        """Fetch a list of resources concurrently and store them under documents[kind] as they arrive. Members failing to load are skipped."""
+
+        await asyncio.gather(*[self.fetchMember(uri, kind) for uri in uris])
+
+    async def fetchExpanded(self, uri, prop='Members'):
+        """Return the resource at uri with its prop list expanded, or None if the iDRAC does not support $expand or rejected it."""
+
+        if self.expand_query:
+            try:
+                data = await self.fetch(uri + '?$expand=' + self.expand_query)
+            except Exception:
+                return None
+            if prop in data:    # Older iDRACs reject $expand
+                return data
+        return None
+
+    async def fetchCollection(self, uri, kind, prop='Members'):
+        """Store the resources referenced by the prop list of uri under documents[kind].
+
+        Where the iDRAC supports $expand they come in the same request. Members not expanded are fetched concurrently.
+        """
+
+        data = await self.fetchExpanded(uri, prop)
+        if data is None:
+            data = await self.fetch(uri)
+
+        self.documents[kind] += [member for member in data[prop] if isExpanded(member)]
+        await self.fetchMembers([member['@odata.id'] for member in data[prop] if not isExpanded(member)], kind)
+
+    async def fetchMember(self, uri, kind):
+        try:
+            self.documents[kind].append(await self.fetch(uri))    # Stored right away, so it is kept if the deadline expires before its siblings
+        except Exception:
+            self.complete = False
+
+    async def crawlPCIeFunctions(self):
+        """Fetch the PCIe functions of the system."""
+
+        await self.fetchCollection('/redfish/v1/Systems/System.Embedded.1', 'pcie_functions', 'PCIeFunctions')
+
+    async def crawlNetworkPorts(self):
+        """Fetch the ports of every network adapter of the system.
+
+        Where the iDRAC supports $expand every adapter comes in a single request of the NetworkAdapters collection.
+        Otherwise the adapters are found through NetworkInterfaces and fetched one by one.
+        """
+
+        data = await self.fetchExpanded('/redfish/v1/Systems/System.Embedded.1/NetworkAdapters')
+        if data is None:
+            data = await self.fetch('/redfish/v1/Systems/System.Embedded.1/NetworkInterfaces')
+            data['Members'] = [{'@odata.id': i['@odata.id'].replace('Interfaces', 'Adapters')} for i in data['Members']]
+        await asyncio.gather(*[self.crawlAdapterPorts(adapter) for adapter in data['Members']])
+
+    async def crawlAdapterPorts(self, adapter):
+        """Fetch the ports of a network adapter (expanded member or link). Each adapter goes down its own tree without waiting for the others."""
+
+        data = adapter if isExpanded(adapter) else await self.fetch(adapter['@odata.id'])
+        if 'NetworkPorts' in data:
+            await self.fetchCollection(data['NetworkPorts']['@odata.id'], 'network_ports')
+
+    async def crawlFirmware(self):
+        """Fetch the members of the firmware inventory."""
+
+        await self.fetchCollection('/redfish/v1/UpdateService/FirmwareInventory', 'firmware')
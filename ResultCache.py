@@ -0,0 +1,44 @@
+import pickle, sqlite3, threading, time
+
+class ResultCache:
+    'On-disk (SQLite) cache of the VM and vNIC records derived by vm_scavenger, keyed by VM MOID, config.changeVersion and Host MOID'
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()    # The connection is shared by the Host worker threads
+        self.connection = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        with self.lock:
+            self.connection.execute('PRAGMA journal_mode=WAL')  # Worker processes read and write the same file
+            self.connection.execute('CREATE TABLE IF NOT EXISTS vm_records (moid TEXT PRIMARY KEY, change_version TEXT, host_moid TEXT, datastore_moid TEXT, '
+                                    'vm_record BLOB, vnic_records BLOB, timestamp REAL)')
+            self.connection.commit()
+
+    def get(self, moid, change_version, host_moid):
+        """Return the rows cached for a VM, or None if the VM is not cached or its configuration or Host changed since.
+
+        Returns
+        -------
+        tuple
+            (vm_record, vnic_records, datastore_moid) as stored by put
+        """
+
+        with self.lock:
+            row = self.connection.execute('SELECT change_version, host_moid, datastore_moid, vm_record, vnic_records FROM vm_records WHERE moid = ?', (moid,)).fetchone()
+        if row is None or row[0] != change_version or row[1] != host_moid:
+            return None
+
+        return pickle.loads(row[3]), pickle.loads(row[4]), row[2]
+
+    def put(self, moid, change_version, host_moid, datastore_moid, vm_record, vnic_records):
+        """Store the rows derived for a VM, replacing any previous version."""
+
+        with self.lock:
+            self.connection.execute('INSERT OR REPLACE INTO vm_records VALUES (?, ?, ?, ?, ?, ?, ?)', (moid, change_version, host_moid, datastore_moid,
+                                    pickle.dumps(vm_record), pickle.dumps(vnic_records), time.time()))
+            self.connection.commit()
+
+    def close(self):
+        """Close the cache file."""
+
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,49 @@
+from collections import Counter
+
+AFFINITY_RULE = 'vim.cluster.AffinityRuleSpec'
+ANTIAFFINITY_RULE = 'vim.cluster.AntiAffinityRuleSpec'
+
+class RuleIndex:
+    'Affinity and antiAffinity rules of a cluster indexed by VM (rule members, rules of each VM and current Host of each member), built once per cluster'
+
+    def __init__(self, rules, get_object_property):
+        self.rules = []     # [(rule class name, [member VM moids], Counter of member Hosts)]
+        self.vm_rules = {}  # {VM moid: [position in rules]}
+        self.vm_names = {}  # {VM moid: name}
+        self.vm_hosts = {}  # {VM moid: current Host name}
+
+        for rule in rules:
+            if rule.__class__.__name__ not in (AFFINITY_RULE, ANTIAFFINITY_RULE):   # VM-Host rules have no VM members
+                continue
+            members = [vm._moId for vm in rule.vm]
+            for vm in rule.vm:
+                if vm._moId not in self.vm_names:   # Members of several rules are read once
+                    host_obj = get_object_property(vm, 'runtime.host')
+                    self.vm_names[vm._moId] = get_object_property(vm, 'name')
+                    self.vm_hosts[vm._moId] = get_object_property(host_obj, 'name') if host_obj is not None else None
+                self.vm_rules.setdefault(vm._moId, []).append(len(self.rules))
+            self.rules.append((rule.__class__.__name__, members, Counter(self.vm_hosts[moid] for moid in members)))
+
+    def ruleMembers(self, moid, rule_class):
+        """Return the names of the other VMs in the rules of a given class (the last one if many) where a VM is a member."""
+
+        members_list = []
+        for position in self.vm_rules.get(moid, []):
+            rule_type, members, hosts = self.rules[position]
+            if rule_type == rule_class:
+                members_list = [self.vm_names[member] for member in members if member != moid]   # Every VM except itself
+
+        return members_list
+
+    def ruleCompliant(self, moid):
+        """Return whether a VM observes all its Affinity and antiAffinity rules, given the current Host of every member."""
+
+        host = self.vm_hosts.get(moid)
+        for position in self.vm_rules.get(moid, []):
+            rule_type, members, hosts = self.rules[position]
+            if rule_type == AFFINITY_RULE and len(hosts) > 1:    # Any VM in the Affinity rule is in a different host as this one
+                return "False"
+            if rule_type == ANTIAFFINITY_RULE and hosts[host] > 1:     # Any VM in the antiAffinity rule is in the same host as this one
+                return "False"
+
+        return "True"
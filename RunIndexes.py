@@ -0,0 +1,35 @@
+import threading
+
+class RunIndexes:
+    'Indexes shared by the VMs of a run (cluster rules, dVS Port Mirror sessions, Host uplink maps and the portgroup catalogue), built once per object'
+
+    def __init__(self, portgroup_catalogue=None):
+        self.portgroup_catalogue = portgroup_catalogue  # PortgroupCatalogue (optional). Portgroups are read from the VM networks if not given
+        self.indexes = {}   # {(kind, moid): index}
+        self.locks = {}     # {(kind, moid): lock held while the index is built}
+        self.lock = threading.Lock()    # The indexes are shared by the Host worker threads
+
+    def get(self, kind, moid, build):
+        """Return the index of a given kind (i.e. 'rules') for a managed object, calling build() if it is the first VM asking for it.
+
+        VMs asking for an index being built by another Host worker wait for it instead of building it again.
+        """
+
+        key = (kind, moid)
+        with self.lock:
+            lock = self.locks.setdefault(key, threading.Lock())
+        with lock:
+            index = self.indexes.get(key)
+            if index is None:
+                index = self.indexes[key] = build()
+
+        return index
+
+    def clear(self):
+        """Forget every index and catalogued portgroup, so that they are built again (i.e. on every incremental poll)."""
+
+        with self.lock:
+            self.indexes = {}
+            self.locks = {}
+        if self.portgroup_catalogue is not None:
+            self.portgroup_catalogue.clear()
@@ -0,0 +1,204 @@
+import numpy as np
+import pandas as pd
+
+# Column order of the output tables. Columns not listed here (i.e. Sockets beyond the second one) are kept after them
+VM_COLUMNS = ['VM_Name', 'MOID', 'Host_Name', 'VM_vCPU', 'VM_vMEM_GB', 'VM_Provisioned_Storage_GB', 'VM_Space_In_Disk_GB',
+                'VM_RealTime', 'VM_LatencySensitivity', 'VM_CoresPerSocket', 'VM_NUMA', 'CPU_Reservation_MHz', 'RAM_Reservation_GB',
+                'SRIOV_vNICs', 'VMXNET3_vNICs', 'PCIPT_vNICs', 'VM_SwapFile_Size_GB', 'Cluster_Name', 'Datastore_Name', 'Datastore_Capacity_GB',
+                'Datastore_Free_GB', 'VM_Provisioned_vHDDs', 'VM_Snapshot', 'Restoration_Allowed', 'Snapshot_Allowed', 'VM_PowerState', 'VM_AntiAffinity',
+                'VM_Affinity', 'VM_AR_Rule_Compliant', 'VM_SP_Label', 'VM_SP_proxyURI', 'VM_SP_serviceURI', 'VM_SP_direction', 'Host_CPU_Package_MHz',
+                'VirtualHardware_Version', 'UUID', 'Host_MOID', 'timestamp', 'VM_ResourcePool']
+
+VNIC_COLUMNS = ['VM_Name', 'vNIC_Name', 'vNIC_Type', 'vNIC_DPG', 'vNIC_VLANs', 'vNIC_MAC', 'pNIC_inUse', 'pNIC_inUse_NUMA', 'vNIC_GuestOS_Mapping_Order', 'vNIC_pciSlotNumber',
+                'vNIC_rxBuffer_Ring1_bytes', 'vNIC_rxBuffer_Ring1_fullTimes', 'vNIC_SRIOV_VF_ID', 'pNIC_PCI_Device', 'PortMirror_Session_Source', 'DPG_Active_Uplinks', 'DPG_Standby_Uplinks',
+                'DPG_Promiscuous_Mode', 'DPG_MAC_Address_Changes', 'DPG_Forged_Transmits', 'DPG_Load_Balancing', 'vNIC_dVS', 'dVS_LLDP', 'MOID', 'Host_Name', 'VM_NUMA', 'timestamp']
+
+HOST_COLUMNS = ['Host_Name', 'MOID', 'Cluster_Name', 'Provisioned_vCPUs', 'Provisioned_RAM', 'Datastore_Provisioned_GB', 'RealTime_vCPUs',
+                'RealTime_Occupation_Perc', 'Total_CPU_Occupation_Perc', 'Total_RAM_Occupation_Perc', 'Max_RealTime_Occupation_Perc',
+                'Max_OverProv_Ratio_Perc', 'Socket0_Pinned_vCPUs', 'Socket0_CPU_Occupation_Perc', 'Socket1_Pinned_vCPUs', 'Socket1_CPU_Occupation_Perc',
+                'Socket0_Pinned_vMEM', 'Socket0_RAM_Occupation_Perc', 'Socket1_Pinned_vMEM', 'Socket1_RAM_Occupation_Perc',
+                'SRIOV_VMs', 'SRIOV_VFs_Provisioned', 'PCIPT_VMs', 'PCIPT_Devices_Provisioned', 'Datastore_Name', 'Datastore_Capacity_GB',
+                'Datastore_Free_GB', 'Datastore_ProvisionedSwap_GB', 'Datastore_MixedSpace_GB', 'ESXi_Version',
+                'ESXi_Build', 'BIOS_Version', 'CPLD_Version', 'iDRAC_Version', 'VIB_ISM_Version', 'ESXi_Rsv_Cores', 'ESXi_Rsv_RAM_GB', 'Model', 'timestamp']
+
+PNIC_COLUMNS = ['Host_Name', 'MOID', 'vmnic_Name', 'vmnic_Model', 'vmnic_Driver', 'vmnic_Driver_version', 'vmnic_Firmware_version', 'vmnic_MAC',
+                'vmnic_Device', 'vmnic_Type', 'vmnic_Link_Status', 'vmnic_Configured_Speed_Mbps', 'vmnic_NUMA', 'vmnic_virtualSwitch', 'vmnic_configured_VFs', 'Host_calculated_VF_Vector',
+                'Host_current_VF_Vector', 'Host_calculated_Trusted_Vector', 'Host_current_Trusted_Vector', 'iDRAC_NIC_Slot', 'iDRAC_EthernetPort_Slot',
+                'physical_Switch_name', 'physical_Switch_port', 'physical_Switch_port_VLANs', 'vmnic_max_VFs', 'Model', 'Cluster_Name','timestamp']
+
+CLUSTER_COLUMNS = ['Cluster_Name']
+
+DATACENTER_COLUMNS = ['Datacenter_Name']
+
+TABLES = {'vm': VM_COLUMNS, 'vnic': VNIC_COLUMNS, 'host': HOST_COLUMNS, 'pnic': PNIC_COLUMNS, 'cluster': CLUSTER_COLUMNS, 'datacenter': DATACENTER_COLUMNS}
+
+# Column dtypes of the output tables. Cells mix numbers, lists and '' placeholders, so every column is kept as object
+DTYPES = {table: dict.fromkeys(columns, 'object') for table, columns in TABLES.items()}
+
+# Memory-efficient dtypes of the merged tables (compactFrame). A column is only converted if all its values fit the dtype, so that expandFrame
+# restores them exactly: 'Int64' for counts and GB figures, 'boolean' for 'True'/'False' strings, 'category' for low-cardinality strings
+COMPACT_DTYPES = {
+    'vm': {'Host_Name': 'category', 'Cluster_Name': 'category', 'Datastore_Name': 'category', 'VM_LatencySensitivity': 'category', 'VM_PowerState': 'category',
+            'VM_RealTime': 'category', 'VM_ResourcePool': 'category', 'VM_NUMA': 'category', 'Restoration_Allowed': 'category', 'Snapshot_Allowed': 'category',
+            'VirtualHardware_Version': 'category', 'Host_MOID': 'category', 'VM_Snapshot': 'boolean', 'VM_AR_Rule_Compliant': 'boolean',
+            'VM_vCPU': 'Int64', 'VM_CoresPerSocket': 'Int64', 'VM_Provisioned_vHDDs': 'Int64', 'VM_Provisioned_Storage_GB': 'Int64', 'VM_Space_In_Disk_GB': 'Int64',
+            'Datastore_Capacity_GB': 'Int64', 'Datastore_Free_GB': 'Int64', 'SRIOV_vNICs': 'Int64', 'VMXNET3_vNICs': 'Int64', 'PCIPT_vNICs': 'Int64',
+            'CPU_Reservation_MHz': 'Int64', 'Host_CPU_Package_MHz': 'Int64'},
+    'vnic': {'VM_Name': 'category', 'MOID': 'category', 'Host_Name': 'category', 'VM_NUMA': 'category', 'vNIC_Type': 'category', 'vNIC_DPG': 'category',
+            'vNIC_VLANs': 'category', 'vNIC_dVS': 'category', 'dVS_LLDP': 'category', 'pNIC_inUse': 'category', 'pNIC_inUse_NUMA': 'category', 'pNIC_PCI_Device': 'category',
+            'DPG_Active_Uplinks': 'category', 'DPG_Standby_Uplinks': 'category', 'DPG_Promiscuous_Mode': 'category', 'DPG_MAC_Address_Changes': 'category',
+            'DPG_Forged_Transmits': 'category', 'DPG_Load_Balancing': 'category', 'vNIC_pciSlotNumber': 'Int64', 'vNIC_GuestOS_Mapping_Order': 'Int64'},
+    'host': {'Cluster_Name': 'category', 'Datastore_Name': 'category', 'ESXi_Version': 'category', 'ESXi_Build': 'category', 'BIOS_Version': 'category',
+            'CPLD_Version': 'category', 'iDRAC_Version': 'category', 'VIB_ISM_Version': 'category', 'Model': 'category',
+            'Provisioned_vCPUs': 'Int64', 'RealTime_vCPUs': 'Int64', 'Socket0_Pinned_vCPUs': 'Int64', 'Socket1_Pinned_vCPUs': 'Int64', 'SRIOV_VMs': 'Int64',
+            'SRIOV_VFs_Provisioned': 'Int64', 'PCIPT_VMs': 'Int64', 'PCIPT_Devices_Provisioned': 'Int64', 'Datastore_Capacity_GB': 'Int64', 'Datastore_Free_GB': 'Int64',
+            'ESXi_Rsv_Cores': 'Int64'},
+    'pnic': {'Host_Name': 'category', 'MOID': 'category', 'vmnic_Model': 'category', 'vmnic_Driver': 'category', 'vmnic_Driver_version': 'category',
+            'vmnic_Firmware_version': 'category', 'vmnic_Type': 'category', 'vmnic_Link_Status': 'category', 'vmnic_NUMA': 'category', 'vmnic_virtualSwitch': 'category',
+            'physical_Switch_name': 'category', 'Model': 'category', 'Cluster_Name': 'category', 'vmnic_configured_VFs': 'Int64', 'vmnic_max_VFs': 'Int64'},
+    'cluster': {},
+    'datacenter': {},
+}
+
+COLUMN_SETS = {table: frozenset(columns) for table, columns in TABLES.items()}
+
+class Record:
+    'Row of an output table. Schema columns are kept in slots, so that rows carry no per-instance dictionary'
+
+    __slots__ = ('extra',)
+    table = None
+    empty = np.nan  # Value of the columns not set, once converted to a dataframe
+
+    def __init__(self, **values):
+        self.extra = {}     # Columns outside the schema (i.e. Sockets beyond the second one)
+        for column, value in values.items():
+            self[column] = value
+
+    def __setitem__(self, column, value):
+        if column in COLUMN_SETS[self.table]:
+            setattr(self, column, value)
+        else:
+            self.extra[column] = value
+
+    def __getitem__(self, column):
+        if column in COLUMN_SETS[self.table]:
+            return getattr(self, column, self.empty)
+
+        return self.extra.get(column, self.empty)
+
+class VMRecord(Record):
+    'Row of the VM table'
+
+    __slots__ = tuple(VM_COLUMNS)
+    table = 'vm'
+
+class VNICRecord(Record):
+    'Row of the vNIC table'
+
+    __slots__ = tuple(VNIC_COLUMNS) + ('backing',)   # backing: dVS (portgroupKey, portKey) of the vNIC, cached with the row but not a column
+    table = 'vnic'
+    empty = ''      # vNIC counters not retrieved from the ESXi are left blank
+
+class HostRecord(Record):
+    'Row of the Host table'
+
+    __slots__ = tuple(HOST_COLUMNS)
+    table = 'host'
+
+class PNICRecord(Record):
+    'Row of the pNIC table'
+
+    __slots__ = tuple(PNIC_COLUMNS)
+    table = 'pnic'
+
+def columnOrder(table, columns):
+    """Return the columns of a table in schema order, followed by any other column in the given order."""
+
+    return TABLES[table] + [column for column in columns if column not in TABLES[table]]
+
+def buildFrame(table, records):
+    """Return a table built in a single step from a list of row records ({column: value}).
+
+    Parameters
+    ----------
+    table : string
+        'vm', 'vnic', 'host', 'pnic', 'cluster' or 'datacenter'
+    records : list
+        One dictionary per row. Missing columns are left empty (NaN)
+
+    Returns
+    -------
+    df
+        Dataframe with the schema columns and dtypes of the table
+    """
+
+    extra = {}  # Used as an ordered set
+    for record in records:
+        extra.update(dict.fromkeys(record))
+    df = pd.DataFrame.from_records(records, columns=columnOrder(table, extra))
+
+    return df.astype(DTYPES[table])
+
+def recordsToFrame(table, records):
+    """Return a table built column by column from a list of row records (Record subclass of the table)."""
+
+    extra = {}  # Used as an ordered set
+    for record in records:
+        extra.update(dict.fromkeys(record.extra))
+    data = {column: [record[column] for record in records] for column in columnOrder(table, extra)}
+
+    return pd.DataFrame(data, dtype=object).astype(DTYPES[table])   # No per-column type inference. Values are kept as retrieved
+
+def fitsDtype(values, dtype):
+    """Return whether all non-empty values of a column can be stored with a compact dtype and restored unchanged."""
+
+    values = values[values.notna()]
+    if dtype == 'Int64':
+        return all(isinstance(value, (int, np.integer)) and not isinstance(value, bool) for value in values)
+    if dtype == 'boolean':
+        return all(isinstance(value, str) and value in ('True', 'False') for value in values)
+
+    return all(isinstance(value, str) for value in values)
+
+def compactFrame(table, df):
+    """Return a table with its columns converted to the memory-efficient dtypes of COMPACT_DTYPES, where the values fit them."""
+
+    dtypes = {}
+    for column, dtype in COMPACT_DTYPES[table].items():
+        if column in df.columns and df[column].dtype == object and fitsDtype(df[column], dtype):
+            dtypes[column] = dtype
+    df = df.copy()
+    for column, dtype in dtypes.items():
+        if dtype == 'boolean':
+            df[column] = df[column].map({'True': True, 'False': False}).astype('boolean')
+        else:
+            df[column] = df[column].astype(dtype)
+
+    return df
+
+def expandFrame(table, df):
+    """Return a table with its compact columns converted back to object values as retrieved (i.e. 'True'/'False' strings), as expected by HostData and the output writers."""
+
+    compact = [column for column in df.columns if isinstance(df[column].dtype, (pd.CategoricalDtype, pd.Int64Dtype, pd.BooleanDtype))]
+    if not compact:
+        return df
+    df = df.copy()
+    for column in compact:
+        if isinstance(df[column].dtype, pd.BooleanDtype):
+            df[column] = df[column].astype(object).map({True: 'True', False: 'False'})
+        else:
+            values = df[column].astype(object)
+            df[column] = values.where(values.notna(), np.nan)   # pd.NA of Int64 columns back to NaN
+
+    return df
+
+def concatFrames(table, frames):
+    """Return a table built with a single concat from a list of partial tables (i.e. one per Host or Cluster), in list order."""
+
+    frames = [expandFrame(table, df) for df in frames if not df.empty]  # Compact and object columns do not merge
+    if not frames:
+        return buildFrame(table, [])
+    df = pd.concat(frames, ignore_index=True, sort=False)
+    df = df.reindex(columns=columnOrder(table, df.columns))
+
+    return df.astype({column: dtype for column, dtype in DTYPES[table].items() if column in df.columns})
@@ -1,13 +1,45 @@
 from math import ceil # Used to find the nearest integer that is greater than or equal to a given number
 import re
+import numpy as np
+import pandas as pd
+from pyVmomi import vim
 from datetime import datetime, timezone
+from Schema import VMRecord, VNICRecord
+from RuleIndex import RuleIndex, AFFINITY_RULE, ANTIAFFINITY_RULE
+from PortgroupCatalogue import portgroupEntry, EMPTY_PORTGROUP
 
 class VMdata:
     'Retrieve VM configuration data'
 
 
-    def __init__(self, vm_obj):
+    def __init__(self, vm_obj, prefetched=None, run_indexes=None):
         self.vm_obj = vm_obj
+        self.prefetched = prefetched    # {moid: {property path: value}} retrieved in bulk by InventoryCollector (optional)
+        self.run_indexes = run_indexes  # RunIndexes shared by the VMs of a run (optional). Indexes are built per VM if not given
+
+    def get_property(self, path):
+        """Return a property of the VM, from the prefetched properties if available."""
+
+        return self.get_object_property(self.vm_obj, path)
+
+    def get_object_property(self, obj, path):
+        """Return a property of a managed object related to the VM (host, cluster, datastore...), from the prefetched properties if available."""
+
+        if self.prefetched is not None:
+            props = self.prefetched.get(obj._moId)
+            if props is not None and path in props:
+                return props[path]
+
+        value = obj    # Not prefetched. Walk the pyvmomi attributes (one vCenter round-trip per managed object)
+        for attribute in path.split('.'):
+            value = getattr(value, attribute)
+
+        return value
+
+    def vmName_calculator(self):
+        """Return the name of the VM."""
+
+        return self.get_property('name')
 
     def vmMOID_calculator(self):
         """Return the MOID of the Host."""
@@ -26,7 +58,7 @@ class VMdata:
 
         #snap_re = re.compile('-[0-9]{6}')
         actual_size = 0
-        for file in self.vm_obj.layoutEx.file:
+        for file in self.get_property('layoutEx.file'):
             if ('snapshot' not in file.name.lower()) and ('delta' not in file.name.lower() and not re.search('-[0-9]{6}',file.name.lower())): # Excluding snapshot files from actual disk usage to get an accurate VM storage consumption
                 actual_size += file.size  
 
@@ -35,7 +67,7 @@ class VMdata:
     def snapshot_calculator(self):
         """Return "True" if the VM has an snapshot, or "False" if not."""
 
-        if not self.vm_obj.snapshot:
+        if not self.get_property('snapshot'):
             snapshot = 'False'
         else:
             snapshot = 'True'
@@ -45,13 +77,13 @@ class VMdata:
     def UUID_calculator(self):
         """Return the UUID of a given VM."""
 
-        return self.vm_obj.config.uuid
+        return self.get_property('config.uuid')
 
     def hddCapacity_calculator(self):
         """Return aggregated provisioned capacity (GB) for a given VM."""
 
         vm_total_provisioned_storage = 0
-        for device in self.vm_obj.config.hardware.device:
+        for device in self.get_property('config.hardware.device'):
             if "hard disk" in device.deviceInfo.label.lower():
                 vm_total_provisioned_storage += device.capacityInKB
 
@@ -62,7 +94,7 @@ class VMdata:
         """Return the number of vHDDs in a given VM."""
 
         num_disks = 0
-        for device in self.vm_obj.config.hardware.device:
+        for device in self.get_property('config.hardware.device'):
             if "hard disk" in device.deviceInfo.label.lower():
                 num_disks += 1
 
@@ -71,16 +103,16 @@ class VMdata:
     def hostname_calculator(self):
         """Return the name of the host in which VM runs."""
 
-        host_name = self.vm_obj.summary.runtime.host.name
+        host_name = self.get_object_property(self.get_property('runtime.host'), 'name')
 
         return host_name.split('.')[0]
 
     def dsFree_calculator(self):
         """Return the free capacity (GB) of the datastore in which VM vHDDs are stored."""
 
-        for device in self.vm_obj.config.hardware.device: 
+        for device in self.get_property('config.hardware.device'): 
             if "hard disk" in device.deviceInfo.label.lower():
-                datastore_free = round(device.backing.datastore.summary.freeSpace/(1024**3))
+                datastore_free = round(self.get_object_property(device.backing.datastore, 'summary.freeSpace')/(1024**3))
                 break
 
         return datastore_free
@@ -88,9 +120,9 @@ class VMdata:
     def dsCapacity_calculator(self):
         """Return total capacity (GB) of the datastore in which VM vHDDs are stored."""
 
-        for device in self.vm_obj.config.hardware.device:
+        for device in self.get_property('config.hardware.device'):
             if "hard disk" in device.deviceInfo.label.lower():
-                datastore_capacity = round(device.backing.datastore.summary.capacity/(1024**3))
+                datastore_capacity = round(self.get_object_property(device.backing.datastore, 'summary.capacity')/(1024**3))
                 break
 
         return datastore_capacity
@@ -98,44 +130,65 @@ class VMdata:
     def dsName_calculator(self):
         """Return the datastore in which VM vHDDs are stored."""
 
-        for device in self.vm_obj.config.hardware.device:    # Sum up all vHDDs of the VM in the corresponding local or external datastore
+        for device in self.get_property('config.hardware.device'):    # Sum up all vHDDs of the VM in the corresponding local or external datastore
             if "hard disk" in device.deviceInfo.label.lower():
-                datastore_name = device.backing.datastore.name  # The premise is that all VM vHDDs will be provisioned in the same datastore
+                datastore_name = self.get_object_property(device.backing.datastore, 'name')  # The premise is that all VM vHDDs will be provisioned in the same datastore
 
         return datastore_name
 
+    def dsMOID_calculator(self):
+        """Return the MOID of the datastore in which VM vHDDs are stored ('' if the VM has no vHDDs)."""
+
+        for device in self.get_property('config.hardware.device'):
+            if "hard disk" in device.deviceInfo.label.lower():
+                return device.backing.datastore._moId
+
+        return ''
+
+    def dsSpaceFromMOID_calculator(self, datastore_moid):
+        """Return total and free capacity (GB) of a given datastore, without going through the VM device list."""
+
+        datastore_obj = vim.Datastore(datastore_moid, self.vm_obj._stub)
+
+        return round(self.get_object_property(datastore_obj, 'summary.capacity')/(1024**3)), round(self.get_object_property(datastore_obj, 'summary.freeSpace')/(1024**3))
+
     def swap_calculator(self):
         """Return swap file size of a given VM."""
 
-        swap_file_size_GB = (self.vm_obj.config.hardware.memoryMB - self.vm_obj.config.memoryAllocation.reservation)/1024
+        swap_file_size_GB = (self.get_property('config.hardware.memoryMB') - self.get_property('config.memoryAllocation.reservation'))/1024
 
         return round(swap_file_size_GB)
 
     def powerState_calculator(self):
         """Return the power state of the VM."""
 
-        return self.vm_obj.runtime.powerState
+        return self.get_property('runtime.powerState')
 
     def clusterName_calculator(self):
         """Return VM cluster name."""
 
-        return self.vm_obj.runtime.host.parent.name
+        return self.get_object_property(self.get_object_property(self.get_property('runtime.host'), 'parent'), 'name')
+
+    def runIndex_calculator(self, kind, moid, build):
+        """Return an index shared by the VMs of a run (see RunIndexes.get), or build it for this VM only if there are no run indexes."""
+
+        if self.run_indexes is None:
+            return build()
+
+        return self.run_indexes.get(kind, moid, build)
+
+    def ruleIndex_calculator(self):
+        """Return the rule index of the VM cluster."""
+
+        cluster_obj = self.get_object_property(self.get_property('runtime.host'), 'parent')
+
+        return self.runIndex_calculator('rules', cluster_obj._moId, lambda: RuleIndex(self.get_object_property(cluster_obj, 'configurationEx').rule, self.get_object_property))
 
     def antiAffinityRule_calculator(self):
         """Return Anti Affinity VMs for a given VM."""
    
-        antiAffinity_list = []
         try:
-            for rule in self.vm_obj.runtime.host.parent.configurationEx.rule:
-                if rule.__class__.__name__ == "vim.cluster.AntiAffinityRuleSpec":
-                    antiAffinity_list_temp = []
-                    for vm in rule.vm:
-                        antiAffinity_list_temp.append(vm.name)
-                    if self.vm_obj.name in antiAffinity_list_temp:
-                        antiAffinity_list_temp.remove(self.vm_obj.name) # Add every VM except myself
-                        antiAffinity_list = antiAffinity_list_temp
-
-                    #affinity_list = [vm.name for vm in rule.vm if vm.name != self.vm_obj.name] # Add every VM except itself
+            antiAffinity_list = self.ruleIndex_calculator().ruleMembers(self.vm_obj._moId, ANTIAFFINITY_RULE)
         except:
             antiAffinity_list = []
 
@@ -145,16 +198,8 @@ class VMdata:
     def affinityRule_calculator(self):
         """Return Affinity VMs for a given VM."""
    
-        affinity_list = []
         try:
-            for rule in self.vm_obj.runtime.host.parent.configurationEx.rule:
-                if rule.__class__.__name__ == "vim.cluster.AffinityRuleSpec":
-                    affinity_list_temp = []
-                    for vm in rule.vm:
-                        affinity_list_temp.append(vm.name)
-                    if self.vm_obj.name in affinity_list_temp:
-                        affinity_list_temp.remove(self.vm_obj.name) # Add every VM except myself
-                        affinity_list = affinity_list_temp
+            affinity_list = self.ruleIndex_calculator().ruleMembers(self.vm_obj._moId, AFFINITY_RULE)
         except:
             affinity_list = []
 
@@ -165,23 +210,7 @@ class VMdata:
    
         rule_observed = "True"
         try:
-            for rule in self.vm_obj.runtime.host.parent.configurationEx.rule:
-                rule_observed = "True"
-                rule_temp_dict = {}
-                for vm in rule.vm:
-                    rule_temp_dict[vm.name] = vm.runtime.host.name
- 
-                if self.vm_obj.name in rule_temp_dict.keys():
-                    del rule_temp_dict[self.vm_obj.name]    # Add every VM except myself to the dictionary
-                    if rule.__class__.__name__ == "vim.cluster.AffinityRuleSpec":
-                        for key in rule_temp_dict:
-                            if rule_temp_dict[key] != self.vm_obj.runtime.host.name: # If any VM in the Affinity rule is in a different host as this one...
-                                rule_observed = "False"
-                    elif rule.__class__.__name__ == "vim.cluster.AntiAffinityRuleSpec":
-                        for key in rule_temp_dict:
-                            if rule_temp_dict[key] == self.vm_obj.runtime.host.name: # If any VM in the antiAffinity rule is in the same host as this one...
-                                rule_observed = "False"
-
+            rule_observed = self.ruleIndex_calculator().ruleCompliant(self.vm_obj._moId)
         except:
             pass
 
@@ -192,7 +221,7 @@ class VMdata:
         """Return "YES" if VM is Realtime (GOLD ResourcePool). Else return "NO"."""
 
         try:
-            resourcePool = self.vm_obj.resourcePool.name
+            resourcePool = self.get_object_property(self.get_property('resourcePool'), 'name')
             if "GOLD" in resourcePool:
                 realtime = "YES"
                 realtime = "YES"
@@ -207,13 +236,13 @@ class VMdata:
     def latency_calculator(self):
         """Return Latency Sensitivity setting for a given VM."""
 
-        return self.vm_obj.config.latencySensitivity.level
+        return self.get_property('config.latencySensitivity').level
 
     def numaNode_calculator(self):
         """Return Latency Sensitivity setting for a given VM."""
 
         numa = ""
-        for opts in self.vm_obj.config.extraConfig:
+        for opts in self.get_property('config.extraConfig'):
             if opts.key == 'numa.nodeAffinity':
                 numa = (opts.value)
 
@@ -222,29 +251,29 @@ class VMdata:
     def corePerSocket_calculator(self):
         """Return corePerSocket setting for a given VM."""
 
-        return self.vm_obj.config.hardware.numCoresPerSocket
+        return self.get_property('config.hardware.numCoresPerSocket')
 
     def vCPU_calculator(self):
         """Return vCPU setting for a given VM."""
 
-        return self.vm_obj.config.hardware.numCPU
+        return self.get_property('config.hardware.numCPU')
 
     def vMEM_calculator(self):
         """Return vMEM setting for a given VM."""
 
-        return round(self.vm_obj.config.hardware.memoryMB/1024)
+        return round(self.get_property('config.hardware.memoryMB')/1024)
 
     def hypReservedCores_calculator(self):
         """Return Hypervisor reserved pCPUs."""
         # 10% of host compute resources are reserved by the Hypervisor
         
-        return round(self.vm_obj.runtime.host.summary.hardware.numCpuCores * 0.1)
+        return round(self.get_object_property(self.get_property('runtime.host'), 'summary.hardware.numCpuCores') * 0.1)
 
     def hypReservedMEM_calculator(self):
         """Return Hypervisor reserved MEM."""
         # 10% of host compute resources are reserved by the Hypervisor
         
-        return round(self.vm_obj.runtime.host.summary.hardware.memorySize/1024**3 * 0.1)
+        return round(self.get_object_property(self.get_property('runtime.host'), 'summary.hardware.memorySize')/1024**3 * 0.1)
 
     def serialPort_calculator(self):
         """Return Serial Port data for a given VM."""
@@ -254,7 +283,7 @@ class VMdata:
         serviceURI = ''
         direction = ''
 
-        for device in self.vm_obj.config.hardware.device:
+        for device in self.get_property('config.hardware.device'):
             if "serial port" in device.deviceInfo.label.lower():
                 try:
                     label = device.deviceInfo.label
@@ -272,12 +301,12 @@ class VMdata:
     def reservations_calculator(self):
         """Return CPU and RAM reservations for current VM."""
         
-        return self.vm_obj.summary.config.cpuReservation, round(self.vm_obj.summary.config.memoryReservation/1024)
+        return self.get_property('summary.config.cpuReservation'), round(self.get_property('summary.config.memoryReservation')/1024)
 
     def hostPackageMHz_calculator(self):
         """Return CPU Package speed in the host"""
 
-        return self.vm_obj.runtime.host.summary.hardware.cpuMhz
+        return self.get_object_property(self.get_property('runtime.host'), 'summary.hardware.cpuMhz')
 
     def sriovVirtualInterfaces_calculator(self):
         """Return the amount of SRIOV vNICs in current VM."""
@@ -285,13 +314,13 @@ class VMdata:
         pattern_sriov = re.compile(r'(pciPassthru[0-9]{1,2})\.')      # Regex pattern matching SRIOV devices
 
         sriov_set = set()
-        for option in self.vm_obj.config.extraConfig:
+        for option in self.get_property('config.extraConfig'):
             pattern_match = pattern_sriov.search(option.key)
             if pattern_match:
                 sriov_set.add(pattern_match.group(1))
         """
         sriov_vnics_count = 0
-        for device in self.vm_obj.config.hardware.device:
+        for device in self.get_property('config.hardware.device'):
             if "SR-IOV" in device.deviceInfo.label:
                 sriov_vnics_count += 1
 
@@ -301,7 +330,7 @@ class VMdata:
         """Return the amount of PCIPT vNICs in current VM."""
         
         pcipt_vnics_count = 0
-        for device in self.vm_obj.config.hardware.device:
+        for device in self.get_property('config.hardware.device'):
             if "PCI device" in device.deviceInfo.label:
                 pcipt_vnics_count += 1
 
@@ -313,7 +342,7 @@ class VMdata:
         pattern_vmxnet3 = re.compile(r'(ethernet[0-9]{1,2})\.')      # Regex pattern matching VMXNET3 devices
 
         vmxnet3_set = set()
-        for option in self.vm_obj.config.extraConfig:
+        for option in self.get_property('config.extraConfig'):
             pattern_match = pattern_vmxnet3.search(option.key)
             if pattern_match:
                 vmxnet3_set.add(pattern_match.group(1))
@@ -323,12 +352,17 @@ class VMdata:
     def virtualHardwareVersion_calculator(self):
         """Return Virtual Hardware version for current VM."""
 
-        return self.vm_obj.config.version
+        return self.get_property('config.version')
     
+    def changeVersion_calculator(self):
+        """Return the configuration change version of the VM. It changes on every VM reconfiguration."""
+
+        return self.get_property('config.changeVersion')
+
     def hostMOID_calculator(self):
         """Return the MOID of the Host in which this VM runs."""
 
-        return self.vm_obj.runtime.host._moId
+        return self.get_property('runtime.host')._moId
 
     def get_vnic_type(self, device):
         """Return vNIC info for the current VM."""
@@ -345,182 +379,274 @@ class VMdata:
 
         return vnic_type
 
-    def get_vnic_pmSessions(self, device):
-        """Return Port Mirror sessions of current vnic... is any."""
+    def mirrorIndex_calculator(self, dvs_obj):
+        """Return the Port Mirror session index of a dVS."""
 
-        vnic_portKey = device.backing.port.portKey
-        vnic_pmSession = ""
-        analysed_DVS = []  
-        for dpg in self.vm_obj.network:
-            if 'DistributedVirtualPortgroup' in str(type(dpg)): # Only works for dVS objects
-                if dpg.config.distributedVirtualSwitch.name not in analysed_DVS:
-                    for pmSession in dpg.config.distributedVirtualSwitch.config.vspanSession:
-                        if pmSession.enabled:
-                            if (vnic_portKey in pmSession.sourcePortReceived.portKey) or (vnic_portKey in pmSession.sourcePortTransmitted.portKey):
-                                vnic_pmSession = pmSession.name
-                                break
-                    analysed_DVS.append(dpg.config.distributedVirtualSwitch.name)
-
-        return vnic_pmSession
-
-    def get_dpg_name(self, portgroupKey):
-        """Return dpg name."""
-        
-        dpg_name = ""
-        for dpg in self.vm_obj.network:
-            if 'DistributedVirtualPortgroup' in str(type(dpg)):
-                if portgroupKey == dpg.key:
-                    dpg_name = dpg.name
-                    break
-        
-        return dpg_name
-
-    def get_dpg_security(self, dpg_name):
-        """Get DPG security parameters."""
-
-        promiscuous = ""
-        macChange = ""
-        forged = ""
-        for dpg in self.vm_obj.network:
-            if dpg_name == dpg.name:
-                promiscuous = dpg.config.defaultPortConfig.securityPolicy.allowPromiscuous.value
-                macChange = dpg.config.defaultPortConfig.securityPolicy.macChanges.value
-                forged = dpg.config.defaultPortConfig.securityPolicy.forgedTransmits.value
-                break
+        return self.runIndex_calculator('mirror', dvs_obj._moId, lambda: mirrorSessions_indexer(dvs_obj.config.vspanSession))
 
-        return promiscuous, macChange, forged
-
-    def get_dpg_vlans(self, vnic_dpg_name):
-        """Resturn list of vlans in a DPG."""
-
-        vlan_list = []
-        for dpg in self.vm_obj.network:
-            if vnic_dpg_name == dpg.name:
-                if "Range" in str(type(dpg.config.defaultPortConfig.vlan.vlanId)):
-                    for item in dpg.config.defaultPortConfig.vlan.vlanId:
-                        if item.start != item.end:
-                            range_string = "{}-{}".format(item.start, item.end)
-                        else:
-                            range_string = item.start
-                        vlan_list.append(range_string)
-                        #vlan_list += list(range(item.start, item.end + 1, 1))
-                elif "int" in str(type(dpg.config.defaultPortConfig.vlan.vlanId)):
-                    vlan_list.append(dpg.config.defaultPortConfig.vlan.vlanId)
+    def get_vnic_pmSessions(self, port_key, portgroup):
+        """Return Port Mirror sessions of current vnic... is any."""
 
-                break
+        if portgroup['dvs'] is None:    # Only works for dVS objects
+            return ""
 
-        return vlan_list
+        return self.mirrorIndex_calculator(portgroup['dvs']).get(port_key, "")   # Port keys are only unique within the dVS of the vNIC portgroup
 
-    def get_dpg_active_uplinks(self, vnic_dpg_name, vnic_dvs_name):
-        """Return active and standby uplinks in a DPG."""
+    def portgroup_calculator(self, portgroupKey):
+        """Return the configuration of the distributed portgroup of a vNIC (portgroupEntry), from the portgroup catalogue if available."""
 
-        active_list = []
-        standby_list = []
-        uplink_dic = {} # {"Uplink": "vmnic"}
-        for dvs in self.vm_obj.summary.runtime.host.config.network.proxySwitch:
-            if dvs.dvsName == vnic_dvs_name:
-                for uplink in dvs.uplinkPort:
-                    for item in dvs.spec.backing.pnicSpec:
-                        if uplink.key == item.uplinkPortKey:
-                            uplink_dic[uplink.value] = item.pnicDevice       
-
-        for dpg in self.vm_obj.network:
-            if vnic_dpg_name == dpg.name:
-                for uplink in dpg.config.defaultPortConfig.uplinkTeamingPolicy.uplinkPortOrder.activeUplinkPort:
-                    if uplink in uplink_dic.keys():
-                        active_list.append(uplink_dic[uplink])
-                for uplink in dpg.config.defaultPortConfig.uplinkTeamingPolicy.uplinkPortOrder.standbyUplinkPort:
-                    if uplink in uplink_dic.keys():
-                        standby_list.append(uplink_dic[uplink])
-                break
+        if self.run_indexes is not None and self.run_indexes.portgroup_catalogue is not None:
+            portgroup = self.run_indexes.portgroup_catalogue.portgroup(portgroupKey, self.get_property('network'))
+            if portgroup is not None:   # None if the catalogue could not be retrieved
+                return portgroup
 
-        return active_list, standby_list
+        for dpg in self.get_property('network'):
+            if 'DistributedVirtualPortgroup' in str(type(dpg)) and portgroupKey == dpg.key:
+                dvs_obj = dpg.config.distributedVirtualSwitch
+                return portgroupEntry(dpg.name, dpg.config.defaultPortConfig, dvs_obj, dvs_obj.name, getattr(dvs_obj.config, 'linkDiscoveryProtocolConfig', None))
 
-    def get_dvs_name(self, vnic_dpg_name):
-        """Return dvs name."""
+        return EMPTY_PORTGROUP
 
-        dvs_name = ""
-        for dpg in self.vm_obj.network:
-            if vnic_dpg_name == dpg.name:
-                dvs_name = dpg.config.distributedVirtualSwitch.name
-                break
+    def uplinkMap_calculator(self, dvs_name):
+        """Return the uplink to vmnic map of a dVS in the VM Host."""
 
-        return dvs_name
+        host_obj = self.get_property('runtime.host')
 
-    def get_dvs_lldp(self, vnic_dpg_name):
-        """Return dVS LLDP status."""
+        return self.runIndex_calculator('uplinks', host_obj._moId, lambda: uplinkMaps_calculator(host_obj.config.network.proxySwitch)).get(dvs_name, {})
 
-        lldp = "false"
-        for dpg in self.vm_obj.network:
-            if vnic_dpg_name == dpg.name:
-                if "lldp" in dpg.config.distributedVirtualSwitch.config.linkDiscoveryProtocolConfig.protocol:
-                    lldp = "True"
-                break
+    def get_dpg_active_uplinks(self, portgroup):
+        """Return active and standby uplinks in a DPG."""
 
-        return lldp
-    
-    def get_dpg_lb_policy(self, vnic_dpg_name):
-        """Return DPG Loadbalancing Policy."""
-
-        #Dictionary of possible loadbalancing models
-        dpg_lb = {'loadbalance_ip': 'Route based on IP hash', 
-            'loadbalance_srcmac': 'Route based on source MAC hash', 
-            'loadbalance_srcid': 'Route based on originating virtual port', 
-            'failover_explicit': 'Use explicit failover order', 
-            'loadbalance_loadbased': 'Route based on physical NIC load'}
-
-        policy = ""
-        for dpg in self.vm_obj.network:
-            if vnic_dpg_name == dpg.name:
-                policy = dpg_lb[dpg.config.defaultPortConfig.uplinkTeamingPolicy.policy.value]
-
-        return policy
+        uplink_dic = self.uplinkMap_calculator(portgroup['vNIC_dVS'])  # {"Uplink": "vmnic"}
+        active_list = [uplink_dic[uplink] for uplink in portgroup['active_uplinks'] if uplink in uplink_dic]
+        standby_list = [uplink_dic[uplink] for uplink in portgroup['standby_uplinks'] if uplink in uplink_dic]
+
+        return active_list, standby_list
     
-    def pcislot_order(self, df_v_network):
-        """Calculate PCI Slot order as presented to the GuestOS."""
-
-        if self.vm_obj.runtime.powerState == 'poweredOn':
-            df_v_network['temp_pci_order'] = ""
-            #df_v_network['vNIC_pciSlotNumber'] = df_v_network['vNIC_pciSlotNumber'].astype(int, errors = 'ignore')
-            for index, row in df_v_network.iterrows():
-                if df_v_network.at[index, 'vNIC_pciSlotNumber'] != '':
-                    slot = df_v_network.at[index, 'vNIC_pciSlotNumber']
-                    slot_bin = bin(slot)[2:].zfill(12) # Slot to binary and add leading zeros to get a uniform length binary number
-                    domain_bin = slot_bin[-5:]
-                    bus_bin = slot_bin[-10:-5]
-                    function_bin = slot_bin[-12:-10]
-
-                    pciBridge =  int(bus_bin, 2) - 1    # According to VMware docs is the formula to identify VM pciBridge
-                    pciBridgeSlot = ""
-                    
-                    #for opts in self.vm_obj.config.extraConfig:
-                    #    if opts.key == f'pciBridge{pciBridge}.pciSlotNumber':
-                    #        pciBridgeSlot = (opts.value)
-                    #        break
-                    
-                    #print(pciBridge)
-                    #print(pciBridgeSlot)
-
-                    # vNIC order wil be determined by their connected pciBridge (the lower the bridge number the higher in the order list) and by their function (does not apply to e1000)
-                    # To take into account both factors, we will store in float format pciBridge.function in the "pci_order" variable (ie, 4.1, 5.2...)
-                    # "pci_order" will be stored in a new column that will be used to sort the DF
-                    if row.vNIC_Type == 'e1000':
-                        #pci_order = int(pciBridgeSlot) + int(slot)*0.01 ---> Original working
-                        pci_order = int(pciBridge) + int(slot)*0.01
-                    else:
-                        #pci_order = int(pciBridgeSlot) + int(function_bin, 2)*0.1 ---> Original working
-                        pci_order = int(pciBridge) + int(function_bin, 2)*0.1
-                        
-                    df_v_network.at[index, 'temp_pci_order'] = pci_order
-            if len(df_v_network[df_v_network['vNIC_pciSlotNumber'] == ''].index) == 0:  # There are no empty cells in column "vNIC_pciSlotNumber". If there are, ordering fails
-                df_v_network = df_v_network.sort_values(by=['temp_pci_order'])
-                df_v_network = df_v_network.reset_index(drop = True)
-                df_v_network['vNIC_GuestOS_Mapping_Order'] = df_v_network.index + 1
-
-            df_v_network = df_v_network.drop(columns=['temp_pci_order'])
-            
-        else:
-            df_v_network['vNIC_GuestOS_Mapping_Order'] = 'poweredOff'
+    def vmRecord_calculator(self):
+        """Return the row of this VM in the VM table (VMRecord)."""
+
+        vm_record = VMRecord()
+        vm_record.VM_Name = self.vmName_calculator()
+        vm_record.MOID = self.vmMOID_calculator()
+        vm_record.timestamp = self.timestamp_calculator()
+        vm_record.Host_Name = self.hostname_calculator()
+        vm_record.Cluster_Name = self.clusterName_calculator()
+        vm_record.Datastore_Name = self.dsName_calculator()
+        vm_record.Datastore_Capacity_GB = self.dsCapacity_calculator()
+        vm_record.Datastore_Free_GB = self.dsFree_calculator()
+        vm_record.VM_Provisioned_vHDDs = self.hddNumber_calculator()
+        vm_record.VM_Provisioned_Storage_GB = self.hddCapacity_calculator()
+        vm_record.VM_SwapFile_Size_GB = self.swap_calculator()
+        vm_record.VM_Space_In_Disk_GB = self.actualUsage_calculator()
+        vm_record.VM_Snapshot = self.snapshot_calculator()
+        vm_record.VM_PowerState = self.powerState_calculator()
+        vm_record.VM_AntiAffinity = self.antiAffinityRule_calculator()
+        vm_record.VM_Affinity = self.affinityRule_calculator()
+        vm_record.VM_AR_Rule_Compliant = self.ruleCompliant_calculator()
+        vm_record.VM_RealTime, vm_record.VM_ResourcePool = self.realtime_calculator()
+        vm_record.VM_LatencySensitivity = self.latency_calculator()
+        vm_record.VM_CoresPerSocket = self.corePerSocket_calculator()
+        vm_record.VM_vCPU = self.vCPU_calculator()
+        vm_record.VM_vMEM_GB = self.vMEM_calculator()
+        vm_record.VM_NUMA = self.numaNode_calculator()
+        vm_record.VM_SP_Label, vm_record.VM_SP_proxyURI, vm_record.VM_SP_serviceURI, vm_record.VM_SP_direction = self.serialPort_calculator()
+        vm_record.CPU_Reservation_MHz, vm_record.RAM_Reservation_GB = self.reservations_calculator()
+        vm_record.Host_CPU_Package_MHz = self.hostPackageMHz_calculator()
+        vm_record.SRIOV_vNICs = self.sriovVirtualInterfaces_calculator()
+        vm_record.VMXNET3_vNICs = self.vmxnet3VirtualInterfaces_calculator()
+        vm_record.PCIPT_vNICs = self.pciptVirtualInterfaces_calculator()
+        vm_record.VirtualHardware_Version = self.virtualHardwareVersion_calculator()
+        vm_record.Host_MOID = self.hostMOID_calculator()
+        #vm_record.UUID = self.UUID_calculator()
+
+        return vm_record
+
+    def vnicBacking_calculator(self, device):
+        """Return the portgroup and port keys of the dVS port backing a vNIC. (portgroupKey, portKey)"""
+
+        return device.backing.port.portgroupKey, device.backing.port.portKey
+
+    def vfID_calculator(self, device):
+        """Return the ID of the SRIOV VF backing a vNIC."""
+
+        # SRIOV interfaces of powered-off VMs report no virtualFunctionBacking device
+        try:
+            return device.sriovBacking.virtualFunctionBacking.id
+        except:
+            return ''
+
+    def vnicVolatile_fields(self, nic_type, backing, vf_id=''):
+        """Return the fields of a vNIC row which change without a VM reconfiguration (portgroup and dVS configuration, Port Mirror session, uplinks, SRIOV VF).
+
+        Parameters
+        ----------
+        nic_type : str
+            get_vnic_type of the vNIC
+        backing : tuple
+            vnicBacking_calculator of the vNIC. Portgroup, dVS, mirror and uplink fields are read from the run indexes by these keys
+        vf_id : str
+            vfID_calculator of SRIOV vNICs
+
+        Returns
+        -------
+        dict
+            {vNIC column: value}
+        """
 
-        return df_v_network
+        fields = dict.fromkeys(['vNIC_DPG', 'vNIC_VLANs', 'vNIC_dVS', 'DPG_Promiscuous_Mode', 'DPG_MAC_Address_Changes', 'DPG_Forged_Transmits', 'DPG_Load_Balancing',
+                                'dVS_LLDP', 'PortMirror_Session_Source', 'DPG_Active_Uplinks', 'DPG_Standby_Uplinks', 'vNIC_SRIOV_VF_ID'], "")
+        if "PCI-PT" not in nic_type:
+            portgroup_key, port_key = backing
+            portgroup = self.portgroup_calculator(portgroup_key)
+            for column in ['vNIC_DPG', 'vNIC_dVS', 'DPG_Promiscuous_Mode', 'DPG_MAC_Address_Changes', 'DPG_Forged_Transmits', 'DPG_Load_Balancing', 'dVS_LLDP']:
+                fields[column] = portgroup[column]
+            fields['vNIC_VLANs'] = list(portgroup['vNIC_VLANs'])  # Catalogue entries are shared by every vNIC in the portgroup
+            fields['DPG_Active_Uplinks'], fields['DPG_Standby_Uplinks'] = self.get_dpg_active_uplinks(portgroup)
+            fields['PortMirror_Session_Source'] = self.get_vnic_pmSessions(port_key, portgroup)
+            if "SR-IOV" in nic_type:
+                fields['vNIC_SRIOV_VF_ID'] = vf_id
+
+        return fields
+
+    def vnicDevices_calculator(self):
+        """Return the dVS and PCI-PT vNIC devices of this VM with their type. [(device, nic_type)]"""
+
+        vnic_devices = []
+        for device in self.get_property('config.hardware.device'):
+            nic_type = self.get_vnic_type(device)
+            if (nic_type != '') and ('DistributedVirtualPortBackingInfo' in str(type(device.backing))):
+                vnic_devices.append((device, nic_type))
+
+        return vnic_devices
+
+    def vnicRecords_calculator(self):
+        """Return the rows of the dVS and PCI-PT vNICs of this VM in the vNIC table (VNICRecord list)."""
+
+        vm_name = self.vmName_calculator()
+        vnic_records = []
+        #if vm_obj.runtime.powerState == 'poweredOn':
+        for device, nic_type in self.vnicDevices_calculator():
+            vnic_name = device.deviceInfo.label
+            if device.slotInfo:
+                vnic_slotNumber = device.slotInfo.pciSlotNumber
+            else:
+                #vnic_slotNumber = np.nan
+                vnic_slotNumber = ''
+            vnic_mac = vnic_pciDevice = ""
+            if "PCI-PT" not in nic_type:
+                vnic_mac = device.macAddress
+
+                pnic_numa = ''
+                if "SR-IOV" in nic_type:
+                    vnic_pciDevice = device.sriovBacking.physicalFunctionBacking.id
+                    if int(vnic_pciDevice.split(":")[1],16) > 130:
+                        pnic_numa = '1'
+                    else:
+                        pnic_numa = '0'
+            else:
+                vnic_pciDevice = device.backing.id
+                if int(vnic_pciDevice.split(":")[1],16) > 130:
+                    pnic_numa = '1'
+                else:
+                    pnic_numa = '0'
+
+            backing = self.vnicBacking_calculator(device)
+            vf_id = self.vfID_calculator(device) if "SR-IOV" in nic_type else ''
+            vnic_record = VNICRecord(VM_Name=vm_name, MOID=self.vmMOID_calculator(), Host_Name=self.hostname_calculator(), VM_NUMA=self.numaNode_calculator(), \
+                                        vNIC_Name=vnic_name, vNIC_Type=nic_type, vNIC_MAC=vnic_mac, vNIC_pciSlotNumber=vnic_slotNumber, pNIC_PCI_Device=vnic_pciDevice, \
+                                        pNIC_inUse_NUMA=pnic_numa, vNIC_GuestOS_Mapping_Order="", timestamp=self.timestamp_calculator(), **self.vnicVolatile_fields(nic_type, backing, vf_id))
+            vnic_record.backing = backing   # Cached with the row, so that its volatile fields are refreshed without reading the devices again
+            vnic_records.append(vnic_record)
+
+        return vnic_records     # GuestOS order is calculated for all vNICs at once by vnicOrder_calculator
+
+    def vnicVolatile_calculator(self, vnic_records):
+        """Refresh the volatile fields (vnicVolatile_fields) of cached vNIC rows of this VM from the backing keys cached with them.
+
+        The device list is only read for the VF IDs of SRIOV vNICs, which no other VM property holds, and for rows cached without backing keys.
+        """
 
+        devices = {}    # {vNIC label: device}
+        if any(vnic_record.vNIC_Type == 'SR-IOV' or getattr(vnic_record, 'backing', None) is None for vnic_record in vnic_records):
+            devices = {device.deviceInfo.label: device for device, nic_type in self.vnicDevices_calculator()}
+        for vnic_record in vnic_records:
+            device = devices.get(vnic_record.vNIC_Name)
+            if getattr(vnic_record, 'backing', None) is None:
+                if device is None:
+                    continue
+                vnic_record.backing = self.vnicBacking_calculator(device)
+            vf_id = self.vfID_calculator(device) if device is not None else ''
+            for column, value in self.vnicVolatile_fields(vnic_record.vNIC_Type, vnic_record.backing, vf_id).items():
+                vnic_record[column] = value
+
+        return vnic_records
+
+def uplinkMaps_calculator(proxy_switches):
+    """Return the uplink to vmnic map of every dVS proxy switch of a Host. {dVS name: {"Uplink": "vmnic"}}"""
+
+    uplink_maps = {}
+    for dvs in proxy_switches:
+        pnics = {item.uplinkPortKey: item.pnicDevice for item in dvs.spec.backing.pnicSpec or []}    # {uplink port key: vmnic}
+        uplink_maps[dvs.dvsName] = {uplink.value: pnics[uplink.key] for uplink in dvs.uplinkPort or [] if uplink.key in pnics}
+
+    return uplink_maps
+
+def mirrorSessions_indexer(vspan_sessions):
+    """Return the enabled Port Mirror sessions of a dVS indexed by source port key (inbound|outbound|both). {portKey: session name}"""
+
+    mirror_index = {}
+    for pmSession in vspan_sessions:
+        if pmSession.enabled:
+            for source_ports in (pmSession.sourcePortReceived, pmSession.sourcePortTransmitted):
+                if source_ports is not None and source_ports.portKey:
+                    for portKey in source_ports.portKey:
+                        mirror_index.setdefault(portKey, pmSession.name)    # The first session of the dVS is kept if a port is source of many
+
+    return mirror_index
+
+def vnicOrder_calculator(df_vms_network, df_vms):
+    """Calculate PCI Slot order as presented to the GuestOS, for the vNICs of all VMs at once.
+
+    Parameters
+    ----------
+    df_vms_network
+        Dataframe with networking data from each vNIC. One vNIC per row, vNICs of the same VM in consecutive rows
+    df_vms
+        Dataframe with data from the VMs of those vNICs (VM_PowerState)
+
+    Returns
+    -------
+    df_v_network
+        df_vms_network with the vNICs of each poweredOn VM sorted and numbered (vNIC_GuestOS_Mapping_Order) in GuestOS order
+    """
+
+    if df_vms_network.empty:
+        return df_vms_network
+
+    vm_ids, vm_moids = pd.factorize(df_vms_network['MOID'].astype(object))   # VM of each vNIC, numbered in order of appearance
+    power_state = df_vms_network['MOID'].astype(object).map(df_vms.drop_duplicates('MOID').set_index('MOID')['VM_PowerState'].astype(object))
+    powered_on = (power_state == 'poweredOn').to_numpy()
+    slot = pd.to_numeric(df_vms_network['vNIC_pciSlotNumber'], errors='coerce').to_numpy()
+    slotted = ~np.isnan(slot)
+    slot = np.where(slotted, slot, 0).astype(np.int64)
+
+    # The PCI slot number packs the bridge bus (bits 5-9) and the function (bits 10-11). According to VMware docs the VM pciBridge is bus - 1
+    # vNIC order will be determined by their connected pciBridge (the lower the bridge number the higher in the order list) and by their function (does not apply to e1000)
+    pciBridge = ((slot >> 5) & 0x1F) - 1
+    function = (slot >> 10) & 0x3
+    pci_order = np.where((df_vms_network['vNIC_Type'] == 'e1000').to_numpy(), pciBridge + slot*0.01, pciBridge + function*0.1)
+
+    # Only VMs with a slot number in every vNIC can be ordered. The vNICs of the rest keep their rows
+    ordered = powered_on & (np.bincount(vm_ids, weights=~slotted, minlength=len(vm_moids)) == 0)[vm_ids]
+    rows = np.lexsort((np.where(ordered, pci_order, np.arange(len(slot))), vm_ids))    # One sort, grouped by VM
+    df_v_network = df_vms_network.iloc[rows].reset_index(drop=True)
+    ordered = ordered[rows]
+    position = df_v_network.groupby(vm_ids[rows]).cumcount().to_numpy() + 1
+
+    mapping_order = np.full(len(df_v_network), '', dtype=object)
+    mapping_order[ordered] = position[ordered]
+    mapping_order[~powered_on[rows]] = 'poweredOff'
+    df_v_network['vNIC_GuestOS_Mapping_Order'] = mapping_order
+
+    return df_v_network
@@ -0,0 +1,162 @@
+import io, re, subprocess
+from EsxiCommands import EsxiCommandBatch, parseVmList, parsePortList, parseVmkchdev, parseLspci
+
+class ShellClient:
+    'Stand-in for a connected paramiko SSHClient, running the commands in the local shell (the ESXi shell is also a POSIX sh)'
+
+    def __init__(self, cut=False):
+        self.cut = cut      # Drop the output after the last marker, as if the channel closed before the script ended
+        self.scripts = []
+
+    def exec_command(self, command):
+        self.scripts.append(command)
+        output = subprocess.run(['sh', '-c', command], capture_output=True).stdout
+        if self.cut:
+            output = output[:output.rfind(b'ETL_NFVI_')]
+
+        return io.BytesIO(), io.BytesIO(output), io.BytesIO()
+
+def baseline_output(command):
+    """Return the output of a command as connect_to_esxi read it before batching: one exec_command per command."""
+
+    return ShellClient().exec_command(command)[1].read().decode('ascii').strip("\n")
+
+COMMANDS = {'vmkchdev': "printf '0000:3b:00.0 8086:1572 1028:1f9c vmkernel vmnic4\\n0000:3b:00.1 8086:1572 1028:1f9c vmkernel vmnic5\\n'",
+            'empty': 'true',
+            ('nic', 3): "printf '   Driver Info:\\n      Version: 2.1.5.0\\n\\n\\n'",
+            'last': 'echo done'}
+
+def test_batch_matches_one_command_per_channel():
+    client = ShellClient()
+    outputs = EsxiCommandBatch(client).run(COMMANDS)
+
+    assert outputs == {key: baseline_output(command) for key, command in COMMANDS.items()}
+    assert len(client.scripts) == 1
+
+def test_batch_without_commands_opens_no_channel():
+    client = ShellClient()
+    batch = EsxiCommandBatch(client)
+
+    assert batch.run({}) == {}
+    assert client.scripts == []
+    assert batch.complete
+
+def test_batch_cut_short_is_incomplete():
+    batch = EsxiCommandBatch(ShellClient(cut=True))
+    outputs = batch.run(COMMANDS)
+
+    assert outputs['vmkchdev'] == baseline_output(COMMANDS['vmkchdev'])
+    assert outputs['last'] == ''
+    assert not batch.complete
+
+# 'esxcli network vm list' of a host with a VM name containing spaces and a VM name prefix of another one
+VM_LIST = """World ID  Name                  Num Ports  Networks
+--------  --------------------  ---------  --------------------------------
+   66270  vnf-1                         2  dvportgroup-101, dvportgroup-102
+   66311  vnf-10                        1  dvportgroup-101
+ 2101467  lab vm (clone)                1  VM Network
+"""
+
+# 'esxcli network vm port list -w <world>' with a teamed port, a port teamed to every uplink and an IP-less port
+PORT_LIST = """   Port ID: 67108890
+   vSwitch: DvsPortset-0
+   Portgroup: dvportgroup-101
+   DVPort ID: 12
+   MAC Address: 00:50:56:9a:01:01
+   IP Address: 0.0.0.0
+   Team Uplink: vmnic4
+   Uplink Port ID: 2214592520
+   Active Filters:
+
+   Port ID: 67108891
+   vSwitch: DvsPortset-0
+   Portgroup: dvportgroup-102
+   DVPort ID: 13
+   MAC Address: 00:50:56:9a:01:02
+   IP Address: 10.0.0.5
+   Team Uplink: all(2)
+   Uplink Port ID: 0
+   Active Filters:
+
+   Port ID: 67108892
+   vSwitch: DvsPortset-0
+   Portgroup: dvportgroup-103
+   DVPort ID: 14
+   MAC Address: 00:50:56:9a:01:03
+   IP Address:
+   Team Uplink: vmnic5
+   Uplink Port ID: 2214592522
+   Active Filters:
+"""
+
+def baseline_vm_world(output, vm):
+    """Return the world ID of a VM as read before parseVmList: esxcli network vm list | grep {vm} | awk '{print $1}'."""
+
+    return '\n'.join(line.split()[0] for line in output.splitlines() if vm in line)
+
+def baseline_team_uplink(output, mac):
+    """Return (port ID, team uplink) of a vNIC as matched before parsePortList, or None."""
+
+    pattern_teamUplink = re.compile(rf' *Port ID: ([0-9]*)\n *vSwitch: [a-zA-Z0-9_-]*\n *Portgroup: [a-zA-Z0-9_-]*\n *DVPort ID: [0-9]*\n *MAC Address: ({mac})\n *IP Address: [0-9.]*\n *Team Uplink: (vmnic[0-9]*)')
+    m = pattern_teamUplink.search(output.strip("\n"))
+
+    return (m.group(1), m.group(3)) if m else None
+
+def test_parseVmList_matches_grep_for_unique_names():
+    assert parseVmList(VM_LIST)['vnf-10'] == baseline_vm_world(VM_LIST, 'vnf-10') == '66311'
+
+def test_parseVmList_slices_names_by_column():
+    assert parseVmList(VM_LIST) == {'vnf-1': '66270', 'vnf-10': '66311', 'lab vm (clone)': '2101467'}
+    assert baseline_vm_world(VM_LIST, 'vnf-1') == '66270\n66311'    # grep also matched vnf-10
+
+def test_parseVmList_without_header():
+    assert parseVmList('') == {}
+
+def test_parsePortList_matches_baseline_regex():
+    ports = parsePortList(PORT_LIST)
+
+    assert ports == {'00:50:56:9a:01:01': ('67108890', 'vmnic4'), '00:50:56:9a:01:03': ('67108892', 'vmnic5')}
+    for mac in ['00:50:56:9a:01:01', '00:50:56:9a:01:02']:
+        assert ports.get(mac) == baseline_team_uplink(PORT_LIST, mac)
+    assert baseline_team_uplink(PORT_LIST, '00:50:56:9a:01:03') is None     # The baseline regex missed ports without an IP address
+
+# 'vmkchdev -l | grep vmnic' and 'lspci | grep vmnic' of a host with SRIOV, passthrough and Mellanox pNICs
+VMKCHDEV = """0000:3b:00.0 8086:1572 1028:1f9c vmkernel vmnic4
+0000:3b:00.1 8086:1572 1028:1f9c vmkernel vmnic5
+0000:3b:02.0 8086:1889 1028:0000 passthru vmnic4
+0000:5e:00.0 8086:158b 8086:0001 passthru vmnic6
+0000:af:00.0 15b3:1017 15b3:0020 vmkernel vmnic10"""
+
+LSPCI = """0000:3b:00.0 Network controller: Intel(R) Ethernet Controller X710 for 10GbE SFP+ [vmnic4]
+0000:3b:00.1 Network controller: Intel(R) Ethernet Controller X710 for 10GbE SFP+ [vmnic5]
+0000:5e:00.0 Network controller: Intel(R) Ethernet Controller XXV710 for 25GbE SFP28 [vmnic6]
+0000:af:00.0 Network controller: Mellanox Technologies MT27800 Family [ConnectX-5] [vmnic10]"""
+
+PCI_DEVICES = ['0000:3b:00.0', '0000:3b:00.1', '0000:3b:02.0', '0000:5e:00.0', '0000:af:00.0', '0000:d8:00.0']
+
+def baseline_vmkchdev(output, pci_device):
+    """Return the vmnic of a PCI device as matched before parseVmkchdev (one regex compiled per pNIC), or None."""
+
+    p = re.compile(f'({pci_device}) [0-9:]* [a-z0-9:]* (?:passthru|vmkernel) (vmnic[0-9]*)').search(output)
+
+    return p.group(2) if p else None
+
+def baseline_lspci(output, vmnic_device):
+    """Return the vmnic of a PCI device as matched before parseLspci (one regex compiled per pNIC), or None."""
+
+    m = re.compile(f'{vmnic_device} .*\\[(vmnic[0-9]*)\\]').search(output)
+
+    return m.group(1) if m else None
+
+def test_parseVmkchdev_matches_per_device_regex():
+    devices = parseVmkchdev(VMKCHDEV)
+
+    assert [devices.get(device) for device in PCI_DEVICES] == [baseline_vmkchdev(VMKCHDEV, device) for device in PCI_DEVICES]
+    assert devices['0000:3b:02.0'] == 'vmnic4'     # SRIOV VF passed through to a VM, reported with its PF vmnic
+    assert '0000:af:00.0' not in devices    # Like the baseline regex, IDs with hex letters are not matched. lspci names that vmnic
+
+def test_parseLspci_matches_per_device_regex():
+    devices = parseLspci(LSPCI)
+
+    assert [devices.get(device) for device in PCI_DEVICES] == [baseline_lspci(LSPCI, device) for device in PCI_DEVICES]
+    assert devices['0000:af:00.0'] == 'vmnic10'    # The last bracket of the line is the vmnic
@@ -0,0 +1,117 @@
+import re
+import numpy as np
+import pandas as pd
+from HostData import vectorVF_calculator, mixedSpace_calculator
+
+def baseline_vectorVF(df_h_network):
+    """HostData.vectorVF_calculator before the columnar groupby: the pNICs of one Host, row by row."""
+
+    pattern = re.compile(r'0000:(..):..\.(.)')
+    for index, row in df_h_network.iterrows():
+        m = pattern.search(row['vmnic_Device'])
+        if m:
+            bus = int(m.group(1), 16)
+            function = int(m.group(2), 16)/10
+            df_h_network.at[index, 'order'] = bus + function
+
+    df_h_network = df_h_network.sort_values('order')
+    vector = ['0' if row['vmnic_Type'] != 'SR-IOV' else row['vmnic_configured_VFs'] for index, row in df_h_network[df_h_network['vmnic_Driver'] == 'i40en'].iterrows()]
+    string_vector = ','.join((str(v) for v in vector))
+    trusted_vector = re.sub('[1-9][0-9]*', '1', string_vector)
+    df_h_network = df_h_network.drop(columns=['order'])
+    df_h_network['Host_calculated_VF_Vector'] = string_vector
+    df_h_network['Host_calculated_Trusted_Vector'] = trusted_vector
+    df_h_network = df_h_network.sort_index()
+
+    return df_h_network
+
+def pnicFrame(pnics):
+    """Return a pNIC table from a list of (Host MOID, PCI device, driver, type, configured VFs)."""
+
+    return pd.DataFrame([{'MOID': moid, 'vmnic_Device': device, 'vmnic_Driver': driver, 'vmnic_Type': nic_type, 'vmnic_configured_VFs': vfs}
+                         for moid, device, driver, nic_type, vfs in pnics], dtype=object)
+
+def assertBaselineVectors(pnics):
+    df = pnicFrame(pnics)
+    expected = pd.concat([baseline_vectorVF(df_host.copy()) for moid, df_host in df.groupby('MOID', sort=False)]).sort_index()
+    result = vectorVF_calculator(df)
+
+    for column in ['Host_calculated_VF_Vector', 'Host_calculated_Trusted_Vector']:
+        assert list(result[column]) == list(expected[column])
+
+def test_vectorVF_matches_baseline():
+    assertBaselineVectors([('host-11', '0000:af:00.1', 'i40en', 'SR-IOV', 16), ('host-11', '0000:3b:00.0', 'i40en', 'SR-IOV', 8),
+                           ('host-11', '0000:19:00.0', 'ntg3', 'Standard', ''), ('host-11', '0000:3b:00.1', 'i40en', 'PCI-PT', ''),
+                           ('host-11', '0000:af:00.0', 'i40en', 'SR-IOV', 0),
+                           ('host-12', '0000:5e:00.0', 'i40en', 'SR-IOV', 32), ('host-12', '0000:18:00.0', 'i40en', 'Standard', ''),
+                           ('host-13', '0000:19:00.0', 'ntg3', 'Standard', '')])    # No i40en pNICs. Empty vectors
+
+def test_vectorVF_random_hosts_match_baseline():
+    rng = np.random.default_rng(20)
+    pnics = []
+    for number in range(50):
+        for position in rng.choice(256 * 2, size=rng.integers(1, 9), replace=False):   # Distinct (bus, function) per Host, so that no two pNICs tie
+            nic_type = str(rng.choice(['SR-IOV', 'Standard', 'PCI-PT']))
+            pnics.append((f'host-{number}', f'0000:{position // 2:02x}:00.{position % 2}', str(rng.choice(['i40en', 'i40en', 'ntg3'])), nic_type,
+                          int(rng.integers(0, 65)) if nic_type == 'SR-IOV' else ''))
+    rng.shuffle(pnics)     # Hosts interleaved, as in the merged pNIC table
+
+    assertBaselineVectors(pnics)
+
+def test_vectorVF_empty():
+    assert vectorVF_calculator(pnicFrame([])).empty
+
+def baseline_mixedSpace(df_vms, mixedSpaceSize):
+    """HostData.snapshotAllowed_calculator and restorationAllowed_calculator before mixedSpace_calculator: the VMs of one Host, row by row."""
+
+    if not df_vms.empty:
+        if df_vms[df_vms['VM_Snapshot'] == 'True'].size > 0:
+            df_vms['Snapshot_Allowed'] = 'NO'
+        else:
+            for row in df_vms.itertuples():
+                if row.VM_Space_In_Disk_GB > mixedSpaceSize:
+                    df_vms.at[row.Index, 'Snapshot_Allowed'] = 'NO'
+                else:
+                    df_vms.at[row.Index, 'Snapshot_Allowed'] = 'YES'
+
+        current_snapshots_disk_usage = 0
+        if df_vms[df_vms['VM_Snapshot'] == 'True'].size > 0:
+            current_snapshots_disk_usage = df_vms[df_vms['VM_Snapshot'] == 'True']['VM_Space_In_Disk_GB'].sum()
+        for row in df_vms.itertuples():
+            if row.VM_Space_In_Disk_GB + current_snapshots_disk_usage > mixedSpaceSize:
+                df_vms.at[row.Index, 'Restoration_Allowed'] = 'NO'
+            else:
+                df_vms.at[row.Index, 'Restoration_Allowed'] = 'YES'
+
+    return df_vms
+
+def assertBaselineMixedSpace(vms, hosts):
+    """Compare for a list of VMs (Host MOID, disk usage, snapshot) and a dictionary of Hosts {MOID: Mixed Space}."""
+
+    df_vms = pd.DataFrame([{'VM_Name': f'vm-{number}', 'Host_MOID': moid, 'VM_Space_In_Disk_GB': usage, 'VM_Snapshot': snapshot}
+                           for number, (moid, usage, snapshot) in enumerate(vms)], dtype=object)
+    df_hosts = pd.DataFrame({'MOID': list(hosts), 'Datastore_MixedSpace_GB': list(hosts.values())}, dtype=object)
+    expected = pd.concat([baseline_mixedSpace(df_host.copy(), hosts[moid]) if moid in hosts else df_host
+                          for moid, df_host in df_vms.groupby('Host_MOID', sort=False)]).sort_index()
+    result = mixedSpace_calculator(df_vms, df_hosts)
+
+    for column in ['Snapshot_Allowed', 'Restoration_Allowed']:
+        assert list(result[column].fillna('')) == list(expected[column].fillna(''))
+
+def test_mixedSpace_matches_baseline():
+    assertBaselineMixedSpace([('host-11', 120, 'False'), ('host-11', 300, 'False'), ('host-11', 250, 'False'),  # 250 fits exactly
+                              ('host-12', 100, 'True'), ('host-12', 40, 'False'), ('host-12', 200, 'False'),   # One snapshot takes the Host snapshot slot
+                              ('host-13', 10, 'False')],    # Host not analyzed. Its VMs are left as they are
+                             {'host-11': 250, 'host-12': 150})
+
+def test_mixedSpace_random_hosts_match_baseline():
+    rng = np.random.default_rng(21)
+    hosts = {f'host-{number}': int(rng.integers(0, 600)) for number in range(30)}
+    vms = [(str(rng.choice(list(hosts))), int(rng.integers(0, 400)), 'True' if rng.random() < 0.1 else 'False') for number in range(400)]
+
+    assertBaselineMixedSpace(vms, hosts)
+
+def test_mixedSpace_without_hosts():
+    df_vms = pd.DataFrame({'Host_MOID': ['host-11'], 'VM_Space_In_Disk_GB': [10], 'VM_Snapshot': ['False']}, dtype=object)
+
+    assert mixedSpace_calculator(df_vms, pd.DataFrame()) is df_vms
@@ -0,0 +1,99 @@
+import itertools
+from pyVmomi import vim
+from RuleIndex import RuleIndex, AFFINITY_RULE, ANTIAFFINITY_RULE
+
+def vmObj(moid):
+    return vim.VirtualMachine(moid, None)
+
+class Inventory:
+    'VM names and placement, read by RuleIndex through get_object_property'
+
+    def __init__(self, placement):
+        self.placement = placement  # {VM moid: Host name}
+
+    def get_object_property(self, obj, path):
+        if path == 'runtime.host':
+            return vim.HostSystem(self.placement[obj._moId], None)
+        if isinstance(obj, vim.HostSystem):
+            return obj._moId
+
+        return obj._moId.replace('vm', 'vnf')
+
+    def name(self, moid):
+        return moid.replace('vm', 'vnf')
+
+def baseline_ruleMembers(rules, inventory, moid, rule_class):
+    """VMdata.affinityRule_calculator/antiAffinityRule_calculator before RuleIndex."""
+
+    members_list = []
+    for rule in rules:
+        if rule.__class__.__name__ == rule_class:
+            members_temp = [inventory.name(vm._moId) for vm in rule.vm]
+            if inventory.name(moid) in members_temp:
+                members_temp.remove(inventory.name(moid))
+                members_list = members_temp
+
+    return members_list
+
+def baseline_ruleCompliant(rules, inventory, moid):
+    """VMdata.ruleCompliant_calculator before RuleIndex. Only the last rule of the cluster was taken into account."""
+
+    rule_observed = "True"
+    try:
+        for rule in rules:
+            rule_observed = "True"
+            rule_temp_dict = {}
+            for vm in rule.vm:
+                rule_temp_dict[inventory.name(vm._moId)] = inventory.placement[vm._moId]
+            if inventory.name(moid) in rule_temp_dict.keys():
+                del rule_temp_dict[inventory.name(moid)]
+                if rule.__class__.__name__ == "vim.cluster.AffinityRuleSpec":
+                    for key in rule_temp_dict:
+                        if rule_temp_dict[key] != inventory.placement[moid]:
+                            rule_observed = "False"
+                elif rule.__class__.__name__ == "vim.cluster.AntiAffinityRuleSpec":
+                    for key in rule_temp_dict:
+                        if rule_temp_dict[key] == inventory.placement[moid]:
+                            rule_observed = "False"
+    except:
+        pass
+
+    return rule_observed
+
+def test_ruleMembers_match_baseline():
+    rules = [vim.cluster.AntiAffinityRuleSpec(vm=[vmObj('vm-1'), vmObj('vm-2')]), vim.cluster.AffinityRuleSpec(vm=[vmObj('vm-1'), vmObj('vm-3'), vmObj('vm-4')]),
+             vim.cluster.AntiAffinityRuleSpec(vm=[vmObj('vm-1'), vmObj('vm-5')])]    # vm-1 in two antiAffinity rules. The last one is shown
+    inventory = Inventory({'vm-1': 'hv01', 'vm-2': 'hv02', 'vm-3': 'hv01', 'vm-4': 'hv01', 'vm-5': 'hv02'})
+    index = RuleIndex(rules, inventory.get_object_property)
+
+    for moid in ['vm-1', 'vm-2', 'vm-3', 'vm-4', 'vm-5', 'vm-6']:
+        for rule_class in [AFFINITY_RULE, ANTIAFFINITY_RULE]:
+            assert index.ruleMembers(moid, rule_class) == baseline_ruleMembers(rules, inventory, moid, rule_class)
+
+def test_ruleCompliant_matches_baseline_for_every_placement():
+    vms = ['vm-1', 'vm-2', 'vm-3']
+    for rule_type in [vim.cluster.AffinityRuleSpec, vim.cluster.AntiAffinityRuleSpec]:
+        rules = [rule_type(vm=[vmObj(moid) for moid in vms])]
+        for hosts in itertools.product(['hv01', 'hv02'], repeat=len(vms)):
+            inventory = Inventory(dict(zip(vms, hosts), **{'vm-4': 'hv01'}))
+            index = RuleIndex(rules, inventory.get_object_property)
+            for moid in vms + ['vm-4']:     # vm-4 is in no rule
+                assert index.ruleCompliant(moid) == baseline_ruleCompliant(rules, inventory, moid)
+
+def test_ruleCompliant_checks_every_rule():
+    # The baseline reset its result on every rule, so a VM breaking any rule but the last one was reported compliant
+    rules = [vim.cluster.AntiAffinityRuleSpec(vm=[vmObj('vm-1'), vmObj('vm-2')]), vim.cluster.AffinityRuleSpec(vm=[vmObj('vm-3'), vmObj('vm-4')])]
+    inventory = Inventory({'vm-1': 'hv01', 'vm-2': 'hv01', 'vm-3': 'hv01', 'vm-4': 'hv01'})
+    index = RuleIndex(rules, inventory.get_object_property)
+
+    assert baseline_ruleCompliant(rules, inventory, 'vm-1') == "True"
+    assert index.ruleCompliant('vm-1') == index.ruleCompliant('vm-2') == "False"
+    assert index.ruleCompliant('vm-3') == "True"
+
+def test_vmHost_rules_are_skipped():
+    rules = [vim.cluster.AffinityRuleSpec(vm=[vmObj('vm-1'), vmObj('vm-2')]), vim.cluster.VmHostRuleInfo(vmGroupName='vnf', affineHostGroupName='hv')]
+    inventory = Inventory({'vm-1': 'hv01', 'vm-2': 'hv02'})
+    index = RuleIndex(rules, inventory.get_object_property)
+
+    assert index.ruleMembers('vm-1', AFFINITY_RULE) == ['vnf-2']
+    assert index.ruleCompliant('vm-1') == "False"
@@ -0,0 +1,65 @@
+import pandas as pd
+import pytest
+from Schema import VMRecord, VNICRecord, HostRecord, PNICRecord, recordsToFrame, compactFrame, expandFrame, concatFrames
+
+VM_ROWS = [{'VM_Name': 'vnf-1', 'MOID': 'vm-101', 'Host_Name': 'hv01', 'VM_vCPU': 8, 'VM_vMEM_GB': 16.0, 'VM_Space_In_Disk_GB': 120, 'VM_Snapshot': 'True',
+            'VM_AR_Rule_Compliant': 'True', 'VM_AntiAffinity': ['vnf-2'], 'VM_PowerState': 'poweredOn', 'Datastore_Free_GB': 900, 'Host_MOID': 'host-11',
+            'Restoration_Allowed': 'YES', 'VM_RealTime': 'YES', 'VM_NUMA': '0'},
+           {'VM_Name': 'vnf-2', 'MOID': 'vm-102', 'Host_Name': 'hv02', 'VM_vCPU': 4, 'VM_vMEM_GB': 8.5, 'VM_Space_In_Disk_GB': 60, 'VM_Snapshot': 'False',
+            'VM_AR_Rule_Compliant': 'False', 'VM_AntiAffinity': [], 'VM_PowerState': 'poweredOff', 'Host_MOID': 'host-12',
+            'Restoration_Allowed': 'NO', 'VM_RealTime': 'NO', 'VM_NUMA': ''}]     # Datastore_Free_GB not retrieved
+
+VNIC_ROWS = [{'VM_Name': 'vnf-1', 'MOID': 'vm-101', 'vNIC_Name': 'Network adapter 1', 'vNIC_Type': 'SR-IOV', 'vNIC_VLANs': [100, '200-210'], 'vNIC_pciSlotNumber': 192,
+              'vNIC_GuestOS_Mapping_Order': 1, 'vNIC_rxBuffer_Ring1_bytes': '', 'DPG_Active_Uplinks': ['vmnic4'], 'DPG_Promiscuous_Mode': False, 'dVS_LLDP': 'True'},
+             {'VM_Name': 'vnf-1', 'MOID': 'vm-101', 'vNIC_Name': 'Network adapter 2', 'vNIC_Type': 'vmxnet3', 'vNIC_VLANs': [], 'vNIC_pciSlotNumber': '',
+              'vNIC_GuestOS_Mapping_Order': 'poweredOff', 'vNIC_rxBuffer_Ring1_bytes': '4096', 'DPG_Active_Uplinks': [], 'DPG_Promiscuous_Mode': True, 'dVS_LLDP': 'false'}]
+
+HOST_ROWS = [{'Host_Name': 'hv01', 'MOID': 'host-11', 'Provisioned_vCPUs': 40, 'Total_CPU_Occupation_Perc': 62.5, 'ESXi_Build': 17499825, 'BIOS_Version': '2.10.2',
+              'iDRAC_Version': '4.40.00.00', 'Datastore_MixedSpace_GB': 250},
+             {'Host_Name': 'hv02', 'MOID': 'host-12', 'Provisioned_vCPUs': 12, 'Total_CPU_Occupation_Perc': 18.75, 'ESXi_Build': '17499825', 'BIOS_Version': '2.10.2'}]
+
+PNIC_ROWS = [{'Host_Name': 'hv01', 'MOID': 'host-11', 'vmnic_Name': 'vmnic4', 'vmnic_Driver': 'i40en', 'vmnic_configured_VFs': 8, 'vmnic_max_VFs': 64, 'vmnic_NUMA': 0},
+             {'Host_Name': 'hv01', 'MOID': 'host-11', 'vmnic_Name': 'vmnic0', 'vmnic_Driver': 'ntg3', 'vmnic_configured_VFs': '', 'vmnic_max_VFs': 0, 'vmnic_NUMA': 0}]
+
+TABLES = [('vm', VM_ROWS), ('vnic', VNIC_ROWS), ('host', HOST_ROWS), ('pnic', PNIC_ROWS)]
+RECORDS = {'vm': VMRecord, 'vnic': VNICRecord, 'host': HostRecord, 'pnic': PNICRecord}
+
+def buildFrame(table, rows):
+    """Return a table built as the scavengers build it, from row records."""
+
+    return recordsToFrame(table, [RECORDS[table](**row) for row in rows])
+
+@pytest.mark.parametrize('table, rows', TABLES)
+def test_compact_expand_round_trip(table, rows):
+    df = buildFrame(table, rows)
+    restored = expandFrame(table, compactFrame(table, df))
+
+    pd.testing.assert_frame_equal(restored, df)
+    assert restored.to_csv() == df.to_csv()    # Output files are byte-identical
+    assert restored.to_html() == df.to_html()
+    assert restored.to_json() == df.to_json()
+
+def test_compact_dtypes():
+    df = compactFrame('vm', buildFrame('vm', VM_ROWS))
+
+    assert isinstance(df['Host_Name'].dtype, pd.CategoricalDtype)
+    assert isinstance(df['VM_vCPU'].dtype, pd.Int64Dtype)
+    assert isinstance(df['VM_Snapshot'].dtype, pd.BooleanDtype)
+    assert isinstance(df['Datastore_Free_GB'].dtype, pd.Int64Dtype)    # Missing values do not prevent the conversion
+    assert isinstance(df['VM_NUMA'].dtype, pd.CategoricalDtype)     # '' placeholders are strings too
+
+def test_values_not_fitting_stay_object():
+    vnic = compactFrame('vnic', buildFrame('vnic', VNIC_ROWS))
+    pnic = compactFrame('pnic', buildFrame('pnic', PNIC_ROWS))
+    host = compactFrame('host', buildFrame('host', HOST_ROWS))
+
+    assert vnic['vNIC_pciSlotNumber'].dtype == object      # '' placeholder next to slot numbers
+    assert vnic['vNIC_GuestOS_Mapping_Order'].dtype == object  # 'poweredOff' next to positions
+    assert vnic['vNIC_VLANs'].dtype == object      # Lists are not categories
+    assert pnic['vmnic_configured_VFs'].dtype == object
+    assert host['ESXi_Build'].dtype == object      # int and str builds would both print 17499825 but differ once restored
+
+def test_concat_of_compact_frames():
+    frames = [compactFrame('vm', buildFrame('vm', [row])) for row in VM_ROWS]
+
+    pd.testing.assert_frame_equal(expandFrame('vm', concatFrames('vm', frames)), buildFrame('vm', VM_ROWS))
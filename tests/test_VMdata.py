@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+from VMdata import vnicOrder_calculator
+
+def baseline_pcislot_order(df_v_network, power_state):
+    """VMdata.pcislot_order before vnicOrder_calculator: the vNICs of one VM ordered through binary strings, row by row."""
+
+    if power_state == 'poweredOn':
+        df_v_network['temp_pci_order'] = ""
+        for index, row in df_v_network.iterrows():
+            if df_v_network.at[index, 'vNIC_pciSlotNumber'] != '':
+                slot = df_v_network.at[index, 'vNIC_pciSlotNumber']
+                slot_bin = bin(slot)[2:].zfill(12)
+                bus_bin = slot_bin[-10:-5]
+                function_bin = slot_bin[-12:-10]
+                pciBridge = int(bus_bin, 2) - 1
+                if row.vNIC_Type == 'e1000':
+                    pci_order = int(pciBridge) + int(slot)*0.01
+                else:
+                    pci_order = int(pciBridge) + int(function_bin, 2)*0.1
+                df_v_network.at[index, 'temp_pci_order'] = pci_order
+        if len(df_v_network[df_v_network['vNIC_pciSlotNumber'] == ''].index) == 0:
+            df_v_network = df_v_network.sort_values(by=['temp_pci_order'])
+            df_v_network = df_v_network.reset_index(drop = True)
+            df_v_network['vNIC_GuestOS_Mapping_Order'] = df_v_network.index + 1
+        df_v_network = df_v_network.drop(columns=['temp_pci_order'])
+    else:
+        df_v_network['vNIC_GuestOS_Mapping_Order'] = 'poweredOff'
+
+    return df_v_network
+
+def vnicFrame(vms):
+    """Return (df_vms_network, df_vms) for a list of (moid, power state, [(vNIC type, slot)])."""
+
+    vnics = [{'MOID': moid, 'VM_Name': moid, 'vNIC_Name': f'Network adapter {number}', 'vNIC_Type': nic_type, 'vNIC_pciSlotNumber': slot, 'vNIC_GuestOS_Mapping_Order': ''}
+             for moid, power_state, nics in vms for number, (nic_type, slot) in enumerate(nics, 1)]
+    df_vms = pd.DataFrame({'MOID': [moid for moid, power_state, nics in vms], 'VM_PowerState': [power_state for moid, power_state, nics in vms]})
+
+    return pd.DataFrame(vnics, dtype=object), df_vms
+
+def assertBaselineOrder(vms):
+    df_vms_network, df_vms = vnicFrame(vms)
+    expected = pd.concat([baseline_pcislot_order(df.reset_index(drop=True), power_state) for (moid, power_state, nics), (key, df)
+                          in zip(vms, df_vms_network.groupby('MOID', sort=False))], ignore_index=True)
+    result = vnicOrder_calculator(df_vms_network, df_vms)
+
+    pd.testing.assert_frame_equal(result[expected.columns].astype(str), expected.astype(str))
+
+def test_vnicOrder_matches_baseline():
+    assertBaselineOrder([('vm-1', 'poweredOn', [('vmxnet3', 224), ('vmxnet3', 160), ('SR-IOV', 1184), ('vmxnet3', 192)]),    # Bridges 6, 4, 4 (function 1) and 5
+                         ('vm-2', 'poweredOff', [('vmxnet3', 192), ('vmxnet3', 160)]),
+                         ('vm-3', 'poweredOn', [('vmxnet3', 192), ('SR-IOV', '')]),     # No slot yet. Rows are kept as they are
+                         ('vm-4', 'poweredOn', [('e1000', 33), ('vmxnet3', 2208), ('e1000', 34), ('vmxnet3', 1216)])])
+
+def test_vnicOrder_slot_bits_match_baseline():
+    rng = np.random.default_rng(19)
+    vms = []
+    for number in range(200):
+        positions = rng.choice(32 * 4, size=rng.integers(1, 8), replace=False)    # Distinct (bus, function) per VM, so that no two vNICs tie
+        nics = [(str(rng.choice(['vmxnet3', 'SR-IOV'])), int((position % 4) << 10 | (position // 4) << 5 | rng.integers(0, 32))) for position in positions]
+        vms.append((f'vm-{number}', str(rng.choice(['poweredOn', 'poweredOff'])), nics))
+
+    assertBaselineOrder(vms)
+
+def test_vnicOrder_empty():
+    df_vms_network, df_vms = vnicFrame([])
+
+    assert vnicOrder_calculator(df_vms_network, df_vms).empty
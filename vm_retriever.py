@@ -18,6 +18,7 @@ By Cesar Ortega
 
 from pyVmomi import vim     # Module "pyVmomi" to connect to vSphere API
 from pyVim.connect import SmartConnect, Disconnect
+from pyVmomi.SoapAdapter import SoapStubAdapter
 import ssl
 import argparse
 import getpass
@@ -25,16 +26,72 @@ import atexit   # Cleanup module
 import time
 import pandas as pd
 import numpy as np
-from VMdata import VMdata
-from HostData import HostData
+from VMdata import VMdata, vnicOrder_calculator
+from HostData import HostData, vmCapacity_aggregator, vectorVF_calculator, mixedSpace_calculator
+from InventoryCollector import InventoryCollector
+from InventoryIndex import InventoryIndex
+from PortgroupCatalogue import PortgroupCatalogue
+from RunIndexes import RunIndexes
+from ResultCache import ResultCache
+from FactCache import FactCache, extractFacts, applyFacts
+from RedfishClient import RedfishClient
+from RedfishCrawler import RedfishCrawler
+from Schema import buildFrame, concatFrames, recordsToFrame, compactFrame, expandFrame
 import os
 #import datetime
 import re
 import requests
 import json
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from datetime import datetime, timezone
 
+# Max. number of Hosts querying the same kind of target at the same time when Hosts are analyzed concurrently (--workers)
+target_limits = {'vcenter': threading.BoundedSemaphore(1), 'esxi': threading.BoundedSemaphore(1), 'idrac': threading.BoundedSemaphore(1)}
+
+# iDRAC Redfish collection mode. With 'crawl' the Redfish resources of each iDRAC are fetched concurrently (RedfishCrawler)
+redfish_options = {'crawl': False, 'concurrency': 4, 'deadline': 120}
+
+# Time of the last storage info refresh of each Datastore in this run, so that Datastores shared by several Hosts or scopes are refreshed once. {moid: timestamp}
+datastore_refresh = {}
+DATASTORE_REFRESH_AGE = 300     # Seconds a refreshed Datastore is considered fresh
+
+# Indexes shared by the VMs analyzed by this process (cluster rules, dVS Port Mirror sessions, Host uplinks and portgroups), so that each is read once per run
+run_indexes = RunIndexes()
+
+# VM rows cache (--cache). VMs whose configuration and Host did not change since the previous run are not derived again
+result_cache = {'cache': None}
+
+# Out-of-band Host facts cache (--factttl). Columns of each source which only change in maintenance windows
+fact_cache = {'cache': None}
+ESXI_FACT_COLUMNS = (['VIB_ISM_Version'], ['vmnic_Driver_version', 'vmnic_Firmware_version'])   # (Host columns, pNIC columns)
+IDRAC_FACT_COLUMNS = (['CPLD_Version', 'iDRAC_Version'], ['vmnic_MAC', 'iDRAC_NIC_Slot', 'iDRAC_EthernetPort_Slot'])
+
+def positive_int(value):
+    """Return a command line value as an int, rejecting values below 1 (argparse type)."""
+
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("invalid int value: '{}'".format(value))
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be 1 or greater: '{}'".format(value))
+
+    return number
+
+def non_negative_int(value):
+    """Return a command line value as an int, rejecting negative values (argparse type)."""
+
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("invalid int value: '{}'".format(value))
+    if number < 0:
+        raise argparse.ArgumentTypeError("must be 0 or greater: '{}'".format(value))
+
+    return number
+
 def parse_arguments():
     """Process input arguments."""
 
@@ -48,6 +105,23 @@ def parse_arguments():
     #parser.add_argument('--esxi', help='connect to ESXi to retrieve enhanced configuration values corresponding to host pNICs', action="store_true", required=False)
     parser.add_argument('--esxiuser', help='Username to connect to ESXi and retrieve enhanced configuration values corresponding to host pNICs', required=False)
     parser.add_argument('--idracuser', help='Username to connect to iDRAC and retrieve enhanced configuration values corresponding to host pNICs', required=False)
+    parser.add_argument('--bulk', help='retrieve VM properties in bulk (PropertyCollector) for all VMs in the queried object instead of one VM at a time', action="store_true", required=False)
+    parser.add_argument('--workers', help='number of Hosts analyzed concurrently (default 1)', type=positive_int, default=1, required=False)
+    parser.add_argument('--vcenterlimit', help='max. number of Hosts walking their VMs at the same time, cached and prefetched VMs included. It bounds Hosts in progress, not single vCenter calls (default: --workers)', type=positive_int, required=False)
+    parser.add_argument('--esxilimit', help='max. number of concurrent ESXi SSH connections (default: --workers)', type=positive_int, required=False)
+    parser.add_argument('--idraclimit', help='max. number of concurrent iDRAC connections (default: --workers)', type=positive_int, required=False)
+    parser.add_argument('--processes', help='number of worker processes analyzing the datacenter (-t datacenter). Workers reuse the vCenter session', type=positive_int, default=1, required=False)
+    parser.add_argument('--shard', help='unit of work of each worker process (default cluster)', choices=['cluster', 'datacenter'], default='cluster', required=False)
+    parser.add_argument('--redfishcrawl', help='fetch iDRAC Redfish resources concurrently instead of one request at a time', action="store_true", required=False)
+    parser.add_argument('--redfishconcurrency', help='max. number of concurrent Redfish requests per iDRAC with --redfishcrawl (default 4)', type=positive_int, default=4, required=False)
+    parser.add_argument('--redfishdeadline', help='max. seconds spent crawling each iDRAC with --redfishcrawl. Data retrieved until then is kept (default 120)', type=positive_int, default=120, required=False)
+    parser.add_argument('--regex', help='-n is a regular expression. The first matching Cluster/Host/VM, or every matching Datacenter, is analyzed', action="store_true", required=False)
+    parser.add_argument('--indexcache', help='JSON file where the vCenter inventory name index is kept between runs', required=False)
+    parser.add_argument('--indexttl', help='seconds the inventory name index in --indexcache is valid (default 3600)', type=non_negative_int, default=3600, required=False)
+    parser.add_argument('--cache', help='SQLite file where VM results are cached between runs. Unchanged VMs (same config.changeVersion and Host) are served from it', required=False)
+    parser.add_argument('--factttl', help='seconds firmware, VIB and driver versions retrieved from ESXi/iDRAC are reused without querying them again. iDRAC is not contacted on a hit; ESXi SSH still runs for the uncached pNIC/vNIC columns. Invalidated by ESXi build or BIOS changes', type=non_negative_int, required=False)
+    parser.add_argument('--factcache', help='JSON file where --factttl facts are kept between runs', required=False)
+    parser.add_argument('--interval', help='keep running and every INTERVAL seconds update output files with the VMs and hosts changed since the previous poll', type=positive_int, required=False)
 
     return parser.parse_args()
 
@@ -79,6 +153,33 @@ def connect(vcenter_ip, vcenter_user, vcenter_password):
         #print ('Invalid or untrusted cert')
     return c
 
+def connectWithCookie(vcenter_ip, session_cookie, api_version):
+    """Attach to an already authenticated vCenter session, without logging in again.
+
+    Parameters
+    ----------
+    vcenter_ip : string
+        vCenter IP address or resolvable FQDN
+    session_cookie : string
+        vCenter session cookie of the authenticated connection (si._stub.cookie)
+    api_version : string
+        vSphere API version negotiated by the authenticated connection (si._stub.version)
+
+    Returns
+    -------
+    c
+        vCenter Service Instance connection sharing the session of the authenticated connection
+    """
+
+    s = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    s.check_hostname = False
+    s.verify_mode = ssl.CERT_NONE
+    stub = SoapStubAdapter(host=vcenter_ip, port=443, version=api_version, sslContext=s)
+    stub.cookie = session_cookie    # Every request is sent with the session cookie. No login required
+    c = vim.ServiceInstance('ServiceInstance', stub)
+
+    return c
+
 def get_obj(content, vimtype, name = None):
     """Return vCenter objects matching a given type.
     
@@ -98,9 +199,13 @@ def get_obj(content, vimtype, name = None):
     #content.rootFolder  --> starting point to look into
     #[vim.VirtualMachine]  -->   object types to look for
     #recursive  -->  whether we should look into it recursively
-    return [item for item in content.viewManager.CreateContainerView(content.rootFolder, [vimtype], recursive=True).view]
+    view = content.viewManager.CreateContainerView(content.rootFolder, [vimtype], recursive=True)
+    try:
+        return [item for item in view.view]
+    finally:
+        view.Destroy()  # Views are kept in the vCenter session until destroyed
 
-def vm_scavenger(vm_obj):
+def vm_scavenger(vm_obj, prefetched=None):
     """Collect configuration data from a given VM.
 
     Parameters
@@ -109,125 +214,82 @@ def vm_scavenger(vm_obj):
        pyvmomi VM object 
        
        types: VMs "[vim.VirtualMachine]", hosts "[vim.ComputeResource]", clusters "[vim.ClusterComputeResource]", etc. (per object name can be obtained from vCenter MOB URL)
+    prefetched : dict (optional)
+       VM and related objects properties retrieved in bulk by InventoryCollector. {moid: {property path: value}}
 
     Results
     -------
-    df_v
-        Dataframe with data about this VM. One counter per column
+    vm_record
+        Row of this VM in the VM table (VMRecord)
+    vnic_records
+        Rows of the vNICs of this VM in the vNIC table (VNICRecord list)
     """
 
-    print('-- Gathering information from VM {}... '.format(vm_obj.name))
-    df_v = pd.DataFrame(columns=['VM_Name', 'MOID', 'Host_Name', 'VM_vCPU', 'VM_vMEM_GB', 'VM_Provisioned_Storage_GB', 'VM_Space_In_Disk_GB',
-                                    'VM_RealTime', 'VM_LatencySensitivity', 'VM_CoresPerSocket', 'VM_NUMA', 'CPU_Reservation_MHz', 'RAM_Reservation_GB',
-                                    'SRIOV_vNICs', 'VMXNET3_vNICs', 'PCIPT_vNICs', 'VM_SwapFile_Size_GB', 'Cluster_Name', 'Datastore_Name', 'Datastore_Capacity_GB', 
-                                    'Datastore_Free_GB', 'VM_Provisioned_vHDDs', 'VM_Snapshot', 'Restoration_Allowed', 'Snapshot_Allowed', 'VM_PowerState', 'VM_AntiAffinity', 
-                                    'VM_Affinity', 'VM_AR_Rule_Compliant', 'VM_SP_Label', 'VM_SP_proxyURI', 'VM_SP_serviceURI', 'VM_SP_direction', 'Host_CPU_Package_MHz',
-                                    'VirtualHardware_Version', 'UUID', 'Host_MOID', 'timestamp'])
-    df_v_network = pd.DataFrame(columns=['VM_Name', 'vNIC_Name', 'vNIC_Type', 'vNIC_DPG', 'vNIC_VLANs', 'vNIC_MAC', 'pNIC_inUse', 'pNIC_inUse_NUMA', 'vNIC_GuestOS_Mapping_Order', 'vNIC_pciSlotNumber', \
-                                            'vNIC_rxBuffer_Ring1_bytes', 'vNIC_rxBuffer_Ring1_fullTimes', 'vNIC_SRIOV_VF_ID', 'pNIC_PCI_Device', 'PortMirror_Session_Source', 'DPG_Active_Uplinks', 'DPG_Standby_Uplinks',\
-                                             'DPG_Promiscuous_Mode', 'DPG_MAC_Address_Changes', 'DPG_Forged_Transmits', 'DPG_Load_Balancing', 'vNIC_dVS', 'dVS_LLDP', 'MOID', 'Host_Name', 'VM_NUMA', 'timestamp'])
-    #df_v_network.astype=({'VM_Name':'str', 'vNIC_Name':'str', 'vNIC_Type':'str', 'vNIC_DPG':'str', 'vNIC_VLANs':'str', 'vNIC_MAC':'str', 'pNIC_inUse':'str', 'pNIC_inUse_NUMA':'str', 'vNIC_GuestOS_Mapping_Order':'str', 'vNIC_pciSlotNumber':'str', \
-    #                                        'vNIC_rxBuffer_Ring1_bytes':'str', 'vNIC_rxBuffer_Ring1_fullTimes':'str', 'vNIC_SRIOV_VF_ID':'str', 'pNIC_PCI_Device':'str', 'DPG_Active_Uplinks':'str', 'DPG_Standby_Uplinks':'str',\
-    #                                         'DPG_Promiscuous_Mode':'str', 'DPG_MAC_Address_Changes':'str', 'DPG_Forged_Transmits':'str', 'vNIC_dVS':'str', 'dVS_LLDP':'str', 'MOID':'str', 'Host_Name':'str', 'VM_NUMA':'str'})                         #dtype=[str,str,str,str,str,str,str,str,str,str,\
-    
+    vm_instance = VMdata(vm_obj, prefetched, run_indexes)   # Creating an instance of VMdata class
+    vm_name = vm_instance.vmName_calculator()
 
-    vm_instance = VMdata(vm_obj)   # Creating an instance of VMdata class
-
-    df_v = df_v.append({'VM_Name': vm_obj.name}, ignore_index=True)
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'MOID'] = vm_instance.vmMOID_calculator()
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'timestamp'] = vm_instance.timestamp_calculator()
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'Host_Name'] = vm_instance.hostname_calculator()
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'Cluster_Name'] = vm_instance.clusterName_calculator()
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'Datastore_Name'] = vm_instance.dsName_calculator()
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'Datastore_Capacity_GB'] = vm_instance.dsCapacity_calculator()
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'Datastore_Free_GB'] = vm_instance.dsFree_calculator()
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'VM_Provisioned_vHDDs'] = vm_instance.hddNumber_calculator()
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'VM_Provisioned_Storage_GB'] = vm_instance.hddCapacity_calculator()
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'VM_SwapFile_Size_GB'] = vm_instance.swap_calculator()
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'VM_Space_In_Disk_GB'] = vm_instance.actualUsage_calculator()
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'VM_Snapshot'] = vm_instance.snapshot_calculator() 
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'VM_PowerState'] = vm_instance.powerState_calculator()
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'VM_AntiAffinity'] = [vm_instance.antiAffinityRule_calculator()]   # Use [] to specify the list to be included in the cell
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'VM_Affinity'] = [vm_instance.affinityRule_calculator()]   # Use [] to specify the list to be included in the cell
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'VM_AR_Rule_Compliant'] = vm_instance.ruleCompliant_calculator()
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'VM_RealTime'] , df_v.at[(df_v['VM_Name'] == vm_obj.name), 'VM_ResourcePool'] = vm_instance.realtime_calculator()
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'VM_LatencySensitivity'] = vm_instance.latency_calculator()
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'VM_CoresPerSocket'] = vm_instance.corePerSocket_calculator()
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'VM_vCPU'] = vm_instance.vCPU_calculator()
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'VM_vMEM_GB'] = vm_instance.vMEM_calculator()
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'VM_NUMA'] = vm_instance.numaNode_calculator()
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'VM_SP_Label'], df_v.at[(df_v['VM_Name'] == vm_obj.name), 'VM_SP_proxyURI'], df_v.at[(df_v['VM_Name'] == vm_obj.name), 'VM_SP_serviceURI'], df_v.at[(df_v['VM_Name'] == vm_obj.name), 'VM_SP_direction'] = vm_instance.serialPort_calculator()
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'CPU_Reservation_MHz'], df_v.at[(df_v['VM_Name'] == vm_obj.name), 'RAM_Reservation_GB'] = vm_instance.reservations_calculator()
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'Host_CPU_Package_MHz'] = vm_instance.hostPackageMHz_calculator()
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'SRIOV_vNICs'] = vm_instance.sriovVirtualInterfaces_calculator()
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'VMXNET3_vNICs'] = vm_instance.vmxnet3VirtualInterfaces_calculator()
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'PCIPT_vNICs'] = vm_instance.pciptVirtualInterfaces_calculator()
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'VirtualHardware_Version'] = vm_instance.virtualHardwareVersion_calculator()
-    df_v.at[(df_v['VM_Name'] == vm_obj.name), 'Host_MOID'] = vm_instance.hostMOID_calculator()
-    #df_v.at[(df_v['VM_Name'] == vm_obj.name), 'UUID'] = vm_instance.UUID_calculator()
-
-    #if vm_obj.runtime.powerState == 'poweredOn':
-    for device in vm_obj.config.hardware.device:
-        nic_type = vm_instance.get_vnic_type(device)
-        if (nic_type != '') and ('DistributedVirtualPortBackingInfo' in str(type(device.backing))):
-            vnic_name = device.deviceInfo.label
-            if device.slotInfo:
-                vnic_slotNumber = device.slotInfo.pciSlotNumber
-            else:
-                #vnic_slotNumber = np.nan
-                vnic_slotNumber = ''
-            vnic_dpg_name = vnic_dpg_promiscuous = vnic_dpg_macChange = vnic_dpg_forged = vnic_dpg_lb = vnic_dpg_vlans = vnic_dpg_active_uplinks = \
-                                vnic_dpg_standby_uplinks = vnic_dvs_name = vnic_dvs_lldp = vnic_mac = vnic_sriov_vf = vnic_pciDevice = ""
-            if "PCI-PT" not in nic_type:
-                vnic_dpg_name = vm_instance.get_dpg_name(device.backing.port.portgroupKey)
-                vnic_dpg_promiscuous, vnic_dpg_macChange,  vnic_dpg_forged = vm_instance.get_dpg_security(vnic_dpg_name)
-                vnic_dpg_vlans = vm_instance.get_dpg_vlans(vnic_dpg_name)
-                vnic_dvs_name = vm_instance.get_dvs_name(vnic_dpg_name)
-                vnic_dvs_lldp = vm_instance.get_dvs_lldp(vnic_dpg_name)
-                vnic_dpg_active_uplinks, vnic_dpg_standby_uplinks = vm_instance.get_dpg_active_uplinks(vnic_dpg_name, vnic_dvs_name)
-                vnic_dpg_lb = vm_instance.get_dpg_lb_policy(vnic_dpg_name)
-                vnic_mac = device.macAddress
-                vnic_pmsession = vm_instance.get_vnic_pmSessions(device)
-
-                pnic_numa = ''
-                if "SR-IOV" in nic_type:
-                    vnic_pciDevice = device.sriovBacking.physicalFunctionBacking.id
-                    # SRIOV interfaces of powered-off VMs report no virtualFunctionBacking device
-                    try:
-                        vnic_sriov_vf = device.sriovBacking.virtualFunctionBacking.id
-                    except:
-                        vnic_sriov_vf = ''
-                
-                    if int(vnic_pciDevice.split(":")[1],16) > 130:
-                        pnic_numa = '1'
-                    else:
-                        pnic_numa = '0'
-            else:
-                vnic_pciDevice = device.backing.id
-                if int(vnic_pciDevice.split(":")[1],16) > 130:
-                    pnic_numa = '1'
-                else:
-                    pnic_numa = '0'
+    cache_key = None
+    if result_cache['cache'] is not None and vm_instance.changeVersion_calculator():
+        cache_key = (vm_instance.vmMOID_calculator(), vm_instance.changeVersion_calculator(), vm_instance.hostMOID_calculator())
+        cached = result_cache['cache'].get(*cache_key)
+        if cached is not None:  # VM not reconfigured nor migrated since cached. Its device list is only read for SRIOV VF IDs
+            print('-- Gathering cached information from VM {}... '.format(vm_name))
+            return vmVolatile_calculator(vm_instance, vm_name, *cached)
+
+    print('-- Gathering information from VM {}... '.format(vm_name))
+    vm_record = vm_instance.vmRecord_calculator()
+    vnic_records = vm_instance.vnicRecords_calculator()
 
-            df_v_network = df_v_network.append({'VM_Name': vm_obj.name, 'MOID': vm_instance.vmMOID_calculator(), 'Host_Name': vm_obj.summary.runtime.host.name.split('.')[0], 'VM_NUMA': vm_instance.numaNode_calculator(), \
-                                                'vNIC_Name': vnic_name, 'vNIC_Type': nic_type, 'vNIC_DPG': vnic_dpg_name,  'vNIC_VLANs': vnic_dpg_vlans, 'vNIC_MAC': vnic_mac, 'vNIC_dVS': vnic_dvs_name, \
-                                                'vNIC_pciSlotNumber': vnic_slotNumber, 'vNIC_SRIOV_VF_ID': vnic_sriov_vf,'pNIC_PCI_Device': vnic_pciDevice, 'pNIC_inUse_NUMA': pnic_numa, 'vNIC_GuestOS_Mapping_Order': "", \
-                                                'PortMirror_Session_Source': vnic_pmsession, 'DPG_Active_Uplinks': vnic_dpg_active_uplinks, 'DPG_Standby_Uplinks': vnic_dpg_standby_uplinks,  \
-                                                'DPG_Promiscuous_Mode': vnic_dpg_promiscuous, 'DPG_MAC_Address_Changes': vnic_dpg_macChange, 'DPG_Forged_Transmits': vnic_dpg_forged, "DPG_Load_Balancing" : vnic_dpg_lb,
-                                                'dVS_LLDP': vnic_dvs_lldp, 'timestamp': vm_instance.timestamp_calculator()}, ignore_index=True)
+    if cache_key is not None:
+        result_cache['cache'].put(*cache_key, vm_instance.dsMOID_calculator(), vm_record, vnic_records)
 
-    df_v_network = vm_instance.pcislot_order(df_v_network)
-    df_v_network.fillna('',inplace=True)
+    return vm_record, vnic_records
 
-    return df_v, df_v_network
+def vmVolatile_calculator(vm_instance, vm_name, vm_record, vnic_records, datastore_moid):
+    """Refresh the fields of cached VM rows which change without a VM reconfiguration (power state, datastore space, rules, resource pool, vNIC portgroups...).
+
+    Parameters
+    ----------
+    vm_instance : VMdata
+        VM whose rows were found in the cache
+    vm_record, vnic_records, datastore_moid
+        cached rows, as returned by ResultCache.get
 
-def host_scavenger(host_obj, arg_gsw, esxi_username='', esxi_password='', idrac_username='', idrac_password=''):
+    Returns
+    -------
+    vm_record, vnic_records
+        the cached rows with up-to-date volatile fields
+    """
+
+    timestamp = vm_instance.timestamp_calculator()
+    vm_record.timestamp = timestamp
+    vm_record.Host_Name = vm_instance.hostname_calculator()
+    vm_record.Cluster_Name = vm_instance.clusterName_calculator()
+    if datastore_moid:
+        vm_record.Datastore_Capacity_GB, vm_record.Datastore_Free_GB = vm_instance.dsSpaceFromMOID_calculator(datastore_moid)
+    vm_record.VM_Space_In_Disk_GB = vm_instance.actualUsage_calculator()
+    vm_record.VM_Snapshot = vm_instance.snapshot_calculator()
+    vm_record.VM_PowerState = vm_instance.powerState_calculator()
+    vm_record.VM_AntiAffinity = vm_instance.antiAffinityRule_calculator()
+    vm_record.VM_Affinity = vm_instance.affinityRule_calculator()
+    vm_record.VM_AR_Rule_Compliant = vm_instance.ruleCompliant_calculator()
+    vm_record.VM_RealTime, vm_record.VM_ResourcePool = vm_instance.realtime_calculator()    # Resource Pool moves do not change config.changeVersion
+    vnic_records = vm_instance.vnicVolatile_calculator(vnic_records)    # Neither do portgroup, dVS and SRIOV VF changes. Refreshed by the cached backing keys
+    for vnic_record in vnic_records:
+        vnic_record.timestamp = timestamp
+        vnic_record.Host_Name = vm_record.Host_Name
+
+    return vm_record, vnic_records
+
+def host_scavenger(host_obj, arg_gsw, esxi_username='', esxi_password='', idrac_username='', idrac_password='', prefetched=None):
     """Collect info about VMs running in a given Host.
 
     Parameters
     ----------
     host_obj : pyVmomi.VmomiSupport.vim.ComputeResource
        pyvmomi Host object 
+    prefetched : dict (optional)
+       VM properties retrieved in bulk by InventoryCollector. {moid: {property path: value}}
 
     Returns
     -------
@@ -239,76 +301,69 @@ def host_scavenger(host_obj, arg_gsw, esxi_username='', esxi_password='', idrac_
         Dataframe with Host pNIC information. One pNIC per row
     """
 
-    df_vms = pd.DataFrame(columns=['VM_Name'])
-    df_vms_network = pd.DataFrame(columns=['VM_Name'])
-    df_h = pd.DataFrame(columns=['Host_Name', 'MOID', 'Cluster_Name', 'Provisioned_vCPUs', 'Provisioned_RAM', 'Datastore_Provisioned_GB', 'RealTime_vCPUs', 
-                                'RealTime_Occupation_Perc', 'Total_CPU_Occupation_Perc', 'Total_RAM_Occupation_Perc', 'Max_RealTime_Occupation_Perc', 
-                                'Max_OverProv_Ratio_Perc', 'Socket0_Pinned_vCPUs', 'Socket0_CPU_Occupation_Perc', 'Socket1_Pinned_vCPUs', 'Socket1_CPU_Occupation_Perc',
-                                'Socket0_Pinned_vMEM', 'Socket0_RAM_Occupation_Perc', 'Socket1_Pinned_vMEM', 'Socket1_RAM_Occupation_Perc',
-                                'SRIOV_VMs', 'SRIOV_VFs_Provisioned', 'PCIPT_VMs', 'PCIPT_Devices_Provisioned', 'Datastore_Name', 'Datastore_Capacity_GB', 
-                                'Datastore_Free_GB', 'Datastore_ProvisionedSwap_GB', 'Datastore_MixedSpace_GB', 'ESXi_Version',
-                                'ESXi_Build', 'BIOS_Version', 'CPLD_Version', 'iDRAC_Version', 'VIB_ISM_Version', 'ESXi_Rsv_Cores', 'ESXi_Rsv_RAM_GB', 'Model', 'timestamp'])
-    df_h_network = pd.DataFrame(columns=['Host_Name', 'MOID', 'vmnic_Name', 'vmnic_Model', 'vmnic_Driver', 'vmnic_Driver_version', 'vmnic_Firmware_version', 'vmnic_MAC', 
-                                'vmnic_Device', 'vmnic_Type', 'vmnic_Link_Status', 'vmnic_Configured_Speed_Mbps', 'vmnic_NUMA', 'vmnic_virtualSwitch', 'vmnic_configured_VFs', 'Host_calculated_VF_Vector', 
-                                'Host_current_VF_Vector', 'Host_calculated_Trusted_Vector', 'Host_current_Trusted_Vector', 'iDRAC_NIC_Slot', 'iDRAC_EthernetPort_Slot', 
-                                'physical_Switch_name', 'physical_Switch_port', 'physical_Switch_port_VLANs', 'vmnic_max_VFs', 'Model', 'Cluster_Name','timestamp'])
-    
-    print('** Gathering information from VMs in Host {}... '.format(host_obj.name.split('.')[0]))
-    refreshDatastore(host_obj)
-    for vm_obj in host_obj.vm:
-        df_temp_v, df_temp_v_network = vm_scavenger(vm_obj)
-        df_vms = df_vms.append(df_temp_v, ignore_index=True)   # Adding one by one each VM in the Host to the df_vms Dataframe
-        df_vms_network = df_vms_network.append(df_temp_v_network, ignore_index=True)
-
-    host_instance = HostData(host_obj, df_vms)   # Creating an instance of HostData class
-
-    df_h = df_h.append({'Host_Name': host_obj.name.split('.')[0]}, ignore_index=True)
-    df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'MOID'] = host_instance.hostMOID_calculator()
-    df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'timestamp'] = host_instance.timestamp_calculator()
-    df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'Cluster_Name'] = host_instance.clustername_calculator()
-    df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'ESXi_Version'], \
-        df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'ESXi_Build'] = host_instance.esxiVersion()
-    df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'BIOS_Version'] = host_instance.biosVersion()
-    df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'ESXi_Rsv_Cores'] = host_instance.hypReservedCores_calculator()
-    df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'ESXi_Rsv_RAM_GB'] = host_instance.hypReservedMEM_calculator()
-    df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'RealTime_vCPUs'],  \
-        df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'RealTime_Occupation_Perc'] = host_instance.realtimevCPUs()
-    df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'Max_RealTime_Occupation_Perc'] = host_instance.cpuRealTimeOccupationRatio()
-    df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'Provisioned_vCPUs'], \
-         df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'Total_CPU_Occupation_Perc'] = host_instance.provisionedvCPUs()
-    df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'Max_OverProv_Ratio_Perc'] = host_instance.cpuOccupationRatio()
-    for socket in range(host_obj.hardware.numaInfo.numNodes):
-        df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'Socket'+str(socket)+'_Pinned_vCPUs'], \
-            df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'Socket'+str(socket)+'_CPU_Occupation_Perc'] = host_instance.socketProvisionedvCPUs(socket)
-        df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'Socket'+str(socket)+'_Pinned_vMEM'], \
-            df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'Socket'+str(socket)+'_RAM_Occupation_Perc'] = host_instance.socketProvisionedRAM(socket)
-        #df_h['Host_Socket'+str(socket)+'_vCPUs'] = df_h['Host_Socket'+str(socket)+'_vCPUs'].astype(int)
-    df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'Model'] = host_instance.modelInfo_calculator()
-    df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'Provisioned_RAM'], \
-        df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'Total_RAM_Occupation_Perc'] = host_instance.provisionedRAM()
-    df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'Datastore_Name'], \
-        df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'Datastore_Capacity_GB'], \
-        df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'Datastore_Free_GB'], \
-        df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'Datastore_Provisioned_GB'], \
-        df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'Datastore_ProvisionedSwap_GB'], \
-        df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'Datastore_MixedSpace_GB'] = host_instance.dsInfo_calculator()
-    df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'SRIOV_VMs'],  \
-        df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'SRIOV_VFs_Provisioned'] = host_instance.sriovVMs()
-    df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'PCIPT_VMs'],  \
-        df_h.at[(df_h['Host_Name'] == host_obj.name.split('.')[0]), 'PCIPT_Devices_Provisioned'] = host_instance.pciptVMs()
-
-    # The following two metrics can only be obtained here as at this point df_vms and df_h are complete
-    df_vms = host_instance.snapshotAllowed_calculator(df_h['Datastore_MixedSpace_GB'].item())
-    df_vms = host_instance.restorationAllowed_calculator(df_h['Datastore_MixedSpace_GB'].item())
+    vm_records = []
+    vnic_records = []
+
+    with target_limits['vcenter']:  # VMdata reads properties lazily, so vCenter calls are spread over the whole VM loop. Held for all of it
+        print('** Gathering information from VMs in Host {}... '.format(host_obj.name.split('.')[0]))
+        for vm_obj in host_obj.vm:
+            vm_record, vm_vnic_records = vm_scavenger(vm_obj, prefetched)
+            vm_records.append(vm_record)
+            vnic_records += vm_vnic_records
+    df_vms = recordsToFrame('vm', vm_records)   # Rows of all VMs in the Host are converted to columns at once
+    df_vms_network = recordsToFrame('vnic', vnic_records)
+
+    return host_calculator(host_obj, df_vms, df_vms_network, arg_gsw, esxi_username, esxi_password, idrac_username, idrac_password)
+
+def host_calculator(host_obj, df_vms, df_vms_network, arg_gsw, esxi_username='', esxi_password='', idrac_username='', idrac_password='', df_capacity=None):
+    """Derive Host data from the VMs already collected in a given Host.
+
+    Parameters
+    ----------
+    host_obj : pyVmomi.VmomiSupport.vim.ComputeResource
+       pyvmomi Host object 
+    df_vms
+        Dataframe with data from all VMs in this Host. One VM per row
+    df_vms_network
+        Dataframe with networking data from each vNIC of the VMs in this Host. One vNIC per row
+    df_capacity (optional)
+        VM figures aggregated over the VMs of many Hosts by vmCapacity_aggregator. Aggregated from df_vms if not given
+
+    Returns
+    -------
+    df_vms
+        Dataframe with data from all VMs in this Host. One VM per row
+    df_vms_network
+        Dataframe with networking data from each vNIC of the VMs in this Host. One vNIC per row
+    df_h
+        Dataframe with data about this Host. One counter per column
+    df_h_network
+        Dataframe with Host pNIC information. One pNIC per row
+    """
+
+    host_instance = HostData(host_obj, df_vms, df_capacity)   # Creating an instance of HostData class
+
+    df_h = recordsToFrame('host', [host_instance.hostRecord_calculator()])
+    df_h_network = recordsToFrame('pnic', [])
 
     df_h_network = host_instance.standardpNIC_info(df_h_network)
     df_h_network = host_instance.pciPassThroughNIC_info(df_h_network)
     df_h_network = host_instance.virtualSwitch_info(df_h_network)
     df_h_network = host_instance.pnicNuma_calculator(df_h_network)
     df_h_network = host_instance.pciDevice_Model(df_h_network)
+    esxi_build = df_h['ESXi_Build'].item()
+    bios_version = df_h['BIOS_Version'].item()
     if esxi_username and esxi_password:
-        df_h_network, df_h, df_vms_network = host_instance.connect_to_esxi(df_h_network, df_h, df_vms_network, esxi_username, esxi_password)
-    df_h_network = host_instance.vectorVF_calculator(df_h_network)
+        esxi_facts = None
+        if fact_cache['cache'] is not None:
+            esxi_facts = fact_cache['cache'].get(host_obj.name, 'esxi', esxi_build, bios_version)
+        df_h_before, df_h_network_before = df_h.copy(), df_h_network.copy()
+        with target_limits['esxi']:     # Connected even on a hit: vmnic names, VF vectors and vNIC uplinks/rings are not facts. Only the version commands are skipped
+            df_h_network, df_h, df_vms_network = host_instance.connect_to_esxi(df_h_network, df_h, df_vms_network, esxi_username, esxi_password, versions=esxi_facts is None)
+        if esxi_facts is not None:
+            df_h, df_h_network = applyFacts(df_h, df_h_network, esxi_facts)
+        elif fact_cache['cache'] is not None and 'esxi' not in host_instance.incomplete:
+            fact_cache['cache'].put(host_obj.name, 'esxi', esxi_build, bios_version, extractFacts(df_h, df_h_network, df_h_before, df_h_network_before, *ESXI_FACT_COLUMNS))
     df_h_network.at[(df_h_network['Host_Name'] == host_obj.name.split('.')[0]), 'timestamp'] = host_instance.timestamp_calculator()
     df_h_network.at[(df_h_network['Host_Name'] == host_obj.name.split('.')[0]), 'Model'] = host_instance.modelInfo_calculator()
     df_h_network.at[(df_h_network['Host_Name'] == host_obj.name.split('.')[0]), 'Cluster_Name'] = host_instance.clustername_calculator()
@@ -316,27 +371,109 @@ def host_scavenger(host_obj, arg_gsw, esxi_username='', esxi_password='', idrac_
     #if arg_gsw:
     #    df_h_network = host_instance.connect_to_GSW(df_h_network)
 
-    if idrac_username and idrac_password:
-        if 'R730' in df_h['Model'].item():  # Dell R730 iDRAC data takes too long to be retrieved via Redfish. It is retrieved faster through CGI.
-            df_h, df_h_network = host_instance.idrac_cgi(df_h, df_h_network, idrac_username, idrac_password)
-        elif 'PowerEdge' in df_h['Model'].item():
-            #print("Connecting to {} iDRAC. Depending on host/iDRAC model this may take a while... be patient.\n".format(host_obj.name.split('.')[0]))
-            df_h_network = host_instance.idrac_PCIeDeviceInfo(df_h_network, idrac_username, idrac_password)
-            df_h_network = host_instance.idrac_ethernetInterfaces(df_h_network, idrac_username, idrac_password)
-            df_h = host_instance.get_FW_inventory(df_h, idrac_username, idrac_password)
-        else:
-            # HP Blades code goes here
-            pass
+    idrac_facts = None
+    if idrac_username and idrac_password and fact_cache['cache'] is not None:
+        idrac_facts = fact_cache['cache'].get(host_obj.name, 'idrac', esxi_build, bios_version)
+    if idrac_facts is not None:    # No iDRAC connection at all
+        df_h, df_h_network = applyFacts(df_h, df_h_network, idrac_facts)
+    elif idrac_username and idrac_password:
+        df_h_before, df_h_network_before = df_h.copy(), df_h_network.copy()
+        with target_limits['idrac']:
+            if 'R730' in df_h['Model'].item():  # Dell R730 iDRAC data takes too long to be retrieved via Redfish. It is retrieved faster through CGI.
+                df_h, df_h_network = host_instance.idrac_cgi(df_h, df_h_network, idrac_username, idrac_password)
+            elif 'PowerEdge' in df_h['Model'].item():
+                #print("Connecting to {} iDRAC. Depending on host/iDRAC model this may take a while... be patient.\n".format(host_obj.name.split('.')[0]))
+                with RedfishClient(host_instance.idracName_calculator(), idrac_username, idrac_password, redfish_options['concurrency']) as redfish:   # One Redfish session shared by all iDRAC collectors
+                    if redfish_options['crawl']:
+                        crawler = RedfishCrawler(redfish, redfish_options['concurrency'], redfish_options['deadline'])
+                        df_h, df_h_network = host_instance.idrac_crawlResults(df_h, df_h_network, crawler.crawl())
+                        if not crawler.complete:    # Partial data is shown but not cached
+                            host_instance.incomplete.add('idrac')
+                    else:
+                        df_h_network = host_instance.idrac_PCIeDeviceInfo(df_h_network, redfish)
+                        df_h_network = host_instance.idrac_ethernetInterfaces(df_h_network, redfish)
+                        df_h = host_instance.get_FW_inventory(df_h, redfish)
+            else:
+                # HP Blades code goes here
+                pass
+        if fact_cache['cache'] is not None and 'idrac' not in host_instance.incomplete:    # A partial collection would hide the missing columns for the whole TTL
+            fact_cache['cache'].put(host_obj.name, 'idrac', esxi_build, bios_version, extractFacts(df_h, df_h_network, df_h_before, df_h_network_before, *IDRAC_FACT_COLUMNS))
     
     return df_vms, df_vms_network, df_h, df_h_network
 
-def cluster_scavenger(cluster_obj, arg_gsw, esxi_username='', esxi_password='', idrac_username='', idrac_password=''):
+def hostPool_scavenger(host_list, arg_workers, arg_gsw, esxi_username='', esxi_password='', idrac_username='', idrac_password='', prefetched=None):
+    """Run host_scavenger for every Host in a list, concurrently on a pool of arg_workers threads.
+
+    Hosts spend most of their time waiting for vCenter, ESXi and iDRAC, so they are analyzed in parallel threads.
+    The number of Hosts querying each kind of target at the same time is bounded by target_limits.
+
+    Returns
+    -------
+    list
+        host_scavenger results (df_vms, df_vms_network, df_h, df_h_network), in the same order as host_list
+    """
+
+    refreshDatastores(host_list, arg_workers)
+
+    if arg_workers <= 1 or len(host_list) <= 1:
+        return [host_scavenger(host_obj, arg_gsw, esxi_username, esxi_password, idrac_username, idrac_password, prefetched) for host_obj in host_list]
+
+    with ThreadPoolExecutor(max_workers=arg_workers) as executor:
+        futures = [executor.submit(host_scavenger, host_obj, arg_gsw, esxi_username, esxi_password, idrac_username, idrac_password, prefetched) for host_obj in host_list]
+
+        return [future.result() for future in futures]  # Results merged in host_list order regardless of completion order
+
+def setTargetLimits(arg_workers, arg_vcenterlimit=None, arg_esxilimit=None, arg_idraclimit=None):
+    """Set the max. number of Hosts querying vCenter, ESXi and iDRAC at the same time. Limits default to the number of workers."""
+
+    target_limits['vcenter'] = threading.BoundedSemaphore(arg_vcenterlimit or arg_workers)
+    target_limits['esxi'] = threading.BoundedSemaphore(arg_esxilimit or arg_workers)
+    target_limits['idrac'] = threading.BoundedSemaphore(arg_idraclimit or arg_workers)
+
+def setResultCache(arg_cache):
+    """Open the VM rows cache file (--cache). No cache is used if arg_cache is empty."""
+
+    if arg_cache:
+        result_cache['cache'] = ResultCache(arg_cache)
+        atexit.register(result_cache['cache'].close)
+
+def setPortgroupCatalogue(content):
+    """Create the distributed portgroup catalogue shared by the VMs analyzed by this process."""
+
+    run_indexes.portgroup_catalogue = PortgroupCatalogue(content)
+
+def setFactCache(arg_factttl, arg_factcache=None):
+    """Enable the out-of-band Host facts cache if a TTL is given, optionally kept in the arg_factcache file."""
+
+    if arg_factttl:
+        fact_cache['cache'] = FactCache(arg_factttl, arg_factcache)
+
+def saveFactCache():
+    """Write the Host facts retrieved by this collection to the --factcache file."""
+
+    if fact_cache['cache'] is not None:
+        fact_cache['cache'].flush()
+
+def setRedfishOptions(arg_crawl, arg_concurrency=4, arg_deadline=120):
+    """Set the iDRAC Redfish collection mode: sequential requests or concurrent crawl (per-iDRAC concurrency and deadline)."""
+
+    redfish_options['crawl'] = arg_crawl
+    redfish_options['concurrency'] = arg_concurrency
+    redfish_options['deadline'] = arg_deadline
+
+def cluster_scavenger(cluster_obj, arg_gsw, esxi_username='', esxi_password='', idrac_username='', idrac_password='', prefetched=None, arg_workers=1, host_results=None):
     """Iterate through Hosts in a given Cluster.
 
     Parameters
     ----------
     cluster_obj : pyVmomi.VmomiSupport.vim.ComputeResource
        pyvmomi Host object 
+    prefetched : dict (optional)
+       VM properties retrieved in bulk by InventoryCollector. {moid: {property path: value}}
+    arg_workers : int (optional)
+       number of Hosts analyzed concurrently
+    host_results : list (optional)
+       host_scavenger results of the Hosts in this Cluster, when already collected by the caller
 
     Returns
     -------
@@ -350,31 +487,30 @@ def cluster_scavenger(cluster_obj, arg_gsw, esxi_username='', esxi_password='',
         Dataframe with data about this Cluster. One counter per column
     """
 
-    df_vms = pd.DataFrame(columns=['VM_Name'])
-    df_vms_network = pd.DataFrame(columns=['VM_Name'])
-    df_hosts = pd.DataFrame(columns=['Host_Name'])
-    df_hosts_network = pd.DataFrame(columns=['Host_Name'])
-    df_c = pd.DataFrame(columns=['Cluster_Name'])
-
     print('## Gathering information from Hosts in Cluster {}... '.format(cluster_obj.name))
-    for host_obj in cluster_obj.host:
-        df_temp_v, df_temp_v_network, df_temp_h, df_temp_h_network = host_scavenger(host_obj, arg_gsw, esxi_username, esxi_password, idrac_username, idrac_password)
-        df_vms = df_vms.append(df_temp_v, ignore_index=True)   # Adding one by one the configuration data from each VM to the host Dataframe
-        df_vms_network = df_vms_network.append(df_temp_v_network, ignore_index=True)
-        df_hosts = df_hosts.append(df_temp_h, ignore_index=True)
-        df_hosts_network = df_hosts_network.append(df_temp_h_network, ignore_index=True)
-    
-    df_c = df_c.append({'Cluster_Name': cluster_obj.name}, ignore_index=True)
+    if host_results is None:
+        host_results = hostPool_scavenger(list(cluster_obj.host), arg_workers, arg_gsw, esxi_username, esxi_password, idrac_username, idrac_password, prefetched)
+    vm_frames, vm_network_frames, host_frames, host_network_frames = zip(*host_results) if host_results else ([], [], [], [])
+    df_vms = compactFrame('vm', concatFrames('vm', vm_frames))     # The data from every Host in the Cluster is merged at once
+    df_vms_network = compactFrame('vnic', concatFrames('vnic', vm_network_frames))
+    df_hosts = compactFrame('host', concatFrames('host', host_frames))
+    df_hosts_network = compactFrame('pnic', concatFrames('pnic', host_network_frames))
+
+    df_c = buildFrame('cluster', [{'Cluster_Name': cluster_obj.name}])
 
     return df_vms, df_vms_network, df_hosts, df_hosts_network, df_c
 
-def datacenter_scavenger(datacenter_obj, arg_gsw, esxi_username='', esxi_password='', idrac_username='', idrac_password=''):
+def datacenter_scavenger(datacenter_obj, arg_gsw, esxi_username='', esxi_password='', idrac_username='', idrac_password='', prefetched=None, arg_workers=1):
     """Iterate through Clusters in a given Datacenter.
 
     Parameters
     ----------
     datacenter_obj : pyVmomi.VmomiSupport.vim.Datacenter
        pyvmomi Datacenter object 
+    prefetched : dict (optional)
+       VM properties retrieved in bulk by InventoryCollector. {moid: {property path: value}}
+    arg_workers : int (optional)
+       number of Hosts analyzed concurrently. Hosts from all Clusters share the same pool
 
     Returns
     -------
@@ -388,37 +524,326 @@ def datacenter_scavenger(datacenter_obj, arg_gsw, esxi_username='', esxi_passwor
         Dataframe with data about this Datacenter. One counter per column
     """
 
-    df_vms = pd.DataFrame(columns=['VM_Name'])
-    df_vms_network = pd.DataFrame(columns=['VM_Name'])
-    df_hosts = pd.DataFrame(columns=['Host_Name'])
-    df_hosts_network = pd.DataFrame(columns=['Host_Name'])
-    df_clusters = pd.DataFrame(columns=['Cluster_Name'])
-    df_d = pd.DataFrame(columns=['Datacenter_Name'])
+    cluster_results = []
 
     #df_cluster = pd.DataFrame(columns=['VM_Name', 'Host_name', 'Cluster_name', 'Datastore_Name', 'Datastore_Capacity_GB', 'Datastore_Free_GB', 'VM_Provisioned_vHDDs', 
     #                                'VM_Provisioned_Storage_GB', 'VM_SwapFile_Size_GB', 'VM_Space_In_Disk_GB', 'VM_Snapshot', 'VM_PowerState', 'VM_AntiAffinity', 'VM_Affinity'])
 
     print('// Gathering information from Clusters in Datacenter {}... '.format(datacenter_obj.name))
-    for cluster_obj in datacenter_obj.hostFolder.childEntity:
-        df_temp_v, df_v_network, df_temp_h, df_temp_h_network, df_temp_c = cluster_scavenger(cluster_obj, arg_gsw, esxi_username, esxi_password, idrac_username, idrac_password)
-        df_vms = df_vms.append(df_temp_v, ignore_index=True)   # Adding one by one the configuration data from each VM to the VM Dataframe
-        df_vms_network = df_vms_network.append(df_v_network, ignore_index=True)
-        df_hosts = df_hosts.append(df_temp_h, ignore_index=True)    # Adding one by one the configuration data from each Host to the host Dataframe
-        df_clusters = df_clusters.append(df_temp_c, ignore_index=True)  # Adding one by one the configuration data from each Cluster to the Cluster Dataframe
-        df_hosts_network = df_hosts_network.append(df_temp_h_network, ignore_index=True)
+    cluster_hosts = [(cluster_obj, list(cluster_obj.host)) for cluster_obj in datacenter_obj.hostFolder.childEntity]
+    host_results = hostPool_scavenger([host_obj for cluster_obj, host_list in cluster_hosts for host_obj in host_list], arg_workers, arg_gsw, esxi_username, esxi_password, idrac_username, idrac_password, prefetched)
+    for cluster_obj, host_list in cluster_hosts:
+        cluster_host_results, host_results = host_results[:len(host_list)], host_results[len(host_list):]
+        cluster_results.append(cluster_scavenger(cluster_obj, arg_gsw, esxi_username, esxi_password, idrac_username, idrac_password, prefetched, arg_workers, cluster_host_results))
 
-    df_d = df_d.append({'Datacenter_Name': datacenter_obj.name}, ignore_index=True)
+    df_vms, df_vms_network, df_hosts, df_hosts_network, df_clusters = mergeResults(cluster_results, ['vm', 'vnic', 'host', 'pnic', 'cluster'])
+    df_d = buildFrame('datacenter', [{'Datacenter_Name': datacenter_obj.name}])
 
     return df_vms, df_vms_network, df_hosts, df_hosts_network, df_clusters, df_d
 
-def refreshDatastore(host_obj):
-    """Refresh host Datastore Storage information."""
+def shard_scavenger(shard):
+    """Analyze a Cluster or a Datacenter in a worker process (process pool entry point).
+
+    The worker attaches to the vCenter session of the parent process through its session cookie and
+    returns the resulting dataframes to the parent.
+
+    Parameters
+    ----------
+    shard : tuple
+        (vcenter_ip, session_cookie, api_version, shard_type, shard_moid, options) being shard_type 'cluster' or 'datacenter'
+        and options a dictionary with the arguments of cluster_scavenger/datacenter_scavenger
 
-    for datastore_obj in host_obj.datastore:
+    Returns
+    -------
+    tuple
+        cluster_scavenger or datacenter_scavenger results
+    """
+
+    vcenter_ip, session_cookie, api_version, shard_type, shard_moid, options = shard
+    si = connectWithCookie(vcenter_ip, session_cookie, api_version)   # Session must not be closed by the worker. It belongs to the parent process
+    content = si.RetrieveContent()
+    setPortgroupCatalogue(content)
+    setTargetLimits(options['workers'], options['vcenterlimit'], options['esxilimit'], options['idraclimit'])
+    setRedfishOptions(options['redfishcrawl'], options['redfishconcurrency'], options['redfishdeadline'])
+    setResultCache(options['cache'])    # Each process opens its own connection to the cache file
+    setFactCache(options['factttl'], options['factcache'])
+    datastore_refresh.update(options['datastore_refresh'])  # Datastores already refreshed by the parent process
+
+    if shard_type == 'cluster':
+        shard_obj = vim.ClusterComputeResource(shard_moid, si._stub)
+    else:
+        shard_obj = vim.Datacenter(shard_moid, si._stub)
+    prefetched = bulkCollector(content, shard_obj, options['bulk'], options['workers'])
+    scavenger = cluster_scavenger if shard_type == 'cluster' else datacenter_scavenger
+    results = scavenger(shard_obj, options['gsw'], options['esxi_username'], options['esxi_password'], options['idrac_username'], options['idrac_password'], prefetched, options['workers'])
+    saveFactCache()     # Merged with the facts saved by the other workers
+
+    return results
+
+def datacenterPool_scavenger(si, vcenter_ip, datacenter_obj_list, arg_processes, arg_shard, options):
+    """Analyze a list of Datacenters on a pool of worker processes, sharding the work by Cluster or by Datacenter.
+
+    Parameters
+    ----------
+    si : vim.ServiceInstance
+        authenticated vCenter connection. Workers reuse its session
+    datacenter_obj_list : list
+        pyvmomi Datacenter objects
+    arg_processes : int
+        number of worker processes
+    arg_shard : string
+        'cluster' or 'datacenter'
+    options : dict
+        arguments of cluster_scavenger/datacenter_scavenger for the workers
+
+    Returns
+    -------
+    df_vms, df_vms_network, df_hosts, df_hosts_network, df_clusters, df_datacenters
+        Dataframes merged from all workers, in inventory order
+    """
+
+    datacenter_rows = []
+
+    # Datastores are refreshed once here for all shards. Otherwise each worker would refresh again the Datastores shared with other shards
+    refreshDatastores([host_obj for datacenter_obj in datacenter_obj_list for host_obj in containerHosts(datacenter_obj)], options['workers'])
+    options = dict(options, datastore_refresh=dict(datastore_refresh))
+
+    shards = []
+    for datacenter_obj in datacenter_obj_list:
+        if arg_shard == 'cluster':
+            shards += [(vcenter_ip, si._stub.cookie, si._stub.version, 'cluster', cluster_obj._moId, options) for cluster_obj in datacenter_obj.hostFolder.childEntity]
+            datacenter_rows.append({'Datacenter_Name': datacenter_obj.name})
+        else:
+            shards.append((vcenter_ip, si._stub.cookie, si._stub.version, 'datacenter', datacenter_obj._moId, options))
+
+    print('// Gathering information from {} {}s in {} worker processes... '.format(len(shards), arg_shard, arg_processes))
+    with ProcessPoolExecutor(max_workers=arg_processes) as executor:
+        results = list(executor.map(shard_scavenger, shards))    # Results are returned in shards order
+
+    if arg_shard == 'datacenter':
+        return mergeResults(results, ['vm', 'vnic', 'host', 'pnic', 'cluster', 'datacenter'])
+    df_vms, df_vms_network, df_hosts, df_hosts_network, df_clusters = mergeResults(results, ['vm', 'vnic', 'host', 'pnic', 'cluster'])
+
+    return df_vms, df_vms_network, df_hosts, df_hosts_network, df_clusters, buildFrame('datacenter', datacenter_rows)
+
+def mergeResults(results, tables):
+    """Merge a list of scavenger results into one dataframe per table, with a single concat per table.
+
+    Parameters
+    ----------
+    results : list
+        cluster_scavenger or datacenter_scavenger results, i.e. (df_vms, df_vms_network, df_hosts, df_hosts_network, df_c)
+    tables : list
+        Schema table of each dataframe in the results, i.e. ['vm', 'vnic', 'host', 'pnic', 'cluster']
+
+    Returns
+    -------
+    tuple
+        One merged dataframe per table, rows in results order, with compact dtypes (see Schema.compactFrame)
+    """
+
+    return tuple(compactFrame(table, concatFrames(table, [result[position] for result in results])) for position, table in enumerate(tables))
+
+def finaliseFrames(df_vms, df_vms_network, df_hosts, df_hosts_network):
+    """Calculate the columns derived from the whole output tables, once per run after all VMs and Hosts are collected.
+
+    Returns
+    -------
+    df_vms, df_vms_network, df_hosts, df_hosts_network
+        Input dataframes with the derived columns (VM Snapshot and Restoration eligibility, vNIC GuestOS order, Host VF and Trusted vectors)
+    """
+
+    df_vms = compactFrame('vm', mixedSpace_calculator(expandFrame('vm', df_vms), expandFrame('host', df_hosts)))
+    df_vms_network = compactFrame('vnic', vnicOrder_calculator(expandFrame('vnic', df_vms_network), df_vms))
+    df_hosts_network = compactFrame('pnic', vectorVF_calculator(expandFrame('pnic', df_hosts_network)))
+
+    return df_vms, df_vms_network, df_hosts, df_hosts_network
+
+def bulkCollector(content, container_obj, arg_bulk, arg_workers=1):
+    """Retrieve in a few paged PropertyCollector calls the properties of all VMs in a host/cluster/datacenter.
+
+    The Datastores of the container are refreshed first, so that the prefetched Datastore space is as recent as when it is read per VM.
+
+    Parameters
+    ----------
+    content : pyVmomi.VmomiSupport.vim.ServiceInstanceContent
+        connection to VMware vCenter
+    container_obj : pyVmomi.VmomiSupport.vim.ManagedEntity
+        pyvmomi Host, Cluster or Datacenter object
+    arg_bulk : bool
+        whether bulk retrieval has been requested
+    arg_workers : int
+        number of concurrent Datastore refreshes
+
+    Returns
+    -------
+    prefetched
+        Dictionary {moid: {property path: value}} or None if bulk retrieval is disabled
+    """
+
+    if not arg_bulk:
+        return None
+
+    refreshDatastores(containerHosts(container_obj), arg_workers)
+    print('>> Retrieving VM properties in bulk from {}... '.format(container_obj.name))
+
+    return InventoryCollector(content).collectVMs(container_obj)
+
+def patchDataframes(collector, changes, arg_gsw, esxi_username, esxi_password, idrac_username, idrac_password, df_vms, df_vms_network, df_hosts, df_hosts_network):
+    """Re-derive the VMs and Hosts changed since the previous poll and patch them into the output dataframes.
+
+    Parameters
+    ----------
+    collector : InventoryCollector
+        Collector holding the current properties of the VMs and Hosts under analysis
+    changes : dict
+        {moid: (pyvmomi object, kind)} as returned by InventoryCollector.waitForUpdates
+
+    Returns
+    -------
+    df_vms, df_vms_network, df_hosts, df_hosts_network
+        Input dataframes where rows of changed VMs and Hosts have been replaced
+    """
+
+    changed_vms = {moid: obj for moid, (obj, kind) in changes.items() if isinstance(obj, vim.VirtualMachine)}
+    affected_hosts = {moid for moid, (obj, kind) in changes.items() if isinstance(obj, vim.HostSystem)}
+    if not df_vms.empty:
+        affected_hosts.update(df_vms.loc[df_vms['MOID'].isin(changed_vms), 'Host_MOID'])   # Hosts where changed VMs were running (they may have been migrated)
+        df_vms = df_vms[~df_vms['MOID'].isin(changed_vms)]
+    if not df_vms_network.empty:
+        df_vms_network = df_vms_network[~df_vms_network['MOID'].isin(changed_vms)]
+
+    current_vms = [moid for moid in changed_vms if moid in collector.objects]   # VMs which did not leave the analyzed objects
+    refresh_hosts = affected_hosts | {collector.objects[moid]['runtime.host']._moId for moid in current_vms if collector.objects[moid]['runtime.host'] is not None}
+    refreshDatastores([collector.managedObjects[moid] for moid in refresh_hosts if moid in collector.managedObjects])
+    collector.collectRelated(current_vms, refresh=True)   # Datastore free space, cluster rules, etc. are not watched. Retrieve them again
+    vm_records, vnic_records = [], []
+    for moid in current_vms:
+        vm_record, vm_vnic_records = vm_scavenger(changed_vms[moid], collector.objects)
+        vm_records.append(vm_record)
+        vnic_records += vm_vnic_records
+        if collector.objects[moid]['runtime.host'] is not None:
+            affected_hosts.add(collector.objects[moid]['runtime.host']._moId)
+    df_vms = concatFrames('vm', [df_vms, recordsToFrame('vm', vm_records)])
+    df_vms_network = concatFrames('vnic', [df_vms_network, recordsToFrame('vnic', vnic_records)])
+
+    if not df_hosts.empty:
+        df_hosts = df_hosts[~df_hosts['MOID'].isin(affected_hosts)]
+    if not df_hosts_network.empty:
+        df_hosts_network = df_hosts_network[~df_hosts_network['MOID'].isin(affected_hosts)]
+    patched_hosts = [host_moid for host_moid in affected_hosts if host_moid in collector.objects]   # Other Hosts left the analyzed objects
+    patched_vms_mask = df_vms['Host_MOID'].isin(patched_hosts)
+    vm_frames = [df_vms[~patched_vms_mask]]
+    vm_network_frames = [df_vms_network[~df_vms_network['MOID'].isin(df_vms.loc[patched_vms_mask, 'MOID'])]]
+    host_frames, host_network_frames = [df_hosts], [df_hosts_network]
+    df_capacity = vmCapacity_aggregator(df_vms[patched_vms_mask])   # VM figures of all patched Hosts in one pass
+    for host_moid in patched_hosts:
+        host_vms_mask = (df_vms['Host_MOID'] == host_moid)
+        host_vms_network_mask = df_vms_network['MOID'].isin(df_vms.loc[host_vms_mask, 'MOID'])
+        print('** Updating information from Host {}... '.format(collector.objects[host_moid]['name'].split('.')[0]))
+        df_temp_v, df_temp_v_network, df_temp_h, df_temp_h_network = host_calculator(collector.managedObjects[host_moid], expandFrame('vm', df_vms[host_vms_mask].reset_index(drop=True)), 
+                                                                                        expandFrame('vnic', df_vms_network[host_vms_network_mask].reset_index(drop=True)), arg_gsw, esxi_username, esxi_password, idrac_username, idrac_password, df_capacity)
+        vm_frames.append(df_temp_v)     # Patched rows are merged once all affected Hosts are calculated
+        vm_network_frames.append(df_temp_v_network)
+        host_frames.append(df_temp_h)
+        host_network_frames.append(df_temp_h_network)
+
+    return compactFrame('vm', concatFrames('vm', vm_frames)), compactFrame('vnic', concatFrames('vnic', vm_network_frames)), \
+            compactFrame('host', concatFrames('host', host_frames)), compactFrame('pnic', concatFrames('pnic', host_network_frames))
+
+def watchCollector(content, container_list, arg_interval):
+    """Set up the PropertyFilter of the incremental mode (--interval) over the objects under analysis, before they are collected.
+
+    The version token taken here is the baseline of the first poll, so changes made while the full collection runs are reported by it.
+
+    Returns
+    -------
+    collector
+        InventoryCollector to be polled by incrementalCollector, or None if the incremental mode is disabled
+    """
+
+    if not arg_interval:
+        return None
+
+    collector = InventoryCollector(content)
+    collector.createFilter(container_list)
+    atexit.register(collector.destroyFilter)
+
+    return collector
+
+def incrementalCollector(collector, arg_interval, vcenter_ip, queryObject, queryName, arg_gsw, esxi_username, esxi_password, idrac_username, idrac_password, 
+                            df_vms, df_vms_network, df_hosts, df_hosts_network, df_clusters, df_datacenters):
+    """Keep the output dataframes up to date by polling vCenter for changes (WaitForUpdatesEx).
+
+    The PropertyFilter is set up by watchCollector before the full collection. Every arg_interval seconds, only the VMs and Hosts 
+    changed since the previous poll are re-derived through VMdata/HostData and patched into the dataframes, which 
+    are written again to the output files. Runs until interrupted.
+
+    Parameters
+    ----------
+    collector : InventoryCollector
+        collector returned by watchCollector
+    arg_interval : int
+        seconds between polls
+    """
+
+    while True:
+        time.sleep(arg_interval)
+        changes = collector.waitForUpdates()
+        if not changes:
+            print('== No changes since previous poll')
+            continue
+
+        print('== {} objects changed since previous poll'.format(len(changes)))
+        run_indexes.clear()     # Rules, VM placement, Port Mirror sessions, portgroups and uplinks may have changed since the previous poll
+        df_vms, df_vms_network, df_hosts, df_hosts_network = patchDataframes(collector, changes, arg_gsw, esxi_username, esxi_password, idrac_username, idrac_password, 
+                                                                                df_vms, df_vms_network, df_hosts, df_hosts_network)
+        saveFactCache()
+        df_vms, df_vms_network, df_hosts, df_hosts_network = finaliseFrames(df_vms, df_vms_network, df_hosts, df_hosts_network)
+        writeOuputDataframes(vcenter_ip, queryObject, queryName, df_vms, df_vms_network, df_hosts, df_hosts_network, df_clusters, df_datacenters)
+
+def containerHosts(container_obj):
+    """Return the Hosts of a host/cluster/datacenter."""
+
+    if isinstance(container_obj, vim.HostSystem):
+        return [container_obj]
+    if isinstance(container_obj, vim.Datacenter):
+        return [host_obj for cluster_obj in container_obj.hostFolder.childEntity for host_obj in cluster_obj.host]
+
+    return list(container_obj.host)
+
+def refreshDatastores(host_list, arg_workers=1):
+    """Refresh Datastore Storage information of the Datastores seen by a list of Hosts.
+
+    Each Datastore is refreshed once, however many Hosts share it, and Datastores refreshed less than
+    DATASTORE_REFRESH_AGE seconds ago in this run are skipped. Refreshes run concurrently on arg_workers threads.
+    """
+
+    datastores = {}
+    for host_obj in host_list:
+        for datastore_obj in host_obj.datastore:
+            datastores.setdefault(datastore_obj._moId, datastore_obj)
+    now = time.time()
+    stale = [datastore_obj for moid, datastore_obj in datastores.items() if now - datastore_refresh.get(moid, 0) > DATASTORE_REFRESH_AGE]
+
+    if arg_workers <= 1 or len(stale) <= 1:
+        for datastore_obj in stale:
+            refreshDatastore(datastore_obj)
+    else:
+        with ThreadPoolExecutor(max_workers=min(arg_workers, len(stale))) as executor:
+            list(executor.map(refreshDatastore, stale))
+
+    for datastore_obj in stale:
+        datastore_refresh[datastore_obj._moId] = now
+
+def refreshDatastore(datastore_obj):
+    """Refresh Datastore Storage information."""
+
+    with target_limits['vcenter']:
         if datastore_obj.summary.type == "VMFS":
             datastore_obj.RefreshDatastoreStorageInfo() # Refresh Datastore capacity  
 
-def findDatacenterObj(datacenter_string, content):
+def findDatacenterObj(datacenter_string, content, index=None, arg_regex=False):
     """Get pyvmomi object corresponding to input Datacenter name.
 
     Parameters
@@ -427,6 +852,10 @@ def findDatacenterObj(datacenter_string, content):
         vSphere Datacenter name to analyze
     content : pyVmomi.VmomiSupport.vim.ServiceInstanceContent
         connection to VMware vCenter
+    index : InventoryIndex (optional)
+        inventory name index of the session
+    arg_regex : bool (optional)
+        datacenter_string is a regular expression
 
     Returns
     -------
@@ -434,10 +863,8 @@ def findDatacenterObj(datacenter_string, content):
        pyvmomi Datacenter object 
     """
 
-    datacenter = []
-    for datacenter_obj in get_obj(content, vim.Datacenter):   # Create Datacenter view 
-        if datacenter_string in datacenter_obj.name:  # Datacenter string found
-            datacenter.append(datacenter_obj)
+    index = index or InventoryIndex(content)
+    datacenter = index.search(vim.Datacenter, datacenter_string if arg_regex else re.escape(datacenter_string))   # Datacenter string found
 
     if not datacenter:
         print()
@@ -447,7 +874,7 @@ def findDatacenterObj(datacenter_string, content):
 
     return datacenter
 
-def findClusterObj(cluster_name, content):
+def findClusterObj(cluster_name, content, index=None, arg_regex=False):
     """Get pyvmomi object corresponding to input Cluster name.
 
     Parameters
@@ -456,6 +883,10 @@ def findClusterObj(cluster_name, content):
         vSphere Cluster to analyze
     content : pyVmomi.VmomiSupport.vim.ServiceInstanceContent
         connection to VMware vCenter
+    index : InventoryIndex (optional)
+        inventory name index of the session
+    arg_regex : bool (optional)
+        cluster_name is a regular expression
 
     Returns
     -------
@@ -463,11 +894,8 @@ def findClusterObj(cluster_name, content):
        pyvmomi Cluster object 
     """
 
-    cluster = ""
-    for cluster_obj in get_obj(content, vim.ClusterComputeResource):   # Create Cluster view 
-        if cluster_obj.name == cluster_name:  # Cluster found
-            cluster = cluster_obj
-            break
+    index = index or InventoryIndex(content)
+    cluster = index.search(vim.ClusterComputeResource, cluster_name) if arg_regex else index.find(vim.ClusterComputeResource, cluster_name)
 
     if not cluster:
         print()
@@ -475,9 +903,9 @@ def findClusterObj(cluster_name, content):
         print()
         exit()
 
-    return cluster
+    return cluster[0]
 
-def findHostObj(host_name, content):
+def findHostObj(host_name, content, index=None, arg_regex=False):
     """Get pyvmomi object corresponding to input Host name.
 
     Parameters
@@ -486,6 +914,10 @@ def findHostObj(host_name, content):
         vSphere host to analyze
     content : pyVmomi.VmomiSupport.vim.ServiceInstanceContent
         connection to VMware vCenter
+    index : InventoryIndex (optional)
+        inventory name index of the session
+    arg_regex : bool (optional)
+        host_name is a regular expression
 
     Returns
     -------
@@ -493,11 +925,11 @@ def findHostObj(host_name, content):
        pyvmomi Host object 
     """
 
-    host = ""
-    for host_obj in get_obj(content, vim.HostSystem):   # Create Host view 
-        if (host_obj.name.split('.')[0].lower() == host_name.lower()) or (host_obj.name.lower() == host_name.lower()):  # Host found
-            host = host_obj
-            break
+    index = index or InventoryIndex(content)
+    if arg_regex:
+        host = index.search(vim.HostSystem, host_name, re.IGNORECASE)
+    else:
+        host = index.select(vim.HostSystem, lambda name: (name.split('.')[0].lower() == host_name.lower()) or (name.lower() == host_name.lower()))   # Short or full name
     
     if not host:
         print()
@@ -505,9 +937,9 @@ def findHostObj(host_name, content):
         print()
         exit()
 
-    return host
+    return host[0]
 
-def findVMObj(vm_name, content):
+def findVMObj(vm_name, content, index=None, arg_regex=False):
     """Get pyvmomi object corresponding to input VM name.
 
     Parameters
@@ -516,6 +948,10 @@ def findVMObj(vm_name, content):
         vSphere VM to analyze
     content : pyVmomi.VmomiSupport.vim.ServiceInstanceContent
         connection to VMware vCenter
+    index : InventoryIndex (optional)
+        inventory name index of the session
+    arg_regex : bool (optional)
+        vm_name is a regular expression
 
     Returns
     -------
@@ -523,11 +959,8 @@ def findVMObj(vm_name, content):
        pyvmomi VM object 
     """
 
-    vm = ""
-    for vm_obj in get_obj(content, vim.VirtualMachine):   # Create VM view 
-        if vm_obj.name == vm_name:  # VM found
-            vm = vm_obj
-            break 
+    index = index or InventoryIndex(content)
+    vm = index.search(vim.VirtualMachine, vm_name) if arg_regex else index.find(vim.VirtualMachine, vm_name)
 
     if not vm:
         print()
@@ -535,7 +968,7 @@ def findVMObj(vm_name, content):
         print()
         exit()
 
-    return vm
+    return vm[0]
 
 def addStickyHeaderCSS(new_html):
     """Enhance HTML code with CSS to make table headers stick to the top upon scrolling.
@@ -1200,6 +1633,12 @@ def writeOuputDataframes(vcenter_ip, queryObject, queryName, df_vms=pd.DataFrame
     else:
         vcenter_prefix = 'vcenter_unknown'
 
+    # Output files are written from the values as retrieved, regardless of the compact dtypes used while collecting
+    df_vms = expandFrame('vm', df_vms)
+    df_vms_network = expandFrame('vnic', df_vms_network)
+    df_hosts = expandFrame('host', df_hosts)
+    df_hosts_network = expandFrame('pnic', df_hosts_network)
+
     df_vms.fillna('',inplace=True)
     if not df_vms.empty:
         dataframe_type = 'vms_computing'
@@ -1479,9 +1918,16 @@ def main():
         idrac_username = args.idracuser
         idrac_password = getpass.getpass(prompt='Enter iDRAC password: ')
 
+    setTargetLimits(args.workers, args.vcenterlimit, args.esxilimit, args.idraclimit)
+    setRedfishOptions(args.redfishcrawl, args.redfishconcurrency, args.redfishdeadline)
+    setResultCache(args.cache)
+    setFactCache(args.factttl, args.factcache)
+
     si = connect(args.vcenter_ip, args.vcenter_user, vcenter_password)  # Connect to vCenter
     atexit.register(Disconnect, si)     # Cleanup. Disconnect the session upon normal script termination
     content = si.RetrieveContent()
+    setPortgroupCatalogue(content)
+    index = InventoryIndex(content, args.indexcache, args.indexttl)     # Resolves -n without walking the inventory object by object
 
     pd.set_option('display.max_rows', None) # So that all Dataframe rows are printed to terminal
     pd.set_option('display.max_colwidth', None)   # To not limit dataframe column width and display full cell content in a single line (avoids being truncated in multiple lines within the cell)
@@ -1494,26 +1940,46 @@ def main():
     df_datacenters = pd.DataFrame()
 
     if args.t == 'vm':
-        vm_obj = findVMObj(args.n, content)
-        df_vms, df_vms_network = vm_scavenger(vm_obj)
+        vm_obj = findVMObj(args.n, content, index, args.regex)
+        vm_record, vnic_records = vm_scavenger(vm_obj)
+        df_vms, df_vms_network = recordsToFrame('vm', [vm_record]), recordsToFrame('vnic', vnic_records)
     elif args.t == 'host':
-        host_obj = findHostObj(args.n, content)
-        df_vms, df_vms_network, df_hosts, df_hosts_network = host_scavenger(host_obj, args.gsw, esxi_username, esxi_password, idrac_username, idrac_password)
+        host_obj = findHostObj(args.n, content, index, args.regex)
+        container_list = [host_obj]
+        collector = watchCollector(content, container_list, args.interval)
+        refreshDatastores([host_obj])   # Before the bulk retrieval, which prefetches Datastore space
+        prefetched = bulkCollector(content, host_obj, args.bulk)
+        df_vms, df_vms_network, df_hosts, df_hosts_network = host_scavenger(host_obj, args.gsw, esxi_username, esxi_password, idrac_username, idrac_password, prefetched)
     elif args.t == 'cluster':
-        cluster_obj = findClusterObj(args.n, content)
-        df_vms, df_vms_network, df_hosts, df_hosts_network, df_clusters = cluster_scavenger(cluster_obj, args.gsw, esxi_username, esxi_password, idrac_username, idrac_password)
+        cluster_obj = findClusterObj(args.n, content, index, args.regex)
+        container_list = [cluster_obj]
+        collector = watchCollector(content, container_list, args.interval)
+        prefetched = bulkCollector(content, cluster_obj, args.bulk, args.workers)
+        df_vms, df_vms_network, df_hosts, df_hosts_network, df_clusters = cluster_scavenger(cluster_obj, args.gsw, esxi_username, esxi_password, idrac_username, idrac_password, prefetched, args.workers)
     elif args.t == 'datacenter':
-        datacenter_obj_list = findDatacenterObj(args.n, content)
-        for datacenter_obj in datacenter_obj_list:
-            df_temp_vms, df_temp_vms_network, df_temp_hosts, df_temp_hosts_network, df_temp_clusters, df_temp_datacenters = datacenter_scavenger(datacenter_obj, args.gsw, esxi_username, esxi_password, idrac_username, idrac_password)
-            df_vms = df_vms.append(df_temp_vms, ignore_index=True)
-            df_vms_network = df_vms_network.append(df_temp_vms_network, ignore_index=True)
-            df_hosts = df_hosts.append(df_temp_hosts, ignore_index=True)
-            df_hosts_network = df_hosts_network.append(df_temp_hosts_network, ignore_index=True)
-            df_clusters = df_clusters.append(df_temp_clusters, ignore_index=True)
-            df_datacenters = df_datacenters.append(df_temp_datacenters, ignore_index=True)
-
+        datacenter_obj_list = findDatacenterObj(args.n, content, index, args.regex)
+        container_list = datacenter_obj_list
+        collector = watchCollector(content, container_list, args.interval)
+        if args.processes > 1:
+            options = {'gsw': args.gsw, 'esxi_username': esxi_username, 'esxi_password': esxi_password, 'idrac_username': idrac_username, 'idrac_password': idrac_password, 
+                        'bulk': args.bulk, 'workers': args.workers, 'vcenterlimit': args.vcenterlimit, 'esxilimit': args.esxilimit, 'idraclimit': args.idraclimit,
+                        'redfishcrawl': args.redfishcrawl, 'redfishconcurrency': args.redfishconcurrency, 'redfishdeadline': args.redfishdeadline, 'cache': args.cache,
+                        'factttl': args.factttl, 'factcache': args.factcache}
+            df_vms, df_vms_network, df_hosts, df_hosts_network, df_clusters, df_datacenters = datacenterPool_scavenger(si, args.vcenter_ip, datacenter_obj_list, args.processes, args.shard, options)
+        else:
+            datacenter_results = []
+            for datacenter_obj in datacenter_obj_list:
+                prefetched = bulkCollector(content, datacenter_obj, args.bulk, args.workers)
+                datacenter_results.append(datacenter_scavenger(datacenter_obj, args.gsw, esxi_username, esxi_password, idrac_username, idrac_password, prefetched, args.workers))
+            df_vms, df_vms_network, df_hosts, df_hosts_network, df_clusters, df_datacenters = mergeResults(datacenter_results, ['vm', 'vnic', 'host', 'pnic', 'cluster', 'datacenter'])
+
+    saveFactCache()
+    df_vms, df_vms_network, df_hosts, df_hosts_network = finaliseFrames(df_vms, df_vms_network, df_hosts, df_hosts_network)
     writeOuputDataframes(args.vcenter_ip, args.t, args.n, df_vms, df_vms_network, df_hosts, df_hosts_network, df_clusters, df_datacenters) # Print output DFs
 
+    if args.interval:
+        incrementalCollector(collector, args.interval, args.vcenter_ip, args.t, args.n, args.gsw, esxi_username, esxi_password, idrac_username, idrac_password, 
+                                df_vms, df_vms_network, df_hosts, df_hosts_network, df_clusters, df_datacenters)
+
 if __name__ == '__main__':
     main()
\ No newline at end of file